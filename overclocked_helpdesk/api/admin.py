@@ -1,24 +1,83 @@
 from fastapi import APIRouter, Request, HTTPException, Form, Depends
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-import os
 
 from overclocked_helpdesk.db.session import get_db
 from overclocked_helpdesk.models.mentor import Mentor
-from overclocked_helpdesk.utils.qr import generate_team_qr
+from overclocked_helpdesk.models.query import Query
+from overclocked_helpdesk.models.team import Team
+from overclocked_helpdesk.services.events import bus, mentor_payload
+from overclocked_helpdesk.services.email_service import get_dispatcher
+from overclocked_helpdesk.services.assigner import dispatcher
+from overclocked_helpdesk.services.ingest_writer import get_ingest_writer
+from overclocked_helpdesk.services.archiver import archived_resolved, get_archiver
+from overclocked_helpdesk.services.sla import sla
+from overclocked_helpdesk.services.escalation import escalation
+from overclocked_helpdesk.utils.qr import generate_team_qr, qr_exists
+from overclocked_helpdesk.utils.static_assets import static_url
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 templates = Jinja2Templates(directory="templates")
-
-QR_DIR = "static/qr"
+templates.env.globals["static_url"] = static_url
 
 
 # -------------------------
 # Helpers
 # -------------------------
-def qr_exists(team_id: int) -> bool:
-    return os.path.exists(f"{QR_DIR}/team_{team_id}.png")
+def mentor_counts():
+    """
+    Per mentor, in one GROUP BY on Query.mentor_id over the live
+    table only:
+      open      queries the mentor holds and hasn't resolved
+      assigned  of those, the ASSIGNED ones (what current_load counts)
+      resolved  resolved queries not archived yet
+    Unassigned PENDING queries are nobody's workload, they are one
+    total (unassigned_pending_stmt).
+    """
+
+    return (
+        select(
+            Query.mentor_id,
+            func.count().filter(Query.status != "RESOLVED").label("open"),
+            func.count().filter(Query.status == "ASSIGNED").label("assigned"),
+            func.count().filter(Query.status == "RESOLVED").label("resolved")
+        )
+        .where(Query.mentor_id.is_not(None))
+        .group_by(Query.mentor_id)
+        .subquery("mentor_counts")
+    )
+
+
+def unassigned_pending_stmt():
+    # on ix_queries_status_mentor_rank, no table scan
+    return (
+        select(func.count())
+        .select_from(Query)
+        .where(Query.status == "PENDING", Query.mentor_id.is_(None))
+    )
+
+
+def mentors_with_counts_stmt():
+    counts = mentor_counts()
+
+    return (
+        select(
+            Mentor.id,
+            Mentor.name,
+            Mentor.email,
+            Mentor.is_active,
+            Mentor.current_load,
+            Mentor.max_load,
+            func.coalesce(counts.c.open, 0).label("open"),
+            func.coalesce(counts.c.assigned, 0).label("assigned"),
+            func.coalesce(counts.c.resolved, 0).label("resolved")
+        )
+        .outerjoin(counts, counts.c.mentor_id == Mentor.id)
+        .order_by(Mentor.id.asc())
+    )
 
 
 # -------------------------
@@ -30,18 +89,26 @@ def admin_dashboard(
     db: Session = Depends(get_db)
 ):
     teams = [
-        {"id": i, "qr_exists": qr_exists(i)}
-        for i in range(1, 41)
+        {"id": t.id, "name": t.name, "qr_exists": qr_exists(t.id)}
+        for t in db.execute(
+            select(Team.id, Team.name).order_by(Team.id.asc())
+        )
     ]
 
-    mentors = db.query(Mentor).order_by(Mentor.id.asc()).all()
+    # archived queries are all resolved, kept as running totals
+    archived = archived_resolved.get(db)
+    mentors = [
+        {**m._asdict(), "resolved": m.resolved + archived.get(m.id, 0)}
+        for m in db.execute(mentors_with_counts_stmt())
+    ]
 
     return templates.TemplateResponse(
         "admin_dashboard.html",
         {
             "request": request,
             "teams": teams,
-            "mentors": mentors
+            "mentors": mentors,
+            "unassigned_pending": db.execute(unassigned_pending_stmt()).scalar()
         }
     )
 
@@ -50,8 +117,11 @@ def admin_dashboard(
 # Generate QR
 # -------------------------
 @router.post("/teams/{team_id}/generate-qr")
-def generate_qr(team_id: int):
-    if team_id < 1 or team_id > 40:
+def generate_qr(
+    team_id: int,
+    db: Session = Depends(get_db)
+):
+    if db.get(Team, team_id) is None:
         raise HTTPException(status_code=400, detail="Invalid team")
 
     path = generate_team_qr(team_id)
@@ -80,6 +150,8 @@ def add_mentor(
     db.commit()
     db.refresh(mentor)
 
+    bus.publish("mentor", mentor_payload(mentor))
+
     return {"ok": True, "id": mentor.id}
 
 
@@ -110,6 +182,9 @@ def update_mentor(
         mentor.current_load = mentor.max_load
 
     db.commit()
+
+    bus.publish("mentor", mentor_payload(mentor))
+
     return {"ok": True}
 
 
@@ -133,6 +208,78 @@ def delete_mentor(
         )
 
     db.delete(mentor)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail="Cannot delete mentor with teams or queries"
+        )
+
+    bus.publish("mentor_removed", {"id": mentor_id})
 
     return {"ok": True}
+
+
+# -------------------------
+# Dispatch Mode
+# -------------------------
+@router.get("/dispatch-mode")
+def get_dispatch_mode():
+    return {"mode": dispatcher.mode}
+
+
+@router.post("/dispatch-mode")
+def set_dispatch_mode(mode: str = Form(...)):
+    try:
+        dispatcher.set_mode(mode)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"ok": True, "mode": dispatcher.mode}
+
+
+# -------------------------
+# Email Delivery Stats
+# -------------------------
+@router.get("/email-stats")
+def email_stats():
+    return get_dispatcher().stats()
+
+
+# -------------------------
+# Ingest Writer Stats
+# -------------------------
+@router.get("/ingest-stats")
+def ingest_stats():
+    return get_ingest_writer().stats()
+
+
+# -------------------------
+# Archive Stats
+# -------------------------
+@router.get("/archive-stats")
+def archive_stats(db: Session = Depends(get_db)):
+    archiver = get_archiver()
+
+    if archiver is None:
+        raise HTTPException(status_code=404, detail="Archiving is disabled")
+
+    return archiver.stats(db)
+
+
+# -------------------------
+# Escalation Stats
+# -------------------------
+@router.get("/escalation-stats")
+def escalation_stats():
+    return escalation.stats()
+
+
+# -------------------------
+# SLA Analytics
+# -------------------------
+@router.get("/sla")
+def sla_analytics():
+    return sla.summary()
@@ -1,80 +1,53 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from overclocked_helpdesk.api.pagination import DEFAULT_PAGE_SIZE, page_response, page_size, paginate
 from overclocked_helpdesk.db.session import get_db
 from overclocked_helpdesk.models.mentor import Mentor
-from overclocked_helpdesk.models.query import Query
+from overclocked_helpdesk.models.query import Query, created_iso
 
 router = APIRouter(prefix="/mentors", tags=["mentors"])
 
 
-# ---------------------------
-# Toggle mentor availability
-# ---------------------------
-@router.patch("/{mentor_id}/toggle-availability")
-def toggle_availability(mentor_id: int, db: Session = Depends(get_db)):
-    mentor = db.query(Mentor).filter(Mentor.id == mentor_id).first()
-
-    if not mentor:
-        raise HTTPException(status_code=404, detail="Mentor not found")
-
-    mentor.is_active = not mentor.is_active
-    db.commit()
-    db.refresh(mentor)
-
-    return {
-        "mentor_id": mentor.id,
-        "is_active": mentor.is_active,
-        "current_load": mentor.current_load,
-        "max_load": mentor.max_load,
-    }
-
-
-# ---------------------------
-# Mentor state polling
-# ---------------------------
-@router.get("/state")
-def mentor_state(db: Session = Depends(get_db)):
-    mentors = db.query(Mentor).all()
-
-    return [
-        {
-            "id": m.id,
-            "name": m.name,
-            "is_active": m.is_active,
-            "current_load": m.current_load,
-            "max_load": m.max_load,
-        }
-        for m in mentors
-    ]
-
-
 # ---------------------------
 # Fetch active queries for mentor
 # ---------------------------
-@router.get("/{mentor_id}/queries")
-def mentor_queries(mentor_id: int, db: Session = Depends(get_db)):
-    mentor = db.query(Mentor).filter(Mentor.id == mentor_id).first()
+class AssignedQueryOut(BaseModel):
+    id: int
+    team_id: int
+    issue: str
+    created_at: str = Field(description="ISO 8601")
+
+
+@router.get(
+    "/{mentor_id}/queries",
+    response_model=list[AssignedQueryOut],
+    response_class=ORJSONResponse
+)
+def mentor_queries(
+    mentor_id: int,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    db: Session = Depends(get_db)
+):
+    mentor = db.execute(select(Mentor.id).where(Mentor.id == mentor_id)).first()
 
     if not mentor:
         raise HTTPException(status_code=404, detail="Mentor not found")
 
-    queries = (
-        db.query(Query)
-        .filter(
-            Query.mentor_id == mentor_id,
-            Query.is_resolved == False
-        )
-        .order_by(Query.created_at.desc())
-        .all()
+    limit = page_size(limit)
+    stmt = paginate(
+        select(Query.id, Query.team_id, Query.issue, created_iso())
+        .where(
+            Query.status == "ASSIGNED",
+            Query.mentor_id == mentor_id
+        ),
+        cursor,
+        limit,
+        newest_first=True
     )
 
-    return [
-        {
-            "id": q.id,
-            "team_id": q.team_id,
-            "issue": q.issue,
-            "created_at": q.created_at.isoformat(),
-        }
-        for q in queries
-    ]
+    return page_response(db.execute(stmt), limit)
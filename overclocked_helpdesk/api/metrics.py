@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from overclocked_helpdesk.db.session import get_db
+from overclocked_helpdesk.models.mentor import Mentor
+from overclocked_helpdesk.models.query import Query
+from overclocked_helpdesk.utils.metrics import mentor_capacity, mentor_load, open_queries, registry
+
+router = APIRouter(tags=["Metrics"])
+
+PROMETHEUS_TEXT = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# -------------------------
+# Scrape-time gauges
+# -------------------------
+def collect_open_queries(db: Session) -> None:
+    # the live table only holds the open backlog and recent history
+    counts = dict(
+        db.execute(
+            select(Query.status, func.count()).group_by(Query.status)
+        ).all()
+    )
+    open_queries.replace({
+        (status,): counts.get(status, 0)
+        for status in ("PENDING", "ASSIGNED")
+    })
+
+
+def collect_mentor_load(db: Session) -> None:
+    rows = db.execute(
+        select(Mentor.id, Mentor.current_load, Mentor.max_load)
+    ).all()
+    mentor_load.replace({(m.id,): m.current_load or 0 for m in rows})
+    mentor_capacity.replace({(m.id,): m.max_load or 0 for m in rows})
+
+
+registry.add_collector(collect_open_queries)
+registry.add_collector(collect_mentor_load)
+
+
+# -------------------------
+# Prometheus endpoint
+# -------------------------
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics(db: Session = Depends(get_db)):
+    return PlainTextResponse(registry.render(db), media_type=PROMETHEUS_TEXT)
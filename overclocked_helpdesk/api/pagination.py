@@ -0,0 +1,94 @@
+import base64
+from datetime import datetime
+
+from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import DateTime, Integer, literal, tuple_
+
+from overclocked_helpdesk.models.query import Query
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+# -------------------------
+# Cursors
+# -------------------------
+# Opaque to clients: base64 of "<created_at iso>|<id>" of the last row.
+
+def encode_cursor(created_at: datetime, query_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{query_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, query_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(query_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def page_size(limit: int | None) -> int:
+    if not limit or limit < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(limit, MAX_PAGE_SIZE)
+
+
+# -------------------------
+# Keyset pages on (created_at, id)
+# -------------------------
+def paginate(
+    stmt,
+    cursor: str | None,
+    limit: int,
+    newest_first: bool = False,
+    created_at=Query.created_at,
+    row_id=Query.id
+):
+    """
+    Orders a SELECT on queries by (created_at, id), continues after
+    the cursor and fetches one extra row to tell if there is a next
+    page. Cost depends on the page size, not on how far in we are.
+    created_at / row_id point the keyset at another selectable.
+    """
+
+    if cursor:
+        after_created_at, after_id = decode_cursor(cursor)
+        key = tuple_(created_at, row_id)
+        after = tuple_(literal(after_created_at, DateTime), literal(after_id, Integer))
+        stmt = stmt.where(key < after if newest_first else key > after)
+
+    if newest_first:
+        order = (created_at.desc(), row_id.desc())
+    else:
+        order = (created_at.asc(), row_id.asc())
+
+    return (
+        stmt
+        .add_columns(created_at.label("cursor_created_at"))
+        .order_by(*order)
+        .limit(limit + 1)
+    )
+
+
+def page_response(result, limit: int) -> ORJSONResponse:
+    """
+    Body stays a plain list, the next cursor goes in X-Next-Cursor.
+    """
+
+    rows = []
+    for row in result.mappings():
+        row = dict(row)
+        rows.append((row.pop("cursor_created_at"), row))
+
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        created_at, last = rows[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(created_at, last["id"])
+
+    return ORJSONResponse([row for _, row in rows], headers=headers)
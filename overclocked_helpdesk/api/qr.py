@@ -1,8 +1,50 @@
-from fastapi import APIRouter
-from overclocked_helpdesk.utils.qr import generate_team_qr
+from fastapi import APIRouter, Depends
+from fastapi.responses import Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from overclocked_helpdesk.db.session import get_db
+from overclocked_helpdesk.models.team import Team
+from overclocked_helpdesk.services.qr_sheet import build_sheet, render_all
+from overclocked_helpdesk.utils.qr import generate_team_qr, qr_key, qr_png, team_status_url
 
 router = APIRouter(prefix="/qr", tags=["QR"])
 
+
+# -------------------------
+# Printable sheet of every team
+# -------------------------
+@router.get("/sheet.pdf")
+def get_qr_sheet(db: Session = Depends(get_db)):
+    teams = db.execute(
+        select(Team.id, Team.name).order_by(Team.id.asc())
+    ).all()
+
+    pngs = render_all([team_status_url(t.id) for t in teams])
+    pdf = build_sheet([(t.name, png) for t, png in zip(teams, pngs)])
+
+    return Response(
+        pdf,
+        media_type="application/pdf",
+        headers={"Content-Disposition": 'inline; filename="team-qr-sheet.pdf"'}
+    )
+
+
+# Registered before /team/{team_id} so "5.png" is not read as an id
+@router.get("/team/{team_id}.png")
+def get_team_qr_png(team_id: int):
+    url = team_status_url(team_id)
+
+    return Response(
+        qr_png(url),
+        media_type="image/png",
+        headers={
+            "Content-Disposition": f'inline; filename="team_{team_id}.png"',
+            "ETag": f'"{qr_key(url)}"'
+        }
+    )
+
+
 @router.get("/team/{team_id}")
 def get_team_qr(team_id: int):
     path = generate_team_qr(team_id)
@@ -1,52 +1,118 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, or_, and_
+import json
 
-from overclocked_helpdesk.db.session import get_db
-from overclocked_helpdesk.models.query import Query
-from overclocked_helpdesk.models.mentor import Mentor
-from overclocked_helpdesk.services.email_service import send_email_alert
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy import or_, and_, select
+
+from overclocked_helpdesk.config import settings
+from overclocked_helpdesk.api.pagination import DEFAULT_PAGE_SIZE, page_response, page_size, paginate
+from overclocked_helpdesk.db.session import get_async_db, get_db, db_endpoint
+from overclocked_helpdesk.models.archive import ArchivedQuery, all_queries
+from overclocked_helpdesk.models.query import Query, created_hhmm, created_iso
+from overclocked_helpdesk.models.team import Team
+from overclocked_helpdesk.services.notifier import create_queries_bulk
+from overclocked_helpdesk.services.email_digest import notify_mentor
+from overclocked_helpdesk.services import lifecycle
+from overclocked_helpdesk.services.lifecycle import TransitionError
+from overclocked_helpdesk.services.events import bus, mentor_payload, query_payload
 
 router = APIRouter(prefix="/queries", tags=["queries"])
 
 
+# -------------------------------------------------
+# Response models (docs only, rows are serialized by orjson)
+# -------------------------------------------------
+# List endpoints are keyset paginated: ?limit= (max MAX_PAGE_SIZE) and
+# ?cursor= taken from the previous page's X-Next-Cursor header.
+
+class QueueItemOut(BaseModel):
+    id: int
+    team_id: int
+    issue: str
+    created_at: str = Field(description="HH:MM")
+
+
+class PendingQueryOut(QueueItemOut):
+    priority: int = Field(description="times escalated for waiting too long")
+
+
+class MentorQueueItemOut(QueueItemOut):
+    status: str
+
+
+class TeamHistoryItemOut(BaseModel):
+    id: int
+    mentor_id: int | None
+    issue: str
+    location: str
+    status: str
+    created_at: str = Field(description="ISO 8601")
+
+
+class QueryOut(BaseModel):
+    id: int
+    team_id: int
+    mentor_id: int | None
+    issue: str
+    status: str
+    created_at: str = Field(description="ISO 8601")
+
+
 # -------------------------------------------------
 # Get all pending queries (unassigned)
 # -------------------------------------------------
-@router.get("/pending")
-def get_pending_queries(db: Session = Depends(get_db)):
-    queries = (
-        db.query(Query)
-        .filter(
+# Longest effective wait first: rank_at is created_at moved earlier
+# for every escalation, so priority and age weigh in together and
+# the order stays keyset pageable.
+
+def pending_queries_stmt():
+    return (
+        select(Query.id, Query.team_id, Query.issue, Query.priority, created_hhmm())
+        .where(
             Query.status == "PENDING",
             Query.mentor_id == None
         )
-        .order_by(Query.created_at.asc())
-        .all()
     )
 
-    return [
-        {
-            "id": q.id,
-            "team_id": q.team_id,
-            "issue": q.issue,
-            "created_at": q.created_at.strftime("%H:%M"),
-        }
-        for q in queries
-    ]
+
+def get_pending_queries(
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    db: Session = Depends(get_db)
+):
+    limit = page_size(limit)
+    stmt = paginate(pending_queries_stmt(), cursor, limit, created_at=Query.rank_at)
+    return page_response(db.execute(stmt), limit)
+
+
+async def get_pending_queries_async(
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    db: AsyncSession = Depends(get_async_db)
+):
+    limit = page_size(limit)
+    stmt = paginate(pending_queries_stmt(), cursor, limit, created_at=Query.rank_at)
+    return page_response(await db.execute(stmt), limit)
+
+
+router.get(
+    "/pending",
+    response_model=list[PendingQueryOut],
+    response_class=ORJSONResponse
+)(db_endpoint(get_pending_queries, get_pending_queries_async))
 
 
 # -------------------------------------------------
 # Get queries visible to a mentor
 # -------------------------------------------------
-@router.get("/mentor/{mentor_id}")
-def get_active_queries_for_mentor(
-    mentor_id: int,
-    db: Session = Depends(get_db)
-):
-    queries = (
-        db.query(Query)
-        .filter(
+def mentor_queries_stmt(mentor_id: int):
+    return (
+        select(Query.id, Query.team_id, Query.issue, Query.status, created_hhmm())
+        .where(
             or_(
                 and_(
                     Query.status == "PENDING",
@@ -58,183 +124,47 @@ def get_active_queries_for_mentor(
                 )
             )
         )
-        .order_by(desc(Query.created_at))
-        .all()
     )
 
-    return [
-        {
-            "id": q.id,
-            "team_id": q.team_id,
-            "issue": q.issue,
-            "status": q.status,
-            "created_at": q.created_at.strftime("%H:%M"),
-        }
-        for q in queries
-    ]
 
-
-# -------------------------------------------------
-# Mentor accepts a query
-# -------------------------------------------------
-@router.patch("/{query_id}/accept/{mentor_id}")
-def accept_query(
-    query_id: int,
+def get_active_queries_for_mentor(
     mentor_id: int,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
     db: Session = Depends(get_db)
 ):
-    query = db.query(Query).filter(Query.id == query_id).first()
-    mentor = db.query(Mentor).filter(Mentor.id == mentor_id).first()
+    limit = page_size(limit)
+    stmt = paginate(mentor_queries_stmt(mentor_id), cursor, limit, newest_first=True)
+    return page_response(db.execute(stmt), limit)
 
-    if not query:
-        raise HTTPException(status_code=404, detail="Query not found")
-
-    if not mentor:
-        raise HTTPException(status_code=404, detail="Mentor not found")
 
-    if query.status != "PENDING" or query.mentor_id is not None:
-        raise HTTPException(status_code=400, detail="Query already taken")
-
-    if not mentor.is_active:
-        raise HTTPException(status_code=400, detail="Mentor not available")
+async def get_active_queries_for_mentor_async(
+    mentor_id: int,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    db: AsyncSession = Depends(get_async_db)
+):
+    limit = page_size(limit)
+    stmt = paginate(mentor_queries_stmt(mentor_id), cursor, limit, newest_first=True)
+    return page_response(await db.execute(stmt), limit)
 
-    # assign query
-    query.mentor_id = mentor.id
-    query.status = "ASSIGNED"
 
-    mentor.current_load += 1
-    if mentor.current_load >= mentor.max_load:
-        mentor.is_active = False
+router.get(
+    "/mentor/{mentor_id}",
+    response_model=list[MentorQueueItemOut],
+    response_class=ORJSONResponse
+)(db_endpoint(get_active_queries_for_mentor, get_active_queries_for_mentor_async))
 
-    db.commit()
 
-    # -------- EMAIL (TEXT + HTML) --------
-    text_body = (
-        "You have accepted a helpdesk query.\n\n"
-        f"Team: {query.team_id}\n"
-        f"Issue: {query.issue}\n"
-    )
+# -------------------------------------------------
+# Mentor accepts a query
+# -------------------------------------------------
+def accepted(query, mentor) -> dict:
+    bus.publish("query", query_payload(query, mentor))
+    bus.publish("mentor", mentor_payload(mentor))
 
-    html_body = f"""
-<!DOCTYPE html>
-<html>
-<head>
-  <meta name="viewport" content="width=device-width, initial-scale=1.0">
-  <meta http-equiv="Content-Type" content="text/html; charset=UTF-8">
-  <meta name="color-scheme" content="dark">
-  <meta name="supported-color-schemes" content="dark">
-  <style>
-    /* Force Dark Mode defaults */
-    :root {{
-      color-scheme: dark;
-      supported-color-schemes: dark;
-    }}
-    body {{ margin: 0; padding: 0; width: 100%; -webkit-text-size-adjust: 100%; -ms-text-size-adjust: 100%; background-color: #050505 !important; color: #ededed !important; }}
-    table, td {{ mso-table-lspace: 0pt; mso-table-rspace: 0pt; }}
-    img {{ -ms-interpolation-mode: bicubic; }}
-    a {{ text-decoration: none; color: #ededed; }}
-  </style>
-</head>
-<body style="margin:0; padding:0; background-color:#050505 !important; color:#ededed !important; font-family:'Segoe UI', Helvetica, Arial, sans-serif;">
-
-  <table width="100%" border="0" cellspacing="0" cellpadding="0" style="background-color:#050505; width:100%;">
-    <tr>
-      <td align="center" style="padding: 40px 10px;">
-
-        <table width="100%" border="0" cellspacing="0" cellpadding="0" style="max-width:500px; background-color:#0f0f11; border:1px solid #27272a; border-radius:16px; overflow:hidden; box-shadow: 0 4px 20px rgba(0,0,0,0.5);">
-          
-          <tr>
-            <td style="padding: 24px 32px; background-color:#141417; border-bottom:1px solid #27272a;">
-              <table width="100%" border="0" cellspacing="0" cellpadding="0">
-                <tr>
-                  <td style="color:#ededed; font-size:18px; font-weight:800; letter-spacing:-0.5px;">
-                    OverClocked
-                  </td>
-                  <td align="right">
-                    <span style="background:rgba(99,102,241,0.1); border:1px solid rgba(99,102,241,0.2); color:#818cf8; font-family:'Courier New', monospace; font-size:10px; font-weight:700; padding:4px 8px; border-radius:6px; letter-spacing:0.5px;">
-                      TICKET CONFIRMED
-                    </span>
-                  </td>
-                </tr>
-              </table>
-            </td>
-          </tr>
-
-          <tr>
-            <td style="padding: 32px;">
-              
-              <h1 style="margin:0 0 12px 0; font-size:22px; font-weight:700; color:#ededed;">
-                Query Assigned Successfully!
-              </h1>
-              <p style="margin:0 0 24px 0; font-size:14px; color:#a1a1aa; line-height:1.6;">
-                You have successfully accepted a new helpdesk query. Please proceed to the location below to assist the team.
-              </p>
-
-              <table width="100%" border="0" cellspacing="0" cellpadding="0" style="background-color:#18181b; border:1px solid #27272a; border-radius:12px;">
-                
-                <tr>
-                  <td style="padding:20px; border-bottom:1px solid #27272a;">
-                    <table width="100%" border="0" cellspacing="0" cellpadding="0">
-                      <tr>
-                        <td width="50%" valign="top" style="padding-right:10px;">
-                          <div style="font-family:'Courier New', monospace; font-size:10px; color:#6366f1; font-weight:700; text-transform:uppercase; margin-bottom:6px;">
-                            TARGET TEAM
-                          </div>
-                          <div style="font-size:16px; font-weight:600; color:#ededed;">
-                            {query.team_id}
-                          </div>
-                        </td>
-                        <td width="50%" valign="top" style="border-left:1px solid #27272a; padding-left:20px;">
-                          <div style="font-family:'Courier New', monospace; font-size:10px; color:#6366f1; font-weight:700; text-transform:uppercase; margin-bottom:6px;">
-                            LOCATION
-                          </div>
-                          <div style="font-size:16px; font-weight:600; color:#ededed;">
-                            {query.location}
-                          </div>
-                        </td>
-                      </tr>
-                    </table>
-                  </td>
-                </tr>
-
-                <tr>
-                  <td style="padding:20px;">
-                    <div style="font-family:'Courier New', monospace; font-size:10px; color:#ef4444; font-weight:700; text-transform:uppercase; margin-bottom:8px;">
-                      REPORTED ISSUE
-                    </div>
-                    <div style="font-size:14px; line-height:1.5; color:#e4e4e7;">
-                      {query.issue}
-                    </div>
-                  </td>
-                </tr>
-              </table>
-
-            </td>
-          </tr>
-
-          <tr>
-            <td align="center" style="padding:20px; border-top:1px solid #27272a; background-color:#0a0a0c;">
-              <p style="margin:0; font-family:'Courier New', monospace; font-size:10px; color:#52525b; letter-spacing:1px; text-transform:uppercase;">
-                Automated System Notification
-              </p>
-            </td>
-          </tr>
-
-        </table>
-
-      </td>
-    </tr>
-  </table>
-</body>
-</html>
-"""
-
-    send_email_alert(
-        to_email=mentor.email,
-        subject="OverClocked Helpdesk - Query Assigned",
-        body=text_body,
-        html=html_body
-    )
+    # sent by the background dispatcher, not on the request path
+    notify_mentor("assigned", mentor, query)
 
     return {
         "ok": True,
@@ -244,56 +174,249 @@ def accept_query(
     }
 
 
+def accept_query(
+    query_id: int,
+    mentor_id: int,
+    db: Session = Depends(get_db)
+):
+    try:
+        query, mentor = lifecycle.accept(db, query_id, mentor_id)
+    except TransitionError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    return accepted(query, mentor)
+
+
+async def accept_query_async(
+    query_id: int,
+    mentor_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        query, mentor = await lifecycle.accept_async(db, query_id, mentor_id)
+    except TransitionError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    return accepted(query, mentor)
+
+
+router.patch("/{query_id}/accept/{mentor_id}")(db_endpoint(accept_query, accept_query_async))
+
+
 # -------------------------------------------------
 # Resolve a query
 # -------------------------------------------------
-@router.patch("/{query_id}/resolve")
+def resolved(query, mentor) -> dict:
+    if query is None:
+        # already resolved
+        return {"ok": True}
+
+    bus.publish("query", query_payload(query, mentor))
+    if mentor:
+        bus.publish("mentor", mentor_payload(mentor))
+        notify_mentor("resolved", mentor, query)
+
+    return {"ok": True, "query_id": query.id}
+
+
 def resolve_query(
     query_id: int,
     db: Session = Depends(get_db)
 ):
-    query = db.query(Query).filter(Query.id == query_id).first()
+    try:
+        query, mentor = lifecycle.resolve(db, query_id)
+    except TransitionError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
 
-    if not query:
-        raise HTTPException(status_code=404, detail="Query not found")
+    return resolved(query, mentor)
 
-    if query.status == "RESOLVED":
-        return {"ok": True}
 
-    mentor = None
-    if query.mentor_id:
-        mentor = db.query(Mentor).filter(Mentor.id == query.mentor_id).first()
+async def resolve_query_async(
+    query_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        query, mentor = await lifecycle.resolve_async(db, query_id)
+    except TransitionError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
 
-    query.status = "RESOLVED"
+    return resolved(query, mentor)
 
-    if mentor and mentor.current_load > 0:
-        mentor.current_load -= 1
-        if mentor.current_load < mentor.max_load:
-            mentor.is_active = True
 
-    db.commit()
+router.patch("/{query_id}/resolve")(db_endpoint(resolve_query, resolve_query_async))
 
-    return {"ok": True, "query_id": query.id}
+
+# -------------------------------------------------
+# Bulk ingest (kiosks / offline sync)
+# -------------------------------------------------
+MAX_BULK_ITEMS = 500
+
+
+class BulkQueryItem(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    team_id: int
+    issue: str = Field(min_length=1)
+    location: str = Field(min_length=1)
+
+
+def parse_bulk_body(body: bytes, content_type: str) -> list:
+    """
+    Accepts a JSON array or NDJSON (one object per line).
+    Unparsable NDJSON lines are kept as errors for their index.
+    """
+
+    if "ndjson" in content_type or "jsonl" in content_type:
+        records = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                records.append(ValueError("invalid JSON line"))
+        return records
+
+    try:
+        records = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+
+    if not isinstance(records, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+
+    return records
+
+
+def ingest_bulk(db: Session, records: list) -> dict:
+    results: list[dict] = [{"index": i} for i in range(len(records))]
+    valid: list[tuple[int, dict]] = []
+
+    for i, record in enumerate(records):
+        if isinstance(record, Exception):
+            results[i]["error"] = str(record)
+            continue
+        try:
+            valid.append((i, BulkQueryItem.model_validate(record).model_dump()))
+        except ValidationError as e:
+            results[i]["error"] = "; ".join(
+                f"{'.'.join(str(p) for p in err['loc']) or 'item'}: {err['msg']}"
+                for err in e.errors()
+            )
+
+    # Same rule as /submit: unknown teams are only refused when
+    # foreign keys are enforced. Checked up front, with one lookup for
+    # every team in the batch, so one bad item doesn't fail the rest.
+    accepted = valid
+    if settings.SQLITE_FOREIGN_KEYS:
+        team_ids = {item["team_id"] for _, item in valid}
+        known = set(db.execute(select(Team.id).where(Team.id.in_(team_ids))).scalars())
+
+        accepted = []
+        for i, item in valid:
+            if item["team_id"] in known:
+                accepted.append((i, item))
+            else:
+                results[i]["error"] = "team_id: unknown team"
+
+    rows = create_queries_bulk(db, [item for _, item in accepted])
+
+    for (i, _), row in zip(accepted, rows):
+        results[i]["id"] = row.id
+
+    return {
+        "ok": True,
+        "created": len(rows),
+        "failed": len(records) - len(rows),
+        "results": results
+    }
+
+
+@router.post("/bulk")
+async def bulk_create_queries(
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    records = parse_bulk_body(
+        await request.body(),
+        request.headers.get("content-type", "")
+    )
+
+    if len(records) > MAX_BULK_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {MAX_BULK_ITEMS} queries per request"
+        )
+
+    # DB work stays off the event loop
+    return await run_in_threadpool(ingest_bulk, db, records)
+
+
+# -------------------------------------------------
+# Team history (live + archive)
+# -------------------------------------------------
+@router.get(
+    "/team/{team_id}",
+    response_model=list[TeamHistoryItemOut],
+    response_class=ORJSONResponse
+)
+def team_history(
+    team_id: int,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    db: Session = Depends(get_db)
+):
+    q = all_queries()
+    limit = page_size(limit)
+
+    stmt = paginate(
+        select(
+            q.c.id,
+            q.c.mentor_id,
+            q.c.issue,
+            q.c.location,
+            q.c.status,
+            created_iso(q.c.created_at)
+        )
+        .where(q.c.team_id == team_id),
+        cursor,
+        limit,
+        newest_first=True,
+        created_at=q.c.created_at,
+        row_id=q.c.id
+    )
+
+    return page_response(db.execute(stmt), limit)
 
 
 # -------------------------------------------------
 # Get single query
 # -------------------------------------------------
-@router.get("/{query_id}")
+@router.get("/{query_id}", response_model=QueryOut, response_class=ORJSONResponse)
 def get_query(
     query_id: int,
     db: Session = Depends(get_db)
 ):
-    query = db.query(Query).filter(Query.id == query_id).first()
+    query = None
+
+    # live table first, resolved queries may have been archived
+    for model in (Query, ArchivedQuery):
+        query = db.execute(
+            select(
+                model.id,
+                model.team_id,
+                model.mentor_id,
+                model.issue,
+                model.status,
+                created_iso(model.created_at)
+            )
+            .where(model.id == query_id)
+        ).mappings().first()
+
+        if query:
+            break
 
     if not query:
         raise HTTPException(status_code=404, detail="Query not found")
 
-    return {
-        "id": query.id,
-        "team_id": query.team_id,
-        "mentor_id": query.mentor_id,
-        "issue": query.issue,
-        "status": query.status,
-        "created_at": query.created_at.isoformat(),
-    }
+    return ORJSONResponse(dict(query))
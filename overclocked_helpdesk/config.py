@@ -4,16 +4,77 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./helpdesk.db"
+    # "tuned": WAL + pragmas below, one writer connection and a pool of
+    # read-only connections. "default": a single stock engine.
+    SQLITE_PROFILE: str = "tuned"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_MMAP_SIZE_MB: int = 256
+    # Opt-in: with it on, submissions need a matching Team row
+    SQLITE_FOREIGN_KEYS: bool = False
+    SQLITE_READ_POOL_SIZE: int = 8
+    SQLITE_WRITE_TIMEOUT_SECONDS: float = 30
+    # Hot routes use aiosqlite AsyncSessions instead of the threadpool
+    DB_ASYNC: bool = True
 
     # Slack
     SLACK_BOT_TOKEN: str | None = None
     SLACK_WEBHOOK_URL: str | None = None
+    # Slack allows about one message per second per webhook
+    SLACK_MIN_INTERVAL_SECONDS: float = 1.0
+    # Most alerts in one Slack post, larger batches are split
+    SLACK_BATCH_SIZE: int = 20
+
+    # Submissions arriving within this window share one commit (0 = off)
+    INGEST_GROUP_COMMIT_MS: float = 5
+    INGEST_MAX_BATCH: int = 100
+    # Repeated /submit calls (same idempotency key, or same team, issue
+    # and location) within this window return the first query (0 = off)
+    SUBMIT_DEDUP_WINDOW_SECONDS: float = 120
+
+    # Resolved queries older than this move to queries_archive (0 = off)
+    ARCHIVE_AFTER_HOURS: float = 2
+    ARCHIVE_BATCH_SIZE: int = 200
+    ARCHIVE_INTERVAL_SECONDS: float = 60
+
+    # Escalation (0 = off)
+    # PENDING queries nobody took are announced again on Slack after
+    # this long, up to ESCALATION_MAX_ALERTS times
+    ESCALATION_PENDING_SECONDS: float = 300
+    ESCALATION_MAX_ALERTS: int = 3
+    # ASSIGNED queries go back to the pool when their mentor has not
+    # accepted or resolved anything for this long. Off by default:
+    # that is the only activity signal, so a mentor on one long
+    # query looks idle.
+    ESCALATION_MENTOR_IDLE_SECONDS: float = 0
+    ESCALATION_TICK_SECONDS: float = 1
+    # Each escalation counts as this much extra waiting in /queries/pending
+    PENDING_PRIORITY_WEIGHT_SECONDS: float = 600
+
+    # Responses smaller than this are sent uncompressed
+    COMPRESS_MIN_SIZE: int = 500
+
+    # QR codes
+    # Where teams reach the app, QR codes encode URLs under it
+    PUBLIC_BASE_URL: str = "http://127.0.0.1:8000"
+    QR_CACHE_SIZE: int = 512
+    # Processes rendering the printable sheet (0 = one per CPU)
+    QR_WORKERS: int = 0
+
+    # Dispatch: "manual" (mentors accept) or "auto" (assigned on submit)
+    DISPATCH_MODE: str = "manual"
 
     # Email
     SMTP_SERVER: str = "smtp.gmail.com"
     SMTP_PORT: int = 465
     SMTP_USER: str | None = None
     SMTP_PASSWORD: str | None = None
+    # plain SMTP is handy for local stub servers
+    SMTP_USE_SSL: bool = True
+    SMTP_TIMEOUT_SECONDS: float = 10
+    SMTP_POOL_SIZE: int = 2
+    # > 0 merges a mentor's emails within this window into one digest
+    EMAIL_DIGEST_WINDOW_SECONDS: float = 0
 
     model_config = SettingsConfigDict(
         env_file=".env",
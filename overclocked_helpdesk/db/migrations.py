@@ -0,0 +1,138 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, inspect, select
+from sqlalchemy.engine import Connection, Engine
+
+from overclocked_helpdesk.db.session import Base
+
+# Import all models so create_all knows them
+from overclocked_helpdesk.models.mentor import Mentor
+from overclocked_helpdesk.models.team import Team
+from overclocked_helpdesk.models.query import Query
+from overclocked_helpdesk.models.outbox import OutboxMessage
+from overclocked_helpdesk.models.archive import ArchivedQuery
+
+
+_meta = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    _meta,
+    Column("version", Integer, primary_key=True),
+    Column("applied_at", DateTime, nullable=False)
+)
+
+
+# -------------------------
+# Migrations
+# -------------------------
+# Each step upgrades an existing database by one version.
+# Fresh databases are created from the models directly and
+# stamped with the latest version.
+
+def _001_query_lifecycle_indexes(conn: Connection) -> None:
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_queries_status_mentor_created "
+        "ON queries (status, mentor_id, created_at)"
+    )
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_queries_team_created "
+        "ON queries (team_id, created_at)"
+    )
+
+
+def _002_notification_outbox(conn: Connection) -> None:
+    OutboxMessage.__table__.create(conn, checkfirst=True)
+
+
+def _003_queries_archive(conn: Connection) -> None:
+    ArchivedQuery.__table__.create(conn, checkfirst=True)
+
+
+def _004_lifecycle_timestamps(conn: Connection) -> None:
+    for table in (Query.__tablename__, ArchivedQuery.__tablename__):
+        existing = {c["name"] for c in inspect(conn).get_columns(table)}
+        for column in ("assigned_at", "resolved_at"):
+            if column not in existing:
+                conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} DATETIME")
+
+
+def _005_query_priority(conn: Connection) -> None:
+    existing = {c["name"] for c in inspect(conn).get_columns(Query.__tablename__)}
+    if "priority" not in existing:
+        conn.exec_driver_sql("ALTER TABLE queries ADD COLUMN priority INTEGER NOT NULL DEFAULT 0")
+    if "rank_at" not in existing:
+        conn.exec_driver_sql("ALTER TABLE queries ADD COLUMN rank_at DATETIME")
+    conn.exec_driver_sql("UPDATE queries SET rank_at = created_at WHERE rank_at IS NULL")
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_queries_status_mentor_rank "
+        "ON queries (status, mentor_id, rank_at)"
+    )
+
+
+def _006_idempotency_key(conn: Connection) -> None:
+    existing = {c["name"] for c in inspect(conn).get_columns(Query.__tablename__)}
+    if "idempotency_key" not in existing:
+        conn.exec_driver_sql("ALTER TABLE queries ADD COLUMN idempotency_key VARCHAR")
+    conn.exec_driver_sql(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_queries_idempotency_key "
+        "ON queries (idempotency_key)"
+    )
+
+
+MIGRATIONS = [
+    (1, _001_query_lifecycle_indexes),
+    (2, _002_notification_outbox),
+    (3, _003_queries_archive),
+    (4, _004_lifecycle_timestamps),
+    (5, _005_query_priority),
+    (6, _006_idempotency_key),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn: Connection) -> int:
+    version = conn.execute(
+        select(schema_migrations.c.version)
+        .order_by(schema_migrations.c.version.desc())
+        .limit(1)
+    ).scalar()
+    return version or 0
+
+
+def _stamp(conn: Connection, version: int) -> None:
+    conn.execute(
+        schema_migrations.insert().values(
+            version=version,
+            applied_at=datetime.utcnow()
+        )
+    )
+
+
+def run_migrations(engine: Engine) -> int:
+    """
+    Brings the database up to LATEST_VERSION.
+    Returns the version the database ended up at.
+    """
+
+    with engine.begin() as conn:
+        is_fresh = not inspect(conn).has_table(Query.__tablename__)
+        _meta.create_all(conn)
+
+        if is_fresh:
+            Base.metadata.create_all(conn)
+            _stamp(conn, LATEST_VERSION)
+            return LATEST_VERSION
+
+        version = current_version(conn)
+
+        for target, migrate in MIGRATIONS:
+            if target <= version:
+                continue
+
+            migrate(conn)
+            _stamp(conn, target)
+            version = target
+
+    return version
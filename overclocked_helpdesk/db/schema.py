@@ -1,15 +1,18 @@
-from overclocked_helpdesk.db.session import Base, engine
+from overclocked_helpdesk.db.session import engine
+from overclocked_helpdesk.db.migrations import run_migrations
 
 # Import all models so SQLAlchemy knows them
 from overclocked_helpdesk.models.mentor import Mentor
 from overclocked_helpdesk.models.team import Team
 from overclocked_helpdesk.models.query import Query
+from overclocked_helpdesk.models.outbox import OutboxMessage
+from overclocked_helpdesk.models.archive import ArchivedQuery
 
 
 def create_tables():
-    Base.metadata.create_all(bind=engine)
+    return run_migrations(engine)
 
 
 if __name__ == "__main__":
-    create_tables()
-    print("Database tables created")
+    version = create_tables()
+    print(f"Database tables created (schema version {version})")
@@ -1,13 +1,72 @@
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 from overclocked_helpdesk.config import settings
+from overclocked_helpdesk.utils.metrics import instrument_engine
 
-# SQLite specific setting
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False}
-)
+
+def _is_file_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return (
+        parsed.get_backend_name() == "sqlite"
+        and parsed.database not in (None, "", ":memory:")
+    )
+
+
+def _apply_pragmas(engine, read_only: bool = False) -> None:
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+
+        # journal_mode is stored in the file, only the writer sets it
+        if not read_only:
+            cursor.execute("PRAGMA journal_mode=WAL")
+
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE_MB) * 1024 * 1024}")
+        if settings.SQLITE_FOREIGN_KEYS:
+            cursor.execute("PRAGMA foreign_keys=ON")
+
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+
+        cursor.close()
+
+
+TUNED = settings.SQLITE_PROFILE == "tuned" and _is_file_sqlite(settings.DATABASE_URL)
+
+if TUNED:
+    # SQLite allows one writer at a time, so writers queue on this
+    # single connection instead of spinning on "database is locked".
+    engine = create_engine(
+        settings.DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.SQLITE_WRITE_TIMEOUT_SECONDS
+    )
+    _apply_pragmas(engine)
+
+    # WAL readers see the last commit and never block the writer
+    read_engine = create_engine(
+        settings.DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        pool_size=settings.SQLITE_READ_POOL_SIZE,
+        max_overflow=0
+    )
+    _apply_pragmas(read_engine, read_only=True)
+else:
+    # SQLite specific setting
+    engine = create_engine(
+        settings.DATABASE_URL,
+        connect_args={"check_same_thread": False}
+    )
+    read_engine = engine
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -15,12 +74,111 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=read_engine
+)
+
+# -------------------------
+# Async engines (aiosqlite)
+# -------------------------
+# Same profile as above. The async writer is a second connection next
+# to the sync one, the two are ordered by busy_timeout.
+ASYNC_DATABASE_URL = make_url(settings.DATABASE_URL).set(drivername="sqlite+aiosqlite")
+
+if TUNED:
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.SQLITE_WRITE_TIMEOUT_SECONDS
+    )
+    _apply_pragmas(async_engine.sync_engine)
+
+    async_read_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_size=settings.SQLITE_READ_POOL_SIZE,
+        max_overflow=0
+    )
+    _apply_pragmas(async_read_engine.sync_engine, read_only=True)
+else:
+    async_engine = create_async_engine(ASYNC_DATABASE_URL)
+    async_read_engine = async_engine
+
+# Statement counts and cursor time for /metrics, once per distinct engine
+_instrumented = {}
+for _name, _engine in (
+    ("write", engine),
+    ("read", read_engine),
+    ("async_write", async_engine.sync_engine),
+    ("async_read", async_read_engine.sync_engine),
+):
+    if _engine not in _instrumented.values():
+        instrument_engine(_engine, _name)
+        _instrumented[_name] = _engine
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_read_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 Base = declarative_base()
 
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
 
-def get_db():
+def get_write_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_db(request: Request):
+    """
+    Read-only session for GET routes, writer session for everything
+    else. Routes that write on GET must depend on get_write_db.
+    """
+
+    factory = ReadSessionLocal if request.method in READ_METHODS else SessionLocal
+    db = factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db(request: Request):
+    """
+    AsyncSession counterpart of get_db.
+    """
+
+    factory = AsyncReadSessionLocal if request.method in READ_METHODS else AsyncSessionLocal
+    async with factory() as db:
+        yield db
+
+
+def db_endpoint(sync_endpoint, async_endpoint):
+    """
+    Picks the async (DB_ASYNC=true) or the threadpool version of a
+    route that has both.
+    """
+
+    return async_endpoint if settings.DB_ASYNC else sync_endpoint
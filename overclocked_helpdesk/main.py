@@ -1,86 +1,207 @@
-from fastapi import FastAPI, Request, Form, BackgroundTasks, Depends, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, Form, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse, Response
 from fastapi.templating import Jinja2Templates
-from fastapi.staticfiles import StaticFiles
+from fastapi.middleware.gzip import GZipMiddleware
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
 
-from overclocked_helpdesk.db.session import SessionLocal, engine, Base, get_db
+from overclocked_helpdesk.config import settings
+from overclocked_helpdesk.db.session import (
+    SessionLocal, engine, async_engine, async_read_engine,
+    get_async_db, get_db, db_endpoint
+)
+from overclocked_helpdesk.db.migrations import run_migrations
 from overclocked_helpdesk.services.notifier import notify_and_create_query
+from overclocked_helpdesk.services.events import bus, mentor_payload
+from overclocked_helpdesk.services.team_status import projection
+from overclocked_helpdesk.services.mentor_state import mentor_state
+from overclocked_helpdesk.services.sla import sla
+from overclocked_helpdesk.services.escalation import escalation
+from overclocked_helpdesk.services.submit_dedup import query_id_for_key, submit_dedup
+from overclocked_helpdesk.services.outbox import start_outbox_worker, stop_outbox_worker
+from overclocked_helpdesk.services.email_service import stop_dispatcher
+from overclocked_helpdesk.services.email_digest import flush_digests
+from overclocked_helpdesk.services.assigner import mentor_index
+from overclocked_helpdesk.services.ingest_writer import get_ingest_writer, stop_ingest_writer
+from overclocked_helpdesk.services.archiver import start_archiver, stop_archiver
+from overclocked_helpdesk.services.qr_sheet import stop_render_pool
 
 # ROUTERS
 from overclocked_helpdesk.api.queries import router as queries_router
+from overclocked_helpdesk.api.mentors import router as mentors_router
 from overclocked_helpdesk.api.qr import router as qr_router
 from overclocked_helpdesk.api.admin import router as admin_router
+from overclocked_helpdesk.api.metrics import router as metrics_router
 
 # MODELS
 from overclocked_helpdesk.models.mentor import Mentor
 from overclocked_helpdesk.models.query import Query
 from overclocked_helpdesk.models.team import Team
+from overclocked_helpdesk.utils.metrics import MetricsMiddleware, duplicate_submissions
+from overclocked_helpdesk.utils.page_cache import PageCache
+from overclocked_helpdesk.utils.static_assets import FingerprintedStaticFiles, STATIC_DIR, static_url
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # optional, gzip only without it
+    BrotliMiddleware = None
 
 
-app = FastAPI(title="OverClocked Helpdesk")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    db = SessionLocal()
+    try:
+        mentor_index.warm(db)
+        sla.warm(db)
+        escalation.warm(db)
+    finally:
+        db.close()
+
+    start_outbox_worker()
+    start_archiver()
+    escalation.start()
+    yield
+    escalation.stop()
+    stop_archiver()
+    stop_ingest_writer()
+    stop_outbox_worker()
+    flush_digests()
+    stop_dispatcher()
+    stop_render_pool()
+    await async_engine.dispose()
+    await async_read_engine.dispose()
+
+
+app = FastAPI(title="OverClocked Helpdesk", lifespan=lifespan)
+
+# Pages and JSON lists shrink 5-10x, event streams are left alone
+if BrotliMiddleware is not None:
+    app.add_middleware(BrotliMiddleware, minimum_size=settings.COMPRESS_MIN_SIZE, gzip_fallback=True)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=settings.COMPRESS_MIN_SIZE)
+
+# Outermost, so latency includes compression
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(qr_router)
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", FingerprintedStaticFiles(directory=STATIC_DIR), name="static")
 app.include_router(admin_router)
+app.include_router(metrics_router)
 
 # ✅ REGISTER ROUTERS
 app.include_router(queries_router)
+app.include_router(mentors_router)
 
-# Create DB tables
-Base.metadata.create_all(bind=engine)
+# Create / upgrade DB tables
+run_migrations(engine)
 
 templates = Jinja2Templates(directory="templates")
+templates.env.globals["static_url"] = static_url
+pages = PageCache(templates)
 
 
 # ------------------------
-# Background notifier
+# Query writer
 # ------------------------
 
-def background_notify(team_id: int, issue: str, location: str):
+def create_query_direct(team_id: int, issue: str, location: str, idempotency_key: str | None) -> int:
+    # one transaction per submission, used when group commit is off
     db = SessionLocal()
     try:
-        notify_and_create_query(
+        query = notify_and_create_query(
             db=db,
             team_id=team_id,
             issue=issue,
-            location=location
+            location=location,
+            idempotency_key=idempotency_key
         )
+        return query.id
     finally:
         db.close()
 
 
+def existing_query_id(idempotency_key: str) -> int | None:
+    db = SessionLocal()
+    try:
+        return query_id_for_key(db, idempotency_key)
+    finally:
+        db.close()
+
+
+async def create_query(team_id: int, issue: str, location: str, idempotency_key: str | None = None) -> tuple[int, bool]:
+    """
+    Returns (query_id, created). created is False when the key
+    already belongs to a committed query, which is returned instead.
+    """
+
+    try:
+        if settings.INGEST_GROUP_COMMIT_MS > 0:
+            row = await asyncio.wrap_future(
+                get_ingest_writer().submit(team_id, issue, location, idempotency_key)
+            )
+            return row.id, True
+
+        query_id = await run_in_threadpool(create_query_direct, team_id, issue, location, idempotency_key)
+        return query_id, True
+    except IntegrityError as e:
+        failed = str(e.orig)
+
+        # the unique key: a retry that outlived the dedup window
+        if idempotency_key and "queries.idempotency_key" in failed:
+            query_id = await run_in_threadpool(existing_query_id, idempotency_key)
+            if query_id is not None:
+                duplicate_submissions.inc("constraint")
+                return query_id, False
+
+        # with SQLITE_FOREIGN_KEYS on, the only foreign key set on
+        # insert is team_id
+        if "FOREIGN KEY constraint failed" in failed:
+            raise HTTPException(status_code=404, detail="Team not found")
+
+        raise
+
+
 # ------------------------
 # Helpdesk UI
 # ------------------------
 
 @app.get("/", response_class=HTMLResponse)
 def show_helpdesk_form(request: Request):
-    return templates.TemplateResponse(
-        "helpdesk_form.html",
-        {"request": request}
-    )
+    return pages.response(request, "helpdesk_form.html")
 
 
 @app.post("/submit")
-def submit_helpdesk_form(
-    background_tasks: BackgroundTasks,
+async def submit_helpdesk_form(
     team_id: int = Form(...),
     issue: str = Form(...),
-    location: str = Form(...)
+    location: str = Form(...),
+    idempotency_key: str | None = Form(None, max_length=64)
 ):
-    print("SUBMIT HIT", team_id, issue, location)
-
-    background_tasks.add_task(
-        background_notify,
-        team_id,
-        issue,
-        location
-    )
+    # repeated taps on flaky Wi-Fi: answer with the first query,
+    # waiting for it if it is still being written
+    future, is_new = submit_dedup.claim(team_id, issue, location, idempotency_key)
+
+    if is_new:
+        try:
+            query_id, created = await create_query(team_id, issue, location, idempotency_key)
+        except BaseException as e:
+            submit_dedup.fail(future, e)
+            raise
+        future.set_result(query_id)
+    else:
+        query_id, created = await asyncio.wrap_future(future), False
 
     return JSONResponse({
         "ok": True,
-        "team_id": team_id
+        "team_id": team_id,
+        "query_id": query_id,
+        "duplicate": not created
     })
 
 
@@ -94,49 +215,100 @@ def team_status_page(
     request: Request,
     team: int
 ):
-    return templates.TemplateResponse(
-        "team_status.html",
-        {
-            "request": request,
-            "team_id": team
-        }
-    )
+    # the page reads the team from its URL, one render serves all teams
+    return pages.response(request, "team_status.html")
 
 
 # ------------------------
 # Team Status (API)
 # ------------------------
 
-@app.get("/team/{team_id}/status")
-def team_status_api(
-    team_id: int,
-    db: Session = Depends(get_db)
-):
-    latest_query = (
-        db.query(Query)
-        .filter(Query.team_id == team_id)
-        .order_by(desc(Query.created_at))
-        .first()
+MAX_TEAMS_PER_STATUS_BATCH = 1000
+
+
+def conditional_json(request: Request, body: bytes, etag: str) -> Response:
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    return Response(
+        body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": "no-cache"}
     )
 
-    if not latest_query:
+
+def team_status_response(request: Request, entry) -> Response:
+    if entry.data is None:
         return JSONResponse(
             {"detail": "No active query"},
             status_code=404
         )
 
-    mentor = (
-        db.query(Mentor)
-        .filter(Mentor.id == latest_query.mentor_id)
-        .first()
-    )
+    return conditional_json(request, entry.body, entry.etag)
+
+
+def team_status_api(
+    team_id: int,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    return team_status_response(request, projection.get(db, team_id))
+
+
+async def team_status_api_async(
+    team_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+):
+    return team_status_response(request, await projection.aget(db, team_id))
+
+
+app.get("/team/{team_id}/status")(db_endpoint(team_status_api, team_status_api_async))
+
+
+def parse_team_ids(ids: str) -> list[int]:
+    try:
+        team_ids = list(dict.fromkeys(int(i) for i in ids.split(",") if i.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma separated integers")
+
+    if len(team_ids) > MAX_TEAMS_PER_STATUS_BATCH:
+        raise HTTPException(status_code=400, detail="Too many teams requested")
 
-    return {
-        "issue": latest_query.issue,
-        "status": latest_query.status,
-        "mentor": mentor.name if mentor else None,
-        "updated_at": latest_query.created_at.strftime("%Y-%m-%d %H:%M:%S")
-    }
+    return team_ids
+
+
+def teams_status_response(request: Request, entries: dict) -> Response:
+    body = b"{" + b",".join(
+        b'"%d":%s' % (team_id, entry.body)
+        for team_id, entry in entries.items()
+    ) + b"}"
+    etag = '"' + hashlib.md5(
+        "".join(entry.etag for entry in entries.values()).encode()
+    ).hexdigest() + '"'
+
+    return conditional_json(request, body, etag)
+
+
+def teams_status_api(
+    ids: str,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    entries = projection.get_many(db, parse_team_ids(ids))
+    return teams_status_response(request, entries)
+
+
+async def teams_status_api_async(
+    ids: str,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+):
+    entries = await projection.aget_many(db, parse_team_ids(ids))
+    return teams_status_response(request, entries)
+
+
+app.get("/teams/status")(db_endpoint(teams_status_api, teams_status_api_async))
 
 
 # ------------------------
@@ -163,19 +335,76 @@ def mentors_dashboard(
 # Mentor State (API)
 # ------------------------
 
-@app.get("/mentors/state")
-def mentors_state(db: Session = Depends(get_db)):
-    mentors = db.query(Mentor).all()
-    return [
-        {
-            "id": m.id,
-            "name": m.name,
-            "is_active": m.is_active,
-            "current_load": m.current_load,
-            "max_load": m.max_load,
+def mentor_state_response(request: Request, state, since_version: int | None) -> Response:
+    # unchanged since the caller's copy: nothing to send
+    if since_version == state.version:
+        return Response(
+            status_code=304,
+            headers={"ETag": state.etag, "X-State-Version": str(state.version)}
+        )
+
+    response = conditional_json(request, state.body, state.etag)
+    response.headers["X-State-Version"] = str(state.version)
+    return response
+
+
+def mentors_state(
+    request: Request,
+    since_version: int | None = None,
+    db: Session = Depends(get_db)
+):
+    return mentor_state_response(request, mentor_state.get(db), since_version)
+
+
+async def mentors_state_async(
+    request: Request,
+    since_version: int | None = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    return mentor_state_response(request, await mentor_state.aget(db), since_version)
+
+
+app.get("/mentors/state")(db_endpoint(mentors_state, mentors_state_async))
+
+
+# ------------------------
+# Mentor Events (SSE)
+# ------------------------
+
+SSE_KEEPALIVE_SECONDS = 15
+
+
+@app.get("/mentors/events")
+async def mentors_events(request: Request):
+    queue = bus.subscribe()
+
+    async def stream():
+        try:
+            # reconnect delay for EventSource
+            yield "retry: 3000\n\n"
+
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(
+                        queue.get(),
+                        timeout=SSE_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                yield message
+        finally:
+            bus.unsubscribe(queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
         }
-        for m in mentors
-    ]
+    )
 
 
 # ------------------------
@@ -196,10 +425,7 @@ def toggle_mentor_availability(
     db.commit()
     db.refresh(mentor)
 
-    return {
-        "id": mentor.id,
-        "name": mentor.name,
-        "is_active": mentor.is_active,
-        "current_load": mentor.current_load,
-        "max_load": mentor.max_load,
-    }
+    state = mentor_payload(mentor)
+    bus.publish("mentor", state)
+
+    return state
@@ -0,0 +1,51 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index, select, union_all
+from datetime import datetime
+
+from overclocked_helpdesk.db.session import Base
+from overclocked_helpdesk.models.query import Query
+
+
+class ArchivedQuery(Base):
+    """
+    Resolved queries moved out of the live table by the archiver.
+    Keeps the original id. No foreign keys, history outlives deleted
+    mentors.
+    """
+
+    __tablename__ = "queries_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+
+    team_id = Column(Integer, nullable=False)
+    mentor_id = Column(Integer, nullable=True)
+
+    issue = Column(String, nullable=False)
+    location = Column(String, nullable=False)
+    status = Column(String, nullable=False)
+
+    created_at = Column(DateTime)
+    assigned_at = Column(DateTime, nullable=True)
+    resolved_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_queries_archive_team_created", "team_id", "created_at"),
+    )
+
+
+ARCHIVED_COLUMNS = (
+    "id", "team_id", "mentor_id", "issue", "location", "status",
+    "created_at", "assigned_at", "resolved_at"
+)
+
+
+def all_queries():
+    """
+    Live and archived queries as one selectable, for reads that must
+    not care where a query lives.
+    """
+
+    return union_all(
+        select(*(getattr(Query, c) for c in ARCHIVED_COLUMNS)),
+        select(*(getattr(ArchivedQuery, c) for c in ARCHIVED_COLUMNS))
+    ).subquery("all_queries")
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from datetime import datetime
+
+from overclocked_helpdesk.db.session import Base
+
+
+class OutboxMessage(Base):
+    __tablename__ = "notification_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # delivery channel, e.g. "slack"
+    channel = Column(String, nullable=False)
+    # JSON encoded alert
+    payload = Column(Text, nullable=False)
+
+    # lifecycle: PENDING -> deleted once sent | FAILED
+    status = Column(String, default="PENDING", nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(String, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_outbox_channel_status_next", "channel", "status", "next_attempt_at"),
+    )
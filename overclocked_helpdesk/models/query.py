@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -19,6 +19,41 @@ class Query(Base):
     status = Column(String, default="PENDING", nullable=False)
 
     created_at = Column(DateTime, default=datetime.utcnow)
+    # set by the accept / resolve transitions
+    assigned_at = Column(DateTime, nullable=True)
+    resolved_at = Column(DateTime, nullable=True)
+
+    # raised by the escalation scheduler each time a PENDING query
+    # outlives its SLA
+    priority = Column(Integer, default=0, nullable=False)
+    # position in the pending list: created_at moved earlier by
+    # PENDING_PRIORITY_WEIGHT_SECONDS per priority level
+    rank_at = Column(DateTime, default=datetime.utcnow)
+
+    # from the helpdesk form, makes retried submissions a no-op
+    idempotency_key = Column(String, nullable=True)
 
     team = relationship("Team", backref="queries")
     mentor = relationship("Mentor", backref="queries")
+
+    # Match the hot access paths:
+    #   per-mentor lists -> (status, mentor_id) ordered by created_at
+    #   pending list     -> (status, mentor_id) ordered by rank_at
+    #   team status      -> latest query of a team
+    __table_args__ = (
+        Index("ix_queries_status_mentor_created", "status", "mentor_id", "created_at"),
+        Index("ix_queries_status_mentor_rank", "status", "mentor_id", "rank_at"),
+        Index("ix_queries_team_created", "team_id", "created_at"),
+        Index("ux_queries_idempotency_key", "idempotency_key", unique=True),
+    )
+
+
+# Timestamps formatted by SQLite in the SELECT, so list endpoints
+# don't build a datetime and call strftime per row. DateTime is stored
+# as "YYYY-MM-DD HH:MM:SS.ffffff".
+def created_hhmm():
+    return func.strftime("%H:%M", Query.created_at).label("created_at")
+
+
+def created_iso(column=Query.created_at):
+    return func.replace(column, " ", "T").label("created_at")
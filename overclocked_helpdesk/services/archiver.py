@@ -0,0 +1,239 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from overclocked_helpdesk.config import settings
+from overclocked_helpdesk.db.session import SessionLocal
+from overclocked_helpdesk.models.archive import ARCHIVED_COLUMNS, ArchivedQuery
+from overclocked_helpdesk.models.query import Query
+
+
+class ArchivedResolvedCounts:
+    """
+    Resolved queries per mentor sitting in the archive. Counted with
+    one GROUP BY on first use, then bumped by every archive batch, so
+    the admin dashboard only aggregates the live table.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: dict[int, int] | None = None
+
+    def get(self, db: Session) -> dict[int, int]:
+        with self._lock:
+            if self._counts is None:
+                rows = db.execute(
+                    select(ArchivedQuery.mentor_id, func.count())
+                    .where(
+                        ArchivedQuery.status == "RESOLVED",
+                        ArchivedQuery.mentor_id.is_not(None)
+                    )
+                    .group_by(ArchivedQuery.mentor_id)
+                ).all()
+                self._counts = {mentor_id: count for mentor_id, count in rows}
+            return dict(self._counts)
+
+    def commit(self, db: Session, moved: dict[int, int]) -> None:
+        """
+        Commits an archive batch and counts it, under the lock, so a
+        concurrent first load sees the batch either in the table or
+        in the counts, never both.
+        """
+
+        with self._lock:
+            db.commit()
+            if self._counts is not None:
+                for mentor_id, count in moved.items():
+                    self._counts[mentor_id] = self._counts.get(mentor_id, 0) + count
+
+
+archived_resolved = ArchivedResolvedCounts()
+
+
+def archive_batch(db: Session, cutoff: datetime, batch_size: int) -> int:
+    """
+    Moves up to batch_size queries resolved before cutoff into
+    queries_archive, in one short transaction. Returns how many moved.
+
+    The newest query is never moved: SQLite hands out max(rowid) + 1,
+    so deleting it could reuse an id that already sits in the archive.
+    """
+
+    ids = db.execute(
+        select(Query.id)
+        .where(
+            Query.status == "RESOLVED",
+            # rows resolved before lifecycle timestamps fall back to created_at
+            func.coalesce(Query.resolved_at, Query.created_at) < cutoff,
+            Query.id < select(func.max(Query.id)).scalar_subquery()
+        )
+        .order_by(Query.id.asc())
+        .limit(batch_size)
+    ).scalars().all()
+
+    if not ids:
+        return 0
+
+    moved = dict(db.execute(
+        select(Query.mentor_id, func.count())
+        .where(Query.id.in_(ids), Query.mentor_id.is_not(None))
+        .group_by(Query.mentor_id)
+    ).all())
+
+    db.execute(
+        insert(ArchivedQuery).from_select(
+            [*ARCHIVED_COLUMNS, "archived_at"],
+            select(
+                *(getattr(Query, c) for c in ARCHIVED_COLUMNS),
+                literal(datetime.utcnow(), ArchivedQuery.archived_at.type)
+            ).where(Query.id.in_(ids))
+        )
+    )
+    db.execute(
+        delete(Query)
+        .where(Query.id.in_(ids))
+        .execution_options(synchronize_session=False)
+    )
+    archived_resolved.commit(db, moved)
+
+    return len(ids)
+
+
+class QueryArchiver:
+    """
+    Keeps the live queries table at the size of the open backlog by
+    moving old resolved queries to the archive in small batches.
+
+    Each batch is its own transaction and the thread pauses between
+    batches, so the writer connection is never held for long.
+    """
+
+    def __init__(
+        self,
+        after: timedelta,
+        session_factory=SessionLocal,
+        batch_size: int = 200,
+        interval: float = 60.0,
+        pause: float = 0.05
+    ):
+        self.after = after
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.interval = interval
+        self.pause = pause
+
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+        self._archived = 0
+        self._runs = 0
+        self._last_run: datetime | None = None
+
+    # -------------------------
+    # Thread control
+    # -------------------------
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="query-archiver",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print("Archiver error:", e)
+
+            self._stop.wait(self.interval)
+
+    # -------------------------
+    # Archiving
+    # -------------------------
+    def run_once(self) -> int:
+        """
+        Archives everything currently due, batch by batch.
+        """
+
+        cutoff = datetime.utcnow() - self.after
+        moved = 0
+
+        while not self._stop.is_set():
+            db = self.session_factory()
+            try:
+                count = archive_batch(db, cutoff, self.batch_size)
+            finally:
+                db.close()
+
+            moved += count
+            if count < self.batch_size:
+                break
+
+            # let request writers in between batches
+            time.sleep(self.pause)
+
+        with self._lock:
+            self._archived += moved
+            self._runs += 1
+            self._last_run = datetime.utcnow()
+
+        return moved
+
+    def stats(self, db: Session) -> dict:
+        live = db.execute(select(func.count()).select_from(Query)).scalar()
+        archived = db.execute(select(func.count()).select_from(ArchivedQuery)).scalar()
+
+        with self._lock:
+            return {
+                "live_queries": live,
+                "archived_queries": archived,
+                "archived_since_start": self._archived,
+                "runs": self._runs,
+                "last_run": self._last_run.isoformat() if self._last_run else None
+            }
+
+
+# -------------------------
+# Process-wide archiver
+# -------------------------
+_archiver: QueryArchiver | None = None
+
+
+def start_archiver() -> QueryArchiver | None:
+    global _archiver
+
+    if settings.ARCHIVE_AFTER_HOURS <= 0 or _archiver is not None:
+        return _archiver
+
+    _archiver = QueryArchiver(
+        timedelta(hours=settings.ARCHIVE_AFTER_HOURS),
+        batch_size=settings.ARCHIVE_BATCH_SIZE,
+        interval=settings.ARCHIVE_INTERVAL_SECONDS
+    )
+    _archiver.start()
+    return _archiver
+
+
+def stop_archiver() -> None:
+    global _archiver
+
+    if _archiver is not None:
+        _archiver.stop()
+        _archiver = None
+
+
+def get_archiver() -> QueryArchiver | None:
+    return _archiver
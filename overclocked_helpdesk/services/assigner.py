@@ -1,6 +1,12 @@
+import heapq
+import threading
+
 from sqlalchemy.orm import Session
+
+from overclocked_helpdesk.config import settings
 from overclocked_helpdesk.models.team import Team
 from overclocked_helpdesk.models.mentor import Mentor
+from overclocked_helpdesk.services.events import bus
 
 
 def assign_mentor(db: Session, team_id: int) -> Mentor | None:
@@ -8,6 +14,7 @@ def assign_mentor(db: Session, team_id: int) -> Mentor | None:
     ONLY selects a mentor.
     Does NOT modify workload.
     Does NOT commit.
+    Reads the DB, auto-dispatch uses MentorIndex.pick instead.
     """
 
     team = db.query(Team).filter(Team.id == team_id).first()
@@ -32,3 +39,152 @@ def assign_mentor(db: Session, team_id: int) -> Mentor | None:
     )
 
     return mentor
+
+
+class MentorIndex:
+    """
+    In-memory mirror of mentor availability for auto-dispatch.
+
+    Available mentors (active and under max_load) sit in a min-heap
+    keyed on (current_load, id). Entries are invalidated lazily: a
+    popped entry only counts if it still matches the mentor's state.
+    Kept in sync from mentor events, so picking never reads the DB.
+    Team primaries are loaded by warm() and, for teams created since,
+    by load_team() on their first dispatch.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._mentors: dict[int, tuple[bool, int, int]] = {}
+        self._team_primary: dict[int, int] = {}
+        self._heap: list[tuple[int, int]] = []
+        self.warmed = False
+
+    def warm(self, db: Session) -> None:
+        mentors = db.query(
+            Mentor.id, Mentor.is_active, Mentor.current_load, Mentor.max_load
+        ).all()
+        teams = db.query(Team.id, Team.mentor_id).all()
+
+        with self._lock:
+            self._mentors = {
+                m.id: (bool(m.is_active), m.current_load or 0, m.max_load or 0)
+                for m in mentors
+            }
+            self._team_primary = {t.id: t.mentor_id for t in teams}
+            self._rebuild()
+            self.warmed = True
+
+    def _rebuild(self) -> None:
+        self._heap = [
+            (load, mentor_id)
+            for mentor_id, (active, load, max_load) in self._mentors.items()
+            if active and load < max_load
+        ]
+        heapq.heapify(self._heap)
+
+    def _available(self, mentor_id: int, load: int | None = None) -> bool:
+        state = self._mentors.get(mentor_id)
+        if state is None:
+            return False
+        active, current, max_load = state
+        return active and current < max_load and (load is None or load == current)
+
+    # -------------------------
+    # Sync
+    # -------------------------
+    def update_mentor(self, mentor_id: int, is_active: bool, current_load: int, max_load: int) -> None:
+        with self._lock:
+            self._mentors[mentor_id] = (bool(is_active), current_load, max_load)
+            if is_active and current_load < max_load:
+                heapq.heappush(self._heap, (current_load, mentor_id))
+
+            # drop stale entries once they dominate the heap
+            if len(self._heap) > 4 * len(self._mentors) + 64:
+                self._rebuild()
+
+    def remove_mentor(self, mentor_id: int) -> None:
+        with self._lock:
+            self._mentors.pop(mentor_id, None)
+
+    def load_team(self, db: Session, team_id: int) -> None:
+        with self._lock:
+            if team_id in self._team_primary:
+                return
+
+        mentor_id = db.query(Team.mentor_id).filter(Team.id == team_id).scalar()
+        if mentor_id is None:
+            # no such team (yet), look again next time
+            return
+
+        with self._lock:
+            self._team_primary[team_id] = mentor_id
+
+    def on_event(self, event: str, data: dict) -> None:
+        if event == "mentor":
+            self.update_mentor(
+                data["id"], data["is_active"], data["current_load"], data["max_load"]
+            )
+        elif event == "mentor_removed":
+            self.remove_mentor(data["id"])
+
+    # -------------------------
+    # Selection
+    # -------------------------
+    def pick(self, team_id: int, exclude: set[int] = frozenset()) -> int | None:
+        """
+        Same policy as assign_mentor: the team's primary mentor when
+        available, else the least-loaded available mentor.
+        """
+
+        with self._lock:
+            primary = self._team_primary.get(team_id)
+            if primary not in exclude and self._available(primary):
+                return primary
+
+            heap = self._heap
+            skipped = []
+            chosen = None
+
+            while heap:
+                load, mentor_id = heap[0]
+                if not self._available(mentor_id, load):
+                    heapq.heappop(heap)
+                    continue
+                if mentor_id in exclude:
+                    skipped.append(heapq.heappop(heap))
+                    continue
+                chosen = mentor_id
+                break
+
+            for entry in skipped:
+                heapq.heappush(heap, entry)
+
+            return chosen
+
+
+mentor_index = MentorIndex()
+bus.add_listener(mentor_index.on_event)
+
+
+class Dispatcher:
+    """
+    Runtime switch between manual accept and auto-dispatch.
+    """
+
+    MODES = ("manual", "auto")
+
+    def __init__(self, mode: str):
+        self.mode = mode
+
+    @property
+    def auto(self) -> bool:
+        return self.mode == "auto"
+
+    def set_mode(self, mode: str) -> None:
+        if mode not in self.MODES:
+            raise ValueError(f"mode must be one of {self.MODES}")
+        self.mode = mode
+
+
+dispatcher = Dispatcher(settings.DISPATCH_MODE)
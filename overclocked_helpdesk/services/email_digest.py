@@ -0,0 +1,140 @@
+import threading
+from datetime import datetime
+
+from overclocked_helpdesk.config import settings
+from overclocked_helpdesk.services.email_service import queue_email_alert
+from overclocked_helpdesk.services.email_templates import render_email
+from overclocked_helpdesk.utils.metrics import queue_depth, registry
+
+
+def send_assigned_email(to_email: str, item: dict) -> bool:
+    text_body, html_body = render_email(
+        "query_assigned",
+        team_id=item["team_id"],
+        location=item["location"],
+        issue=item["issue"]
+    )
+
+    return queue_email_alert(
+        to_email=to_email,
+        subject="OverClocked Helpdesk - Query Assigned",
+        body=text_body,
+        html=html_body
+    )
+
+
+def send_digest_email(to_email: str, mentor_name: str, items: list[dict]) -> bool:
+    # A lone assignment looks exactly like the non-digest email
+    if len(items) == 1 and items[0]["kind"] == "assigned":
+        return send_assigned_email(to_email, items[0])
+
+    text_body, html_body = render_email(
+        "mentor_digest",
+        mentor_name=mentor_name,
+        items=items
+    )
+
+    return queue_email_alert(
+        to_email=to_email,
+        subject=f"OverClocked Helpdesk - {len(items)} Query Updates",
+        body=text_body,
+        html=html_body
+    )
+
+
+class DigestBuffer:
+    """
+    Collects mentor notifications and sends one email per mentor
+    per window. The window opens with the first notification.
+    """
+
+    def __init__(self, window_seconds: float, send=send_digest_email):
+        self.window_seconds = window_seconds
+        self.send = send
+
+        self._lock = threading.Lock()
+        self._pending: dict[str, dict] = {}
+
+    def add(self, to_email: str, mentor_name: str, item: dict) -> None:
+        with self._lock:
+            entry = self._pending.get(to_email)
+
+            if entry is None:
+                timer = threading.Timer(self.window_seconds, self.flush, args=(to_email,))
+                timer.daemon = True
+                entry = self._pending[to_email] = {
+                    "mentor_name": mentor_name,
+                    "items": [],
+                    "timer": timer
+                }
+                timer.start()
+
+            entry["items"].append(item)
+
+    def flush(self, to_email: str) -> None:
+        with self._lock:
+            entry = self._pending.pop(to_email, None)
+
+        if entry:
+            entry["timer"].cancel()
+            self.send(to_email, entry["mentor_name"], entry["items"])
+
+    def flush_all(self) -> None:
+        with self._lock:
+            emails = list(self._pending)
+
+        for to_email in emails:
+            self.flush(to_email)
+
+
+_digest: DigestBuffer | None = None
+_digest_lock = threading.Lock()
+
+
+def get_digest() -> DigestBuffer:
+    global _digest
+
+    with _digest_lock:
+        if _digest is None:
+            _digest = DigestBuffer(settings.EMAIL_DIGEST_WINDOW_SECONDS)
+
+    return _digest
+
+
+def flush_digests() -> None:
+    if _digest is not None:
+        _digest.flush_all()
+
+
+def _collect_queue_depth(db) -> None:
+    digest = _digest
+    queue_depth.set(len(digest._pending) if digest else 0, "email_digest")
+
+
+registry.add_collector(_collect_queue_depth)
+
+
+def notify_mentor(kind: str, mentor, query) -> None:
+    """
+    kind is "assigned" or "resolved".
+
+    Without a digest window only assignments are emailed, straight
+    away. With one, every change for a mentor inside the window is
+    merged into a single email.
+    """
+
+    if not mentor.email:
+        return
+
+    item = {
+        "kind": kind,
+        "team_id": query.team_id,
+        "location": query.location,
+        "issue": query.issue,
+        "at": datetime.now().strftime("%H:%M")
+    }
+
+    if settings.EMAIL_DIGEST_WINDOW_SECONDS > 0:
+        get_digest().add(mentor.email, mentor.name, item)
+    elif kind == "assigned":
+        send_assigned_email(mentor.email, item)
@@ -1,21 +1,40 @@
+import logging
+import queue
 import smtplib
 import ssl
+import threading
+import time
 from email.message import EmailMessage
 
 from overclocked_helpdesk.config import settings
+from overclocked_helpdesk.utils.metrics import (
+    notifier_failures,
+    notifier_send_seconds,
+    queue_depth,
+    registry
+)
 
+SMTP_CHANNEL = "smtp"
 
-def send_email_alert(
+logger = logging.getLogger(__name__)
+
+# Lost or unreachable server. Any other SMTPException is an answer
+# from the server, and SMTPException subclasses OSError, so a bare
+# OSError here would resend rejected messages too.
+CONNECTION_ERRORS = (
+    smtplib.SMTPServerDisconnected,
+    smtplib.SMTPConnectError,
+    ConnectionError,
+    TimeoutError
+)
+
+
+def build_message(
     to_email: str,
     subject: str,
     body: str,
     html: str | None = None
-) -> bool:
-    """
-    Sends an email with optional HTML content.
-    Plain text is always included as fallback.
-    """
-
+) -> EmailMessage:
     msg = EmailMessage()
     msg["From"] = settings.SMTP_USER
     msg["To"] = to_email
@@ -28,22 +47,290 @@ def send_email_alert(
     if html:
         msg.add_alternative(html, subtype="html")
 
-    context = ssl.create_default_context()
+    return msg
 
-    try:
-        with smtplib.SMTP_SSL(
+
+def open_smtp_connection() -> smtplib.SMTP:
+    """
+    Connects (and logs in when credentials are set) to the
+    configured SMTP server.
+    """
+
+    if settings.SMTP_USE_SSL:
+        server = smtplib.SMTP_SSL(
             settings.SMTP_SERVER,
             settings.SMTP_PORT,
-            context=context
-        ) as server:
-            server.login(
-                settings.SMTP_USER,
-                settings.SMTP_PASSWORD
-            )
+            context=ssl.create_default_context(),
+            timeout=settings.SMTP_TIMEOUT_SECONDS
+        )
+    else:
+        server = smtplib.SMTP(
+            settings.SMTP_SERVER,
+            settings.SMTP_PORT,
+            timeout=settings.SMTP_TIMEOUT_SECONDS
+        )
+
+    if settings.SMTP_USER and settings.SMTP_PASSWORD:
+        server.login(
+            settings.SMTP_USER,
+            settings.SMTP_PASSWORD
+        )
+
+    return server
+
+
+def send_email_alert(
+    to_email: str,
+    subject: str,
+    body: str,
+    html: str | None = None
+) -> bool:
+    """
+    Sends an email with optional HTML content.
+    Plain text is always included as fallback.
+    Opens a connection per call, request paths use queue_email_alert.
+    """
+
+    msg = build_message(to_email, subject, body, html)
+    started = time.perf_counter()
+
+    try:
+        with open_smtp_connection() as server:
             server.send_message(msg)
 
+        notifier_send_seconds.observe(time.perf_counter() - started, SMTP_CHANNEL)
         return True
 
     except Exception as e:
         print("Email error:", e)
+        notifier_failures.inc(SMTP_CHANNEL, "error")
         return False
+
+
+class EmailDispatcher:
+    """
+    Sends queued emails from background threads.
+
+    Each worker thread owns one authenticated SMTP connection and
+    keeps it open between messages. Connections idle for longer than
+    idle_timeout are checked with NOOP before reuse, and a send that
+    fails on a dead connection is retried once on a fresh one. Errors
+    the server answered with (rejected recipient, auth, data) are not
+    retried.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 2,
+        max_queue: int = 1000,
+        idle_timeout: float = 30.0,
+        connect=open_smtp_connection
+    ):
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.connect = connect
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+
+        self._sent = 0
+        self._failed = 0
+        self._dropped = 0
+        self._connects = 0
+        self._open_connections = 0
+        self._last_latency = 0.0
+        self._total_latency = 0.0
+
+    # -------------------------
+    # Thread control
+    # -------------------------
+    def start(self) -> None:
+        for i in range(self.pool_size):
+            thread = threading.Thread(
+                target=self._run,
+                name=f"smtp-{i}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 10) -> None:
+        """
+        Lets workers finish what is already queued, then closes
+        their connections.
+        """
+
+        for _ in self._threads:
+            self._queue.put(None)
+
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+
+        self._threads = []
+
+    def submit(self, msg: EmailMessage) -> bool:
+        try:
+            self._queue.put_nowait(msg)
+            return True
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            notifier_failures.inc(SMTP_CHANNEL, "dropped")
+            logger.warning("Email queue full, dropping %r", msg["Subject"])
+            return False
+
+    def stats(self) -> dict:
+        with self._lock:
+            sent = self._sent
+            return {
+                "queue_depth": self._queue.qsize(),
+                "sent": sent,
+                "failed": self._failed,
+                "dropped": self._dropped,
+                "connects": self._connects,
+                "open_connections": self._open_connections,
+                "last_send_ms": round(self._last_latency * 1000, 1),
+                "avg_send_ms": round(self._total_latency / sent * 1000, 1) if sent else 0.0
+            }
+
+    # -------------------------
+    # Workers
+    # -------------------------
+    def _run(self) -> None:
+        server = None
+        last_used = 0.0
+
+        while True:
+            msg = self._queue.get()
+            if msg is None:
+                break
+
+            started = time.monotonic()
+
+            if server is not None and time.monotonic() - last_used > self.idle_timeout:
+                server = self._check_alive(server)
+
+            for attempt in range(2):
+                try:
+                    if server is None:
+                        server = self._open()
+                    server.send_message(msg)
+                    self._record(ok=True, started=started)
+                    break
+
+                except CONNECTION_ERRORS as e:
+                    # Dead connection: reconnect and retry once
+                    server = self._discard(server)
+                    if attempt == 1:
+                        logger.warning("Email to %s failed after reconnect: %s", msg["To"], e)
+                        self._record(ok=False, started=started)
+
+                except Exception as e:
+                    logger.warning("Email to %s failed: %s", msg["To"], e)
+                    self._record(ok=False, started=started)
+                    break
+
+            last_used = time.monotonic()
+
+        self._discard(server, quit=True)
+
+    def _open(self) -> smtplib.SMTP:
+        server = self.connect()
+        with self._lock:
+            self._connects += 1
+            self._open_connections += 1
+        return server
+
+    def _discard(self, server, quit: bool = False):
+        if server is None:
+            return None
+
+        try:
+            if quit:
+                server.quit()
+            else:
+                server.close()
+        except Exception:
+            pass
+
+        with self._lock:
+            self._open_connections -= 1
+        return None
+
+    def _check_alive(self, server):
+        try:
+            if server.noop()[0] == 250:
+                return server
+        except Exception:
+            pass
+        return self._discard(server)
+
+    def _record(self, ok: bool, started: float) -> None:
+        # connect / NOOP / send time, queue wait shows up in queue_depth
+        latency = time.monotonic() - started
+
+        with self._lock:
+            if ok:
+                self._sent += 1
+                self._last_latency = latency
+                self._total_latency += latency
+            else:
+                self._failed += 1
+
+        if ok:
+            notifier_send_seconds.observe(latency, SMTP_CHANNEL)
+        else:
+            notifier_failures.inc(SMTP_CHANNEL, "error")
+
+
+# -------------------------
+# Process-wide dispatcher
+# -------------------------
+_dispatcher: EmailDispatcher | None = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> EmailDispatcher:
+    global _dispatcher
+
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = EmailDispatcher(pool_size=settings.SMTP_POOL_SIZE)
+            _dispatcher.start()
+
+    return _dispatcher
+
+
+def stop_dispatcher() -> None:
+    global _dispatcher
+
+    with _dispatcher_lock:
+        if _dispatcher is not None:
+            _dispatcher.stop()
+            _dispatcher = None
+
+
+def _collect_queue_depth(db) -> None:
+    dispatcher = _dispatcher
+    queue_depth.set(dispatcher._queue.qsize() if dispatcher else 0, "email")
+
+
+registry.add_collector(_collect_queue_depth)
+
+
+def queue_email_alert(
+    to_email: str,
+    subject: str,
+    body: str,
+    html: str | None = None
+) -> bool:
+    """
+    Same as send_email_alert but returns immediately,
+    the message is sent by the background dispatcher.
+    """
+
+    return get_dispatcher().submit(
+        build_message(to_email, subject, body, html)
+    )
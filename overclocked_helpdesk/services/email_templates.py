@@ -0,0 +1,28 @@
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
+
+# Compiled once on first use and kept for the process lifetime
+_env = Environment(
+    loader=FileSystemLoader("templates/email"),
+    autoescape=select_autoescape(["html"]),
+    auto_reload=False
+)
+_compiled: dict[str, Template] = {}
+
+
+def _template(name: str) -> Template:
+    template = _compiled.get(name)
+    if template is None:
+        template = _compiled[name] = _env.get_template(name)
+    return template
+
+
+def render_email(name: str, **context) -> tuple[str, str]:
+    """
+    Renders templates/email/<name>.txt and <name>.html.
+    Returns (text, html).
+    """
+
+    return (
+        _template(f"{name}.txt").render(context),
+        _template(f"{name}.html").render(context)
+    )
@@ -0,0 +1,318 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from overclocked_helpdesk.config import settings
+from overclocked_helpdesk.db.session import SessionLocal
+from overclocked_helpdesk.models.query import Query
+from overclocked_helpdesk.services import lifecycle
+from overclocked_helpdesk.services.events import bus, mentor_payload, query_payload
+from overclocked_helpdesk.services.outbox import enqueue_slack_alerts, wake_outbox
+from overclocked_helpdesk.utils.metrics import escalations
+from overclocked_helpdesk.utils.timer_wheel import TimerWheel
+
+PENDING = "pending"
+ASSIGNED = "assigned"
+
+
+def _ts(value: datetime) -> float:
+    # stored datetimes are naive UTC
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class EscalationScheduler:
+    """
+    One timer per open query on a hashed timer wheel, kept in sync
+    from query events, so finding stale work never scans the table.
+
+      PENDING   due pending_after seconds after its last Slack alert:
+                raised one priority level (which moves it up
+                /queries/pending) and announced again, at most
+                max_alerts times
+      ASSIGNED  due idle_after seconds after its mentor's last accept
+                or resolve (off unless configured): handed back to
+                the pool, with the mentor's load given back
+
+    Rebuilt from the open queries on startup. Alerts sent before a
+    restart are assumed on schedule (created_at + priority * SLA).
+    """
+
+    def __init__(
+        self,
+        pending_after: float,
+        idle_after: float,
+        max_alerts: int,
+        priority_weight: float,
+        tick: float = 1.0,
+        session_factory=SessionLocal
+    ):
+        self.pending_after = pending_after
+        self.idle_after = idle_after
+        self.max_alerts = max_alerts
+        self.priority_weight = priority_weight
+        self.tick = tick
+        self.session_factory = session_factory
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._reset()
+        self.warmed = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.pending_after > 0 or self.idle_after > 0
+
+    def _reset(self) -> None:
+        self._wheel = TimerWheel(time.time(), self.tick)
+        # query id -> (created_at, priority, last alert)
+        self._pending: dict[int, tuple[datetime, int, float]] = {}
+        # query id -> mentor id
+        self._assigned: dict[int, int] = {}
+        # mentor id -> last accept / resolve
+        self._active: dict[int, float] = {}
+
+    # -------------------------
+    # Timers
+    # -------------------------
+    def _track_pending(self, query_id: int, created_at: datetime, priority: int, last_alert: float | None = None) -> None:
+        if last_alert is None:
+            last_alert = _ts(created_at) + priority * self.pending_after
+
+        self._pending[query_id] = (created_at, priority, last_alert)
+        self._assigned.pop(query_id, None)
+
+        if self.pending_after > 0 and priority < self.max_alerts:
+            self._wheel.schedule(query_id, last_alert + self.pending_after, PENDING)
+        else:
+            self._wheel.cancel(query_id)
+
+    def _track_assigned(self, query_id: int, mentor_id: int, since: float) -> None:
+        self._pending.pop(query_id, None)
+        self._assigned[query_id] = mentor_id
+
+        if self.idle_after > 0:
+            self._wheel.schedule(query_id, since + self.idle_after, ASSIGNED)
+        else:
+            self._wheel.cancel(query_id)
+
+    def _forget(self, query_id: int) -> None:
+        self._pending.pop(query_id, None)
+        self._assigned.pop(query_id, None)
+        self._wheel.cancel(query_id)
+
+    # -------------------------
+    # Sync
+    # -------------------------
+    def warm(self, db: Session) -> None:
+        open_rows = db.execute(
+            select(
+                Query.id, Query.mentor_id, Query.status,
+                Query.created_at, Query.assigned_at, Query.priority
+            )
+            .where(Query.status.in_(("PENDING", "ASSIGNED")))
+        ).all()
+
+        mentor_ids = {row.mentor_id for row in open_rows if row.status == "ASSIGNED"}
+        activity = db.execute(
+            select(Query.mentor_id, func.max(Query.assigned_at), func.max(Query.resolved_at))
+            .where(Query.mentor_id.in_(mentor_ids))
+            .group_by(Query.mentor_id)
+        ).all() if mentor_ids else []
+
+        with self._lock:
+            self._reset()
+
+            for mentor_id, assigned_at, resolved_at in activity:
+                self._active[mentor_id] = max(
+                    (_ts(t) for t in (assigned_at, resolved_at) if t is not None),
+                    default=0.0
+                )
+
+            for row in open_rows:
+                if row.status == "PENDING":
+                    self._track_pending(row.id, row.created_at, row.priority or 0)
+                else:
+                    since = max(
+                        _ts(row.assigned_at or row.created_at),
+                        self._active.get(row.mentor_id, 0.0)
+                    )
+                    self._track_assigned(row.id, row.mentor_id, since)
+
+            self.warmed = True
+
+    def on_event(self, event: str, data: dict) -> None:
+        if event != "query" or not self.warmed:
+            return
+
+        query_id = data["id"]
+        now = time.time()
+
+        with self._lock:
+            if data["status"] == "PENDING":
+                known = self._pending.get(query_id)
+                if known is not None:
+                    # our own escalation: keep its alert time
+                    created_at, _, last_alert = known
+                else:
+                    created_at = datetime.fromisoformat(data["created_at_iso"])
+                    last_alert = None
+                self._track_pending(query_id, created_at, data["priority"], last_alert)
+
+            elif data["status"] == "ASSIGNED":
+                self._active[data["mentor_id"]] = now
+                self._track_assigned(query_id, data["mentor_id"], now)
+
+            else:
+                if data["mentor_id"] is not None:
+                    self._active[data["mentor_id"]] = now
+                self._forget(query_id)
+
+    # -------------------------
+    # Escalation
+    # -------------------------
+    def run_once(self, now: float | None = None) -> tuple[int, int]:
+        """
+        Handles every timer due by now.
+        Returns (re-announced, requeued).
+        """
+
+        now = time.time() if now is None else now
+        stale, idle = [], []
+
+        with self._lock:
+            for query_id, kind in self._wheel.advance(now):
+                if kind == PENDING:
+                    entry = self._pending.get(query_id)
+                    if entry is not None:
+                        stale.append((query_id, entry[0], entry[1]))
+                    continue
+
+                mentor_id = self._assigned.get(query_id)
+                if mentor_id is None:
+                    continue
+
+                last_active = self._active.get(mentor_id, 0.0)
+                if last_active + self.idle_after > now:
+                    # busy with another query meanwhile, not idle
+                    self._wheel.schedule(query_id, last_active + self.idle_after, ASSIGNED)
+                else:
+                    idle.append((query_id, mentor_id))
+
+        realerted = self._realert(stale, now) if stale else 0
+        requeued = self._requeue(idle) if idle else 0
+        return realerted, requeued
+
+    def _realert(self, stale: list, now: float) -> int:
+        db = self.session_factory()
+        try:
+            rows = []
+            for query_id, created_at, priority in stale:
+                level = priority + 1
+                rank_at = created_at - timedelta(seconds=level * self.priority_weight)
+                row = db.execute(lifecycle.escalate_query_stmt(query_id, level, rank_at)).first()
+                if row is not None:
+                    rows.append(row)
+
+            if not rows:
+                db.rollback()
+                return 0
+
+            # as few Slack messages as fit, not one per query
+            enqueue_slack_alerts(db, [
+                {
+                    "query_id": row.id,
+                    "team_name": f"Team {row.team_id}",
+                    "location": row.location,
+                    "issue": row.issue,
+                    "waiting_minutes": int((now - _ts(row.created_at)) // 60)
+                }
+                for row in rows
+            ])
+            db.commit()
+        finally:
+            db.close()
+
+        with self._lock:
+            for row in rows:
+                if row.id in self._pending:
+                    self._pending[row.id] = (row.created_at, row.priority, now)
+
+        # the PENDING event re-arms the timer
+        for row in rows:
+            bus.publish("query", query_payload(row))
+        wake_outbox()
+
+        escalations.inc("realert", amount=len(rows))
+        return len(rows)
+
+    def _requeue(self, idle: list) -> int:
+        released = []
+
+        db = self.session_factory()
+        try:
+            for query_id, mentor_id in idle:
+                query, mentor = lifecycle.release(db, query_id, mentor_id)
+                if query is not None:
+                    released.append((query, mentor))
+        finally:
+            db.close()
+
+        # back to PENDING: the event arms its alert timer, overdue
+        # queries are announced on the next tick
+        for query, mentor in released:
+            bus.publish("query", query_payload(query))
+            if mentor is not None:
+                bus.publish("mentor", mentor_payload(mentor))
+
+        escalations.inc("requeue", amount=len(released))
+        return len(released)
+
+    # -------------------------
+    # Thread control
+    # -------------------------
+    def start(self) -> None:
+        if not self.enabled or self._thread is not None:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="escalation",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.tick):
+            try:
+                self.run_once()
+            except Exception as e:
+                print("Escalation error:", e)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "timers": len(self._wheel),
+                "pending": len(self._pending),
+                "assigned": len(self._assigned)
+            }
+
+
+escalation = EscalationScheduler(
+    pending_after=settings.ESCALATION_PENDING_SECONDS,
+    idle_after=settings.ESCALATION_MENTOR_IDLE_SECONDS,
+    max_alerts=settings.ESCALATION_MAX_ALERTS,
+    priority_weight=settings.PENDING_PRIORITY_WEIGHT_SECONDS,
+    tick=settings.ESCALATION_TICK_SECONDS
+)
+bus.add_listener(escalation.on_event)
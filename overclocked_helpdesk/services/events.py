@@ -0,0 +1,107 @@
+import asyncio
+import json
+import threading
+
+
+class EventBus:
+    """
+    In-process pub/sub for query and mentor changes.
+    Publishers are plain route handlers (running in the threadpool),
+    subscribers are SSE streams living on the event loop.
+    """
+
+    def __init__(self, max_queue: int = 256):
+        self._max_queue = max_queue
+        self._subscribers: dict[asyncio.Queue, asyncio.AbstractEventLoop] = {}
+        self._listeners: list = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, listener) -> None:
+        """
+        Registers an in-process callback(event, data).
+        Listeners run synchronously inside publish().
+        """
+        self._listeners.append(listener)
+
+    def subscribe(self) -> asyncio.Queue:
+        # Must be called from inside the event loop
+        queue = asyncio.Queue(maxsize=self._max_queue)
+        with self._lock:
+            self._subscribers[queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    def publish(self, event: str, data: dict) -> None:
+        """
+        Safe to call from any thread.
+        The message is encoded once and shared by every subscriber.
+        """
+
+        for listener in self._listeners:
+            listener(event, data)
+
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+
+        if not subscribers:
+            return
+
+        message = f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, message)
+            except RuntimeError:
+                # loop already closed, stream is gone
+                self.unsubscribe(queue)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, message: str) -> None:
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Slow client: drop its backlog and ask it to resync
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait("event: resync\ndata: {}\n\n")
+
+
+bus = EventBus()
+
+
+# -------------------------
+# Payload helpers
+# -------------------------
+def mentor_payload(mentor) -> dict:
+    return {
+        "id": mentor.id,
+        "name": mentor.name,
+        "is_active": mentor.is_active,
+        "current_load": mentor.current_load,
+        "max_load": mentor.max_load,
+    }
+
+
+def _iso(value) -> str | None:
+    return value.isoformat() if value else None
+
+
+def query_payload(query, mentor=None) -> dict:
+    return {
+        "id": query.id,
+        "team_id": query.team_id,
+        "mentor_id": query.mentor_id,
+        "mentor": mentor.name if mentor else None,
+        "issue": query.issue,
+        "status": query.status,
+        "priority": query.priority,
+        # HH:MM like the list rows the dashboard merges events into
+        "created_at": query.created_at.strftime("%H:%M"),
+        "created_at_iso": _iso(query.created_at),
+        "updated_at": query.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+        "assigned_at": _iso(query.assigned_at),
+        "resolved_at": _iso(query.resolved_at),
+    }
@@ -0,0 +1,217 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from sqlalchemy.exc import IntegrityError
+
+from overclocked_helpdesk.config import settings
+from overclocked_helpdesk.db.session import SessionLocal
+from overclocked_helpdesk.services.notifier import create_queries_bulk, dispatch_queries
+from overclocked_helpdesk.utils.metrics import queue_depth, registry
+
+# upper bounds of the batch size histogram
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+class GroupCommitWriter:
+    """
+    Single writer thread that commits query submissions in groups.
+
+    The first submission opens a window of max_wait seconds; whatever
+    arrives inside it (up to max_batch) is inserted with one INSERT and
+    one commit, so a burst costs one fsync and one write lock instead
+    of one per team. Every caller gets a Future resolving to its own
+    committed row.
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        max_wait: float = 0.005,
+        max_batch: int = 100
+    ):
+        self.session_factory = session_factory
+        self.max_wait = max_wait
+        self.max_batch = max_batch
+
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+        self._batches = 0
+        self._items = 0
+        self._max_batch_seen = 0
+        self._histogram = [0] * (len(BATCH_BUCKETS) + 1)
+        self._commit_seconds = 0.0
+        self._last_commit_seconds = 0.0
+
+    # -------------------------
+    # Thread control
+    # -------------------------
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run,
+            name="ingest-writer",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        # drains what is already queued first
+        self._queue.put(None)
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    # -------------------------
+    # Submitting
+    # -------------------------
+    def submit(self, team_id: int, issue: str, location: str, idempotency_key: str | None = None) -> Future:
+        future: Future = Future()
+        self._queue.put((
+            {
+                "team_id": team_id,
+                "issue": issue,
+                "location": location,
+                "idempotency_key": idempotency_key
+            },
+            future
+        ))
+        return future
+
+    def create(self, team_id: int, issue: str, location: str, timeout: float = 10):
+        """
+        Blocking helper, returns the committed row.
+        """
+        return self.submit(team_id, issue, location).result(timeout)
+
+    # -------------------------
+    # Writer loop
+    # -------------------------
+    def _run(self) -> None:
+        stopping = False
+
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+
+            batch = [first]
+            deadline = time.monotonic() + self.max_wait
+
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._write(batch)
+
+    def _write(self, batch: list) -> None:
+        db = self.session_factory()
+        try:
+            started = time.perf_counter()
+            try:
+                rows = create_queries_bulk(db, [item for item, _ in batch], dispatch=False)
+            except IntegrityError as e:
+                db.rollback()
+                if len(batch) > 1:
+                    # one bad team id or repeated key must not fail its neighbours
+                    for entry in batch:
+                        self._write([entry])
+                    return
+                batch[0][1].set_exception(e)
+                return
+            except Exception as e:
+                db.rollback()
+                for _, future in batch:
+                    future.set_exception(e)
+                return
+
+            self._record(len(batch), time.perf_counter() - started)
+
+            for (_, future), row in zip(batch, rows):
+                future.set_result(row)
+
+            # callers already have their ids, dispatch is not on their path
+            dispatch_queries(db, rows)
+        except Exception as e:
+            print("Ingest writer error:", e)
+        finally:
+            db.close()
+
+    # -------------------------
+    # Metrics
+    # -------------------------
+    def _record(self, size: int, seconds: float) -> None:
+        bucket = next(
+            (i for i, bound in enumerate(BATCH_BUCKETS) if size <= bound),
+            len(BATCH_BUCKETS)
+        )
+
+        with self._lock:
+            self._batches += 1
+            self._items += size
+            self._max_batch_seen = max(self._max_batch_seen, size)
+            self._histogram[bucket] += 1
+            self._commit_seconds += seconds
+            self._last_commit_seconds = seconds
+
+    def stats(self) -> dict:
+        with self._lock:
+            batches = self._batches
+            labels = [f"<={b}" for b in BATCH_BUCKETS] + [f">{BATCH_BUCKETS[-1]}"]
+            return {
+                "queue_depth": self._queue.qsize(),
+                "batches": batches,
+                "items": self._items,
+                "avg_batch_size": round(self._items / batches, 2) if batches else 0.0,
+                "max_batch_size": self._max_batch_seen,
+                "batch_size_histogram": dict(zip(labels, self._histogram)),
+                "avg_commit_ms": round(self._commit_seconds / batches * 1000, 2) if batches else 0.0,
+                "last_commit_ms": round(self._last_commit_seconds * 1000, 2)
+            }
+
+
+# -------------------------
+# Process-wide writer
+# -------------------------
+_writer: GroupCommitWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def get_ingest_writer() -> GroupCommitWriter:
+    global _writer
+
+    with _writer_lock:
+        if _writer is None:
+            _writer = GroupCommitWriter(
+                max_wait=settings.INGEST_GROUP_COMMIT_MS / 1000,
+                max_batch=settings.INGEST_MAX_BATCH
+            )
+            _writer.start()
+
+    return _writer
+
+
+def stop_ingest_writer() -> None:
+    global _writer
+
+    with _writer_lock:
+        if _writer is not None:
+            _writer.stop()
+            _writer = None
+
+
+def _collect_queue_depth(db) -> None:
+    writer = _writer
+    queue_depth.set(writer._queue.qsize() if writer else 0, "ingest")
+
+
+registry.add_collector(_collect_queue_depth)
@@ -0,0 +1,290 @@
+from datetime import datetime
+
+from sqlalchemy import case, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from overclocked_helpdesk.models.mentor import Mentor
+from overclocked_helpdesk.models.query import Query
+
+
+class TransitionError(Exception):
+    """
+    A lifecycle transition lost a race or was not allowed.
+    status_code / detail map straight onto an HTTPException.
+    """
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+QUERY_TAKEN = "Query already taken"
+MENTOR_UNAVAILABLE = "Mentor not available"
+
+
+QUERY_COLUMNS = (
+    Query.id,
+    Query.team_id,
+    Query.mentor_id,
+    Query.issue,
+    Query.location,
+    Query.status,
+    Query.created_at,
+    Query.assigned_at,
+    Query.resolved_at,
+    Query.priority,
+)
+
+MENTOR_COLUMNS = (
+    Mentor.id,
+    Mentor.name,
+    Mentor.email,
+    Mentor.is_active,
+    Mentor.current_load,
+    Mentor.max_load,
+)
+
+
+# -------------------------------------------------
+# Statements
+# -------------------------------------------------
+# Every transition is a conditional UPDATE ... RETURNING, so the
+# check and the write happen in one statement and a loser simply
+# gets no row back.
+
+def claim_query_stmt(query_id: int, mentor_id: int):
+    return (
+        update(Query)
+        .where(
+            Query.id == query_id,
+            Query.status == "PENDING",
+            Query.mentor_id.is_(None)
+        )
+        .values(mentor_id=mentor_id, status="ASSIGNED", assigned_at=datetime.utcnow())
+        .returning(*QUERY_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def increment_load_stmt(mentor_id: int):
+    return (
+        update(Mentor)
+        .where(
+            Mentor.id == mentor_id,
+            Mentor.is_active == True,
+            Mentor.current_load < Mentor.max_load
+        )
+        .values(
+            current_load=Mentor.current_load + 1,
+            is_active=case(
+                (Mentor.current_load + 1 >= Mentor.max_load, False),
+                else_=Mentor.is_active
+            )
+        )
+        .returning(*MENTOR_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def close_query_stmt(query_id: int):
+    return (
+        update(Query)
+        .where(
+            Query.id == query_id,
+            Query.status != "RESOLVED"
+        )
+        .values(status="RESOLVED", resolved_at=datetime.utcnow())
+        .returning(*QUERY_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def decrement_load_stmt(mentor_id: int):
+    return (
+        update(Mentor)
+        .where(
+            Mentor.id == mentor_id,
+            Mentor.current_load > 0
+        )
+        .values(
+            current_load=Mentor.current_load - 1,
+            is_active=case(
+                (Mentor.current_load - 1 < Mentor.max_load, True),
+                else_=Mentor.is_active
+            )
+        )
+        .returning(*MENTOR_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def escalate_query_stmt(query_id: int, priority: int, rank_at: datetime):
+    # the expected old priority makes a repeated escalation a no-op
+    return (
+        update(Query)
+        .where(
+            Query.id == query_id,
+            Query.status == "PENDING",
+            Query.mentor_id.is_(None),
+            Query.priority == priority - 1
+        )
+        .values(priority=priority, rank_at=rank_at)
+        .returning(*QUERY_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def release_query_stmt(query_id: int, mentor_id: int):
+    return (
+        update(Query)
+        .where(
+            Query.id == query_id,
+            Query.status == "ASSIGNED",
+            Query.mentor_id == mentor_id
+        )
+        .values(mentor_id=None, status="PENDING", assigned_at=None)
+        .returning(*QUERY_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+
+
+# -------------------------------------------------
+# Transitions
+# -------------------------------------------------
+def _exists(db: Session, model, row_id: int) -> bool:
+    # only used on the failure path to pick the right error
+    return db.execute(
+        select(model.id).where(model.id == row_id)
+    ).first() is not None
+
+
+def accept(db: Session, query_id: int, mentor_id: int):
+    """
+    PENDING -> ASSIGNED and current_load += 1 in one transaction.
+    Returns (query_row, mentor_row) or raises TransitionError.
+    Commits.
+    """
+
+    try:
+        query = db.execute(claim_query_stmt(query_id, mentor_id)).first()
+    except IntegrityError:
+        # foreign_keys=ON rejects the claim for an unknown mentor
+        db.rollback()
+        raise TransitionError(404, "Mentor not found")
+
+    if query is None:
+        db.rollback()
+        if not _exists(db, Query, query_id):
+            raise TransitionError(404, "Query not found")
+        raise TransitionError(400, QUERY_TAKEN)
+
+    mentor = db.execute(increment_load_stmt(mentor_id)).first()
+
+    if mentor is None:
+        # releases the claim on the query too
+        db.rollback()
+        if not _exists(db, Mentor, mentor_id):
+            raise TransitionError(404, "Mentor not found")
+        raise TransitionError(400, MENTOR_UNAVAILABLE)
+
+    db.commit()
+    return query, mentor
+
+
+def resolve(db: Session, query_id: int):
+    """
+    Any open status -> RESOLVED, giving the mentor's load back.
+    Returns (query_row, mentor_row | None), or (None, None) when the
+    query was already resolved. Commits.
+    """
+
+    query = db.execute(close_query_stmt(query_id)).first()
+
+    if query is None:
+        db.rollback()
+        if not _exists(db, Query, query_id):
+            raise TransitionError(404, "Query not found")
+        return None, None
+
+    mentor = None
+    if query.mentor_id:
+        mentor = db.execute(decrement_load_stmt(query.mentor_id)).first()
+
+    db.commit()
+    return query, mentor
+
+
+def release(db: Session, query_id: int, mentor_id: int):
+    """
+    ASSIGNED -> PENDING, taking the query back from an idle mentor
+    and giving their load back (availability follows the same rule
+    as resolve). Returns (query_row, mentor_row), or
+    (None, None) when the query moved on meanwhile. Commits.
+    """
+
+    query = db.execute(release_query_stmt(query_id, mentor_id)).first()
+
+    if query is None:
+        db.rollback()
+        return None, None
+
+    mentor = db.execute(decrement_load_stmt(mentor_id)).first()
+
+    db.commit()
+    return query, mentor
+
+
+# -------------------------------------------------
+# Async transitions
+# -------------------------------------------------
+# Same statements and outcomes as accept / resolve, for AsyncSession.
+
+async def _exists_async(db: AsyncSession, model, row_id: int) -> bool:
+    return (await db.execute(
+        select(model.id).where(model.id == row_id)
+    )).first() is not None
+
+
+async def accept_async(db: AsyncSession, query_id: int, mentor_id: int):
+    try:
+        query = (await db.execute(claim_query_stmt(query_id, mentor_id))).first()
+    except IntegrityError:
+        await db.rollback()
+        raise TransitionError(404, "Mentor not found")
+
+    if query is None:
+        await db.rollback()
+        if not await _exists_async(db, Query, query_id):
+            raise TransitionError(404, "Query not found")
+        raise TransitionError(400, QUERY_TAKEN)
+
+    mentor = (await db.execute(increment_load_stmt(mentor_id))).first()
+
+    if mentor is None:
+        await db.rollback()
+        if not await _exists_async(db, Mentor, mentor_id):
+            raise TransitionError(404, "Mentor not found")
+        raise TransitionError(400, MENTOR_UNAVAILABLE)
+
+    await db.commit()
+    return query, mentor
+
+
+async def resolve_async(db: AsyncSession, query_id: int):
+    query = (await db.execute(close_query_stmt(query_id))).first()
+
+    if query is None:
+        await db.rollback()
+        if not await _exists_async(db, Query, query_id):
+            raise TransitionError(404, "Query not found")
+        return None, None
+
+    mentor = None
+    if query.mentor_id:
+        mentor = (await db.execute(decrement_load_stmt(query.mentor_id))).first()
+
+    await db.commit()
+    return query, mentor
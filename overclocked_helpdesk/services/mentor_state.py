@@ -0,0 +1,111 @@
+import json
+import threading
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from overclocked_helpdesk.models.mentor import Mentor
+from overclocked_helpdesk.services.events import bus
+
+
+class MentorState:
+    """
+    Every mentor's availability and load, pre-encoded for /mentors/state.
+    """
+
+    __slots__ = ("version", "body", "etag")
+
+    def __init__(self, version: int, mentors: list[dict]):
+        self.version = version
+        self.body = json.dumps(mentors).encode()
+        self.etag = f'"{version}"'
+
+
+class MentorStateCache:
+    """
+    One snapshot of the mentor list, shared by every dashboard.
+
+    Any mentor event (toggle, admin edits, accept / resolve load
+    changes) bumps the version and drops the snapshot. The next read
+    rebuilds it with one SELECT, reads in between only copy bytes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # time based start, so versions from before a restart don't match
+        self._version = int(time.time() * 1000)
+        self._snapshot: MentorState | None = None
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, db: Session) -> MentorState:
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+
+        # Building under the lock orders us against invalidations
+        with self._lock:
+            if self._snapshot is None:
+                rows = db.execute(self._stmt()).all()
+                self._snapshot = MentorState(self._version, self._rows(rows))
+            return self._snapshot
+
+    async def aget(self, db: AsyncSession) -> MentorState:
+        """
+        get for AsyncSession. A snapshot built while a mentor changed
+        is served once but not kept.
+        """
+
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+
+        version = self._version
+        rows = (await db.execute(self._stmt())).all()
+        snapshot = MentorState(version, self._rows(rows))
+
+        with self._lock:
+            if version == self._version and self._snapshot is None:
+                self._snapshot = snapshot
+
+        return snapshot
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._snapshot = None
+
+    def on_event(self, event: str, data: dict) -> None:
+        if event in ("mentor", "mentor_removed"):
+            self.invalidate()
+
+    @staticmethod
+    def _stmt():
+        return select(
+            Mentor.id,
+            Mentor.name,
+            Mentor.is_active,
+            Mentor.current_load,
+            Mentor.max_load
+        ).order_by(Mentor.id.asc())
+
+    @staticmethod
+    def _rows(rows) -> list[dict]:
+        return [
+            {
+                "id": m.id,
+                "name": m.name,
+                "is_active": m.is_active,
+                "current_load": m.current_load,
+                "max_load": m.max_load,
+            }
+            for m in rows
+        ]
+
+
+mentor_state = MentorStateCache()
+bus.add_listener(mentor_state.on_event)
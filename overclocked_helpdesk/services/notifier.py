@@ -1,33 +1,160 @@
+from datetime import datetime
+
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from overclocked_helpdesk.models.query import Query
-from overclocked_helpdesk.services.slack_service import send_slack_alert
+from overclocked_helpdesk.services import lifecycle
+from overclocked_helpdesk.services.lifecycle import TransitionError, MENTOR_UNAVAILABLE, QUERY_COLUMNS
+from overclocked_helpdesk.services.assigner import dispatcher, mentor_index
+from overclocked_helpdesk.services.email_digest import notify_mentor
+from overclocked_helpdesk.services.outbox import enqueue_slack_alert, enqueue_slack_alerts, wake_outbox
+from overclocked_helpdesk.services.events import bus, mentor_payload, query_payload
+
+AUTO_ASSIGN_ATTEMPTS = 3
 
 
 def notify_and_create_query(
     db: Session,
     team_id: int,
     issue: str,
-    location: str
+    location: str,
+    idempotency_key: str | None = None
 ) -> Query:
 
-    # 1. Create query ONLY
+    # 1. Create query
+    now = datetime.utcnow()
     query = Query(
         team_id=team_id,
         issue=issue,
         location=location, 
         status="PENDING",
-        mentor_id=None
+        mentor_id=None,
+        created_at=now,
+        rank_at=now,
+        idempotency_key=idempotency_key
     )
 
     db.add(query)
-    db.commit()
-    db.refresh(query)
+    db.flush()
 
-    # 2. Notify slack only
-    send_slack_alert(
+    # 2. Slack alert goes through the outbox, same transaction
+    enqueue_slack_alert(
+        db,
         team_name=f"Team {team_id}",
         location=location,
-        issue=issue
+        issue=issue,
+        query_id=query.id
     )
 
+    db.commit()
+    db.refresh(query)
+
+    bus.publish("query", query_payload(query))
+    wake_outbox()
+
+    # 3. Auto-dispatch (if enabled), otherwise mentors accept manually
+    if dispatcher.auto and auto_assign(db, query.id, team_id):
+        db.expire(query)
+
     return query
+
+
+def create_queries_bulk(db: Session, items: list[dict], dispatch: bool = True) -> list:
+    """
+    Inserts many queries with a single executemany and one commit.
+    items are dicts with team_id, issue and location, and optionally
+    idempotency_key.
+    Returns the inserted rows in input order.
+
+    Alerts are queued SLACK_BATCH_SIZE per outbox row, each row going
+    out as one Slack message. dispatch=False leaves auto-dispatch to the caller
+    (see dispatch_queries).
+    """
+
+    if not items:
+        return []
+
+    now = datetime.utcnow()
+
+    # One multi-row INSERT. SQLite hands out increasing rowids in VALUES
+    # order, so sorting RETURNING by id restores input order without
+    # sort_by_parameter_order (which falls back to row-at-a-time).
+    rows = db.execute(
+        insert(Query).returning(*QUERY_COLUMNS),
+        [
+            {
+                "team_id": item["team_id"],
+                "issue": item["issue"],
+                "location": item["location"],
+                "status": "PENDING",
+                "mentor_id": None,
+                "created_at": now,
+                "rank_at": now,
+                "idempotency_key": item.get("idempotency_key")
+            }
+            for item in items
+        ]
+    ).all()
+    rows.sort(key=lambda row: row.id)
+
+    enqueue_slack_alerts(db, [
+        {
+            "query_id": row.id,
+            "team_name": f"Team {row.team_id}",
+            "location": row.location,
+            "issue": row.issue
+        }
+        for row in rows
+    ])
+
+    db.commit()
+
+    for row in rows:
+        bus.publish("query", query_payload(row))
+    wake_outbox()
+
+    if dispatch:
+        dispatch_queries(db, rows)
+
+    return rows
+
+
+def dispatch_queries(db: Session, rows: list) -> None:
+    if dispatcher.auto:
+        for row in rows:
+            auto_assign(db, row.id, row.team_id)
+
+
+def auto_assign(db: Session, query_id: int, team_id: int) -> bool:
+    """
+    Assigns a PENDING query using the in-memory mentor index.
+    The pick is only a hint: the atomic accept decides, and a mentor
+    that filled up meanwhile is skipped for the next candidate.
+    """
+
+    if not mentor_index.warmed:
+        mentor_index.warm(db)
+    mentor_index.load_team(db, team_id)
+
+    tried = set()
+
+    for _ in range(AUTO_ASSIGN_ATTEMPTS):
+        mentor_id = mentor_index.pick(team_id, exclude=tried)
+        if mentor_id is None:
+            return False
+
+        try:
+            query, mentor = lifecycle.accept(db, query_id, mentor_id)
+        except TransitionError as e:
+            if e.detail != MENTOR_UNAVAILABLE:
+                # taken manually or gone
+                return False
+            tried.add(mentor_id)
+            continue
+
+        bus.publish("query", query_payload(query, mentor))
+        bus.publish("mentor", mentor_payload(mentor))
+        notify_mentor("assigned", mentor, query)
+        return True
+
+    return False
@@ -0,0 +1,291 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from overclocked_helpdesk.config import settings
+from overclocked_helpdesk.db.session import SessionLocal
+from overclocked_helpdesk.models.outbox import OutboxMessage
+from overclocked_helpdesk.services.slack_service import SlackWebhookClient, build_payload
+from overclocked_helpdesk.utils.metrics import queue_depth, registry
+
+SLACK = "slack"
+
+
+def enqueue_slack_alert(
+    db: Session,
+    team_name: str,
+    location: str,
+    issue: str,
+    query_id: int | None = None
+) -> OutboxMessage:
+    """
+    Adds a Slack alert to the outbox.
+    Does NOT commit, the row is part of the caller's transaction.
+    """
+
+    message = OutboxMessage(
+        channel=SLACK,
+        payload=json.dumps({
+            "query_id": query_id,
+            "team_name": team_name,
+            "location": location,
+            "issue": issue
+        })
+    )
+    db.add(message)
+    return message
+
+
+def enqueue_slack_alerts(
+    db: Session,
+    alerts: list[dict],
+    per_message: int | None = None
+) -> list[OutboxMessage]:
+    """
+    Adds alerts as one outbox row per per_message alerts (default
+    SLACK_BATCH_SIZE), each row going out as one Slack message, so a
+    large batch never builds a post over Slack's size limit.
+    Does NOT commit.
+    """
+
+    per_message = per_message or settings.SLACK_BATCH_SIZE
+    messages = [
+        OutboxMessage(channel=SLACK, payload=json.dumps(alerts[i:i + per_message]))
+        for i in range(0, len(alerts), per_message)
+    ]
+    db.add_all(messages)
+    return messages
+
+
+def _alerts(messages: list[OutboxMessage]) -> list[dict]:
+    alerts = []
+    for m in messages:
+        payload = json.loads(m.payload)
+        alerts.extend(payload if isinstance(payload, list) else [payload])
+    return alerts
+
+
+class SlackOutboxWorker:
+    """
+    Drains PENDING Slack alerts from the outbox on a dedicated thread.
+
+    Alerts that are due when a send happens go out together, up to
+    batch_size per message, and sends are spaced by min_interval to
+    stay under Slack's per-webhook rate limit. Failed batches are retried with
+    exponential backoff (or Slack's Retry-After) up to max_attempts.
+
+    Delivery is at-least-once: a crash between the POST and the
+    commit re-sends that batch on restart.
+    """
+
+    def __init__(
+        self,
+        client: SlackWebhookClient,
+        session_factory=SessionLocal,
+        batch_size: int = 20,
+        min_interval: float = 1.0,
+        max_attempts: int = 8,
+        base_backoff: float = 2.0,
+        max_backoff: float = 300.0,
+        poll_interval: float = 30.0
+    ):
+        self.client = client
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.min_interval = min_interval
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.poll_interval = poll_interval
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._last_send = 0.0
+
+    # -------------------------
+    # Thread control
+    # -------------------------
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="slack-outbox",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self.client.close()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+
+            try:
+                if self.drain_once():
+                    continue
+                timeout = self.seconds_until_next_due()
+            except Exception as e:
+                print("Slack outbox error:", e)
+                timeout = self.poll_interval
+
+            self._wake.wait(timeout)
+
+    # -------------------------
+    # Delivery
+    # -------------------------
+    def drain_once(self) -> int:
+        """
+        Sends one coalesced batch of due alerts.
+        Returns how many outbox rows were handled.
+        """
+
+        # Rate limit first, so alerts arriving meanwhile join the batch
+        wait = self._last_send + self.min_interval - time.monotonic()
+        if wait > 0 and self._stop.wait(wait):
+            return 0
+
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            messages = db.execute(
+                select(OutboxMessage)
+                .where(
+                    OutboxMessage.channel == SLACK,
+                    OutboxMessage.status == "PENDING",
+                    OutboxMessage.next_attempt_at <= now
+                )
+                .order_by(OutboxMessage.id.asc())
+                .limit(self.batch_size)
+            ).scalars().all()
+        finally:
+            # don't hold the writer connection across the HTTP call
+            db.close()
+
+        if not messages:
+            return 0
+
+        # whole rows only, up to batch_size alerts (a row holds at
+        # most that many, see enqueue_slack_alerts)
+        alerts = _alerts(messages[:1])
+        taken = 1
+        for m in messages[1:]:
+            more = _alerts([m])
+            if len(alerts) + len(more) > self.batch_size:
+                break
+            alerts.extend(more)
+            taken += 1
+        messages = messages[:taken]
+
+        ok, retry_after = self.client.post(build_payload(alerts))
+        self._last_send = time.monotonic()
+
+        db = self.session_factory()
+        try:
+            db.add_all(messages)
+
+            now = datetime.utcnow()
+            for m in messages:
+                m.attempts += 1
+
+                if ok:
+                    # delivered rows are dropped, the table only holds
+                    # what is still owed (and FAILED rows to inspect)
+                    db.delete(m)
+                elif m.attempts >= self.max_attempts:
+                    m.status = "FAILED"
+                    m.last_error = "gave up after retries"
+                else:
+                    delay = retry_after or min(
+                        self.base_backoff * 2 ** (m.attempts - 1),
+                        self.max_backoff
+                    )
+                    m.next_attempt_at = now + timedelta(seconds=delay)
+                    m.last_error = "rate limited" if retry_after else "send failed"
+
+            db.commit()
+            return len(messages)
+        finally:
+            db.close()
+
+    def seconds_until_next_due(self) -> float:
+        db = self.session_factory()
+        try:
+            next_due = db.execute(
+                select(func.min(OutboxMessage.next_attempt_at))
+                .where(
+                    OutboxMessage.channel == SLACK,
+                    OutboxMessage.status == "PENDING"
+                )
+            ).scalar()
+        finally:
+            db.close()
+
+        if next_due is None:
+            return self.poll_interval
+
+        delay = (next_due - datetime.utcnow()).total_seconds()
+        return min(max(delay, 0.0), self.poll_interval)
+
+
+# -------------------------
+# Process-wide worker
+# -------------------------
+_worker: SlackOutboxWorker | None = None
+
+
+def start_outbox_worker() -> SlackOutboxWorker | None:
+    global _worker
+
+    # Without a webhook alerts stay PENDING until one is configured
+    if not settings.SLACK_WEBHOOK_URL or _worker is not None:
+        return _worker
+
+    _worker = SlackOutboxWorker(
+        SlackWebhookClient(settings.SLACK_WEBHOOK_URL),
+        batch_size=settings.SLACK_BATCH_SIZE,
+        min_interval=settings.SLACK_MIN_INTERVAL_SECONDS
+    )
+    _worker.start()
+    return _worker
+
+
+def stop_outbox_worker() -> None:
+    global _worker
+
+    if _worker is not None:
+        _worker.stop()
+        _worker = None
+
+
+def wake_outbox() -> None:
+    if _worker is not None:
+        _worker.wake()
+
+
+def _collect_queue_depth(db: Session) -> None:
+    # rows, not messages: a batch of rows goes out as one post
+    pending = db.execute(
+        select(func.count())
+        .select_from(OutboxMessage)
+        .where(
+            OutboxMessage.channel == SLACK,
+            OutboxMessage.status == "PENDING"
+        )
+    ).scalar()
+    queue_depth.set(pending, "slack_outbox")
+
+
+registry.add_collector(_collect_queue_depth)
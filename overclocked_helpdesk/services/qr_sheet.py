@@ -0,0 +1,112 @@
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageDraw, ImageFont
+
+from overclocked_helpdesk.config import settings
+from overclocked_helpdesk.utils.qr import qr_path, qr_png, render_qr_png, store_qr_png
+
+
+# A4 at 150 dpi, 3 x 4 badges per page
+PAGE_SIZE = (1240, 1754)
+PAGE_DPI = 150
+COLUMNS = 3
+ROWS = 4
+MARGIN = 60
+QR_SIZE = 320
+LABEL_SIZE = 32
+
+
+# -------------------------
+# Render pool
+# -------------------------
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def get_render_pool() -> ProcessPoolExecutor:
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.QR_WORKERS or os.cpu_count(),
+                # forking a process that runs threads can copy held locks
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def stop_render_pool() -> None:
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def render_all(urls: list[str]) -> list[bytes]:
+    """
+    PNGs for urls, in order. Files already on disk are read, the rest
+    are rendered across the pool and stored for next time.
+    """
+
+    missing = [url for url in dict.fromkeys(urls) if not qr_path(url).exists()]
+
+    if len(missing) > 1:
+        for url, png in zip(missing, get_render_pool().map(render_qr_png, missing)):
+            store_qr_png(url, png)
+
+    return [qr_png(url) for url in urls]
+
+
+# -------------------------
+# Printable sheet
+# -------------------------
+def build_sheet(badges: list[tuple[str, bytes]]) -> bytes:
+    """
+    Lays (label, png) badges out in a grid and returns a multi-page PDF.
+    """
+
+    font = ImageFont.load_default(size=LABEL_SIZE)
+    per_page = COLUMNS * ROWS
+    cell_w = (PAGE_SIZE[0] - 2 * MARGIN) // COLUMNS
+    cell_h = (PAGE_SIZE[1] - 2 * MARGIN) // ROWS
+
+    pages = []
+    for start in range(0, max(len(badges), 1), per_page):
+        page = Image.new("L", PAGE_SIZE, 255)
+        draw = ImageDraw.Draw(page)
+
+        for i, (label, png) in enumerate(badges[start:start + per_page]):
+            x = MARGIN + (i % COLUMNS) * cell_w
+            y = MARGIN + (i // COLUMNS) * cell_h
+
+            qr = Image.open(io.BytesIO(png)).convert("L")
+            qr = qr.resize((QR_SIZE, QR_SIZE), Image.NEAREST)
+            page.paste(qr, (x + (cell_w - QR_SIZE) // 2, y))
+
+            draw.text(
+                (x + cell_w // 2, y + QR_SIZE + 10),
+                label,
+                fill=0,
+                font=font,
+                anchor="mt"
+            )
+
+        # bilevel pages are stored losslessly (CCITT), L would go through JPEG
+        pages.append(page.convert("1", dither=Image.Dither.NONE))
+
+    buf = io.BytesIO()
+    pages[0].save(
+        buf,
+        format="PDF",
+        save_all=True,
+        append_images=pages[1:],
+        resolution=PAGE_DPI
+    )
+    return buf.getvalue()
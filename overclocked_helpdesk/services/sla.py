@@ -0,0 +1,141 @@
+import threading
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from overclocked_helpdesk.models.archive import all_queries
+from overclocked_helpdesk.services.events import bus
+from overclocked_helpdesk.utils.tdigest import TDigest
+
+
+QUANTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+
+
+class SlaDigests:
+    """
+    Sketches of one duration, overall, per mentor and per hour.
+    """
+
+    def __init__(self):
+        self.overall = TDigest()
+        self.by_mentor: dict[int, TDigest] = defaultdict(TDigest)
+        self.by_hour: dict[str, TDigest] = defaultdict(TDigest)
+
+    def add(self, seconds: float, mentor_id: int | None, hour: str) -> None:
+        self.overall.add(seconds)
+        self.by_hour[hour].add(seconds)
+        if mentor_id is not None:
+            self.by_mentor[mentor_id].add(seconds)
+
+    def summary(self) -> dict:
+        return {
+            "overall": _summary(self.overall),
+            "by_mentor": {
+                str(mentor_id): _summary(d)
+                for mentor_id, d in sorted(self.by_mentor.items())
+            },
+            "by_hour": {
+                hour: _summary(d)
+                for hour, d in sorted(self.by_hour.items())
+            }
+        }
+
+
+def _summary(digest: TDigest) -> dict:
+    out = {"count": digest.count}
+    for name, q in QUANTILES.items():
+        value = digest.quantile(q)
+        out[name] = round(value, 1) if value is not None else None
+    return out
+
+
+def _hour(created_at: datetime) -> str:
+    return created_at.strftime("%Y-%m-%dT%H:00")
+
+
+class SlaAnalytics:
+    """
+    Time-to-accept (wait) and time-to-resolve (created -> resolved) as
+    t-digests, fed by accept / resolve events. Built from the tables
+    once on startup, after that no read touches the database.
+
+    A query handed back to the pool and accepted again has waited
+    once: only its first accept is a wait sample.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.wait = SlaDigests()
+        self.resolution = SlaDigests()
+        # open queries whose wait is already sampled
+        self._waited: set[int] = set()
+
+    def _record(self, created_at, assigned_at, resolved_at, mentor_id) -> None:
+        hour = _hour(created_at)
+        if assigned_at is not None:
+            self.wait.add((assigned_at - created_at).total_seconds(), mentor_id, hour)
+        if resolved_at is not None:
+            self.resolution.add((resolved_at - created_at).total_seconds(), mentor_id, hour)
+
+    def warm(self, db: Session) -> None:
+        q = all_queries()
+        rows = db.execute(
+            select(q.c.id, q.c.mentor_id, q.c.created_at, q.c.assigned_at, q.c.resolved_at)
+            .where(or_(q.c.assigned_at.is_not(None), q.c.resolved_at.is_not(None)))
+        )
+
+        with self._lock:
+            self._reset()
+            for row in rows:
+                self._record(row.created_at, row.assigned_at, row.resolved_at, row.mentor_id)
+                if row.resolved_at is None:
+                    self._waited.add(row.id)
+
+    def on_event(self, event: str, data: dict) -> None:
+        # one event per transition: ASSIGNED carries assigned_at,
+        # RESOLVED carries resolved_at
+        if event != "query" or data["status"] not in ("ASSIGNED", "RESOLVED"):
+            return
+
+        created_at = datetime.fromisoformat(data["created_at_iso"])
+
+        if data["status"] == "ASSIGNED":
+            assigned_at, resolved_at = data["assigned_at"], None
+        else:
+            assigned_at, resolved_at = None, data["resolved_at"]
+
+        if assigned_at is None and resolved_at is None:
+            return
+
+        with self._lock:
+            if assigned_at is not None:
+                if data["id"] in self._waited:
+                    # accepted again after a release
+                    return
+                self._waited.add(data["id"])
+            else:
+                self._waited.discard(data["id"])
+
+            self._record(
+                created_at,
+                datetime.fromisoformat(assigned_at) if assigned_at else None,
+                datetime.fromisoformat(resolved_at) if resolved_at else None,
+                data["mentor_id"]
+            )
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "unit": "seconds",
+                "wait": self.wait.summary(),
+                "resolution": self.resolution.summary()
+            }
+
+
+sla = SlaAnalytics()
+bus.add_listener(sla.on_event)
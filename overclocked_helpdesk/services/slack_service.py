@@ -1,21 +1,113 @@
+import time
+
 import requests
+from requests.adapters import HTTPAdapter
+
 from overclocked_helpdesk.config import settings
+from overclocked_helpdesk.utils.metrics import notifier_failures, notifier_send_seconds
 
 
-def send_slack_alert(team_name: str, location: str, issue: str) -> bool:
-    payload = {
-        "text": (
-            "*New Helpdesk Query*\n"
-            f"*Team:* {team_name}\n"
-            f"*Location:* {location}\n"
-            f"*Issue:* {issue}"
-        )
-    }
+SLACK_CHANNEL = "slack"
 
-    response = requests.post(
-        settings.SLACK_WEBHOOK_URL,
-        json=payload,
-        timeout=10
+
+def format_alert(team_name: str, location: str, issue: str, waiting_minutes: int | None = None) -> str:
+    text = (
+        f"*Team:* {team_name}\n"
+        f"*Location:* {location}\n"
+        f"*Issue:* {issue}"
     )
+    if waiting_minutes is not None:
+        text += f"\n*Waiting:* {waiting_minutes} min, still unanswered"
+    return text
+
+
+def build_payload(alerts: list[dict]) -> dict:
+    """
+    One Slack message for one or many alerts.
+    Each alert is a dict with team_name, location and issue, and
+    waiting_minutes when it re-announces a query nobody took.
+    """
+
+    blocks = [
+        format_alert(a["team_name"], a["location"], a["issue"], a.get("waiting_minutes"))
+        for a in alerts
+    ]
+    kind = "Unanswered" if all("waiting_minutes" in a for a in alerts) else "New"
+
+    if len(blocks) == 1:
+        return {"text": f"*{kind} Helpdesk Query*\n" + blocks[0]}
+
+    return {
+        "text": f"*{len(blocks)} {kind} Helpdesk Queries*\n\n" + "\n\n".join(blocks)
+    }
+
+
+class SlackWebhookClient:
+    """
+    Keep-alive HTTP client for a single incoming webhook.
+    """
+
+    def __init__(self, webhook_url: str, timeout: float = 5):
+        self.webhook_url = webhook_url
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
-    return response.status_code == 200
+    def post(self, payload: dict) -> tuple[bool, float | None]:
+        """
+        Returns (ok, retry_after).
+        retry_after is set when Slack rate limits the webhook.
+        """
+
+        started = time.perf_counter()
+        try:
+            response = self.session.post(
+                self.webhook_url,
+                json=payload,
+                timeout=self.timeout
+            )
+        except requests.RequestException:
+            notifier_failures.inc(SLACK_CHANNEL, "error")
+            return False, None
+        finally:
+            notifier_send_seconds.observe(time.perf_counter() - started, SLACK_CHANNEL)
+
+        if response.status_code == 429:
+            notifier_failures.inc(SLACK_CHANNEL, "rate_limited")
+            try:
+                return False, float(response.headers.get("Retry-After", 1))
+            except ValueError:
+                return False, 1.0
+
+        if response.status_code != 200:
+            notifier_failures.inc(SLACK_CHANNEL, "status")
+            return False, None
+
+        return True, None
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_client: SlackWebhookClient | None = None
+
+
+def get_client() -> SlackWebhookClient:
+    global _client
+
+    if _client is None or _client.webhook_url != settings.SLACK_WEBHOOK_URL:
+        _client = SlackWebhookClient(settings.SLACK_WEBHOOK_URL)
+
+    return _client
+
+
+def send_slack_alert(team_name: str, location: str, issue: str) -> bool:
+    ok, _ = get_client().post(
+        build_payload([
+            {"team_name": team_name, "location": location, "issue": issue}
+        ])
+    )
+    return ok
@@ -0,0 +1,109 @@
+import hashlib
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from overclocked_helpdesk.config import settings
+from overclocked_helpdesk.models.query import Query
+from overclocked_helpdesk.utils.metrics import duplicate_submissions
+
+
+def _digest(*parts) -> bytes:
+    return hashlib.sha256("\x1f".join(str(p) for p in parts).encode()).digest()[:16]
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split()).casefold()
+
+
+def submission_keys(team_id: int, issue: str, location: str, idempotency_key: str | None) -> list[tuple[str, bytes]]:
+    """
+    (match, hash) pairs a submission is known by: the form's
+    idempotency key, and its content with case and spacing ignored.
+    """
+
+    keys = [("content", _digest("content", team_id, _normalize(issue), _normalize(location)))]
+    if idempotency_key:
+        keys.insert(0, ("key", _digest("key", idempotency_key)))
+    return keys
+
+
+class SubmissionDedup:
+    """
+    Hashed index of recent /submit calls, each entry living `window`
+    seconds.
+
+    The first submission claims its keys with a Future that resolves
+    to its query id. Repeats inside the window (same idempotency key,
+    or same team / issue / location) get that Future instead, so they
+    wait for the original while it is in flight and never write or
+    notify. A failed original releases its keys, its retry is new.
+
+    Only covers this process: the unique idempotency_key column
+    catches the rest (see query_id_for_key).
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self._lock = threading.Lock()
+        self._entries: dict[bytes, tuple[float, Future]] = {}
+        # (expires, hash) in claim order, all entries share one window
+        self._expiry: deque[tuple[float, bytes]] = deque()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expire(self, now: float) -> None:
+        while self._expiry and self._expiry[0][0] <= now:
+            expires, digest = self._expiry.popleft()
+            entry = self._entries.get(digest)
+            if entry is not None and entry[0] == expires:
+                del self._entries[digest]
+
+    def claim(self, team_id: int, issue: str, location: str, idempotency_key: str | None = None) -> tuple[Future, bool]:
+        """
+        Returns (future, is_new). When is_new the caller creates the
+        query and completes the future with its id or its exception.
+        """
+
+        future: Future = Future()
+        if self.window <= 0:
+            return future, True
+
+        keys = submission_keys(team_id, issue, location, idempotency_key)
+        now = time.monotonic()
+
+        with self._lock:
+            self._expire(now)
+
+            for match, digest in keys:
+                entry = self._entries.get(digest)
+                if entry is not None:
+                    duplicate_submissions.inc(match)
+                    return entry[1], False
+
+            expires = now + self.window
+            for _, digest in keys:
+                self._entries[digest] = (expires, future)
+                self._expiry.append((expires, digest))
+
+        return future, True
+
+    def fail(self, future: Future, error: BaseException) -> None:
+        with self._lock:
+            for digest in [d for d, (_, f) in self._entries.items() if f is future]:
+                del self._entries[digest]
+        future.set_exception(error)
+
+
+def query_id_for_key(db: Session, idempotency_key: str) -> int | None:
+    return db.execute(
+        select(Query.id).where(Query.idempotency_key == idempotency_key)
+    ).scalar()
+
+
+submit_dedup = SubmissionDedup(settings.SUBMIT_DEDUP_WINDOW_SECONDS)
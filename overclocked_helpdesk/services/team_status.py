@@ -0,0 +1,186 @@
+import hashlib
+import json
+import threading
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from overclocked_helpdesk.models.mentor import Mentor
+from overclocked_helpdesk.models.archive import ArchivedQuery
+from overclocked_helpdesk.models.query import Query
+from overclocked_helpdesk.services.events import bus
+
+
+class TeamStatus:
+    """
+    Latest query of one team, pre-encoded for the status endpoints.
+    data is None when the team has never raised a query.
+    """
+
+    __slots__ = ("query_id", "mentor_id", "data", "body", "etag")
+
+    def __init__(self, query_id: int, mentor_id: int | None, data: dict | None):
+        self.query_id = query_id
+        self.mentor_id = mentor_id
+        self.data = data
+        self.body = json.dumps(data).encode()
+        self.etag = '"' + hashlib.md5(self.body).hexdigest() + '"'
+
+
+# Served for teams without queries and never cached, so made-up ids
+# in /teams/status can't grow the projection
+NO_QUERY = TeamStatus(0, None, None)
+
+
+class TeamStatusProjection:
+    """
+    Materialized latest-query-per-team view.
+
+    Entries are loaded from the DB once per team and afterwards kept
+    current by query / mentor events, so polling never touches the DB.
+    Only teams with a query get an entry.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[int, TeamStatus] = {}
+        # bumped by every event, lets async loads spot a race
+        self._version = 0
+
+    def get_many(self, db: Session, team_ids: list[int]) -> dict[int, TeamStatus]:
+        entries = self._entries
+        missing = [t for t in team_ids if t not in entries]
+
+        if missing:
+            # Loading under the lock orders us against event updates:
+            # anything committed before we read is in the DB, anything
+            # after waits for the lock and is applied on top.
+            with self._lock:
+                missing = [t for t in missing if t not in entries]
+                if missing:
+                    rows = [row for stmt in self._stmts(missing) for row in db.execute(stmt).all()]
+                    entries.update(self._build(rows))
+
+        return {t: entries.get(t, NO_QUERY) for t in team_ids}
+
+    def get(self, db: Session, team_id: int) -> TeamStatus:
+        return self.get_many(db, [team_id])[team_id]
+
+    async def aget_many(self, db: AsyncSession, team_ids: list[int]) -> dict[int, TeamStatus]:
+        """
+        get_many for AsyncSession. The lock can't be held across an
+        await, so the load is only cached when no event arrived while
+        it ran. Otherwise it is served once and the next read reloads.
+        """
+
+        entries = self._entries
+        missing = [t for t in team_ids if t not in entries]
+
+        if not missing:
+            return {t: entries[t] for t in team_ids}
+
+        version = self._version
+        rows = [row for stmt in self._stmts(missing) for row in (await db.execute(stmt)).all()]
+        loaded = self._build(rows)
+
+        with self._lock:
+            if version == self._version:
+                for t, entry in loaded.items():
+                    entries.setdefault(t, entry)
+
+        return {t: entries.get(t) or loaded.get(t, NO_QUERY) for t in team_ids}
+
+    async def aget(self, db: AsyncSession, team_id: int) -> TeamStatus:
+        return (await self.aget_many(db, [team_id]))[team_id]
+
+    def _stmts(self, team_ids: list[int]):
+        # latest live and latest archived query per team, _build keeps
+        # whichever is newer
+        for model in (Query, ArchivedQuery):
+            latest_ids = (
+                select(func.max(model.id))
+                .where(model.team_id.in_(team_ids))
+                .group_by(model.team_id)
+            )
+
+            yield (
+                select(model, Mentor.name)
+                .outerjoin(Mentor, Mentor.id == model.mentor_id)
+                .where(model.id.in_(latest_ids))
+            )
+
+    def _build(self, rows) -> dict[int, TeamStatus]:
+        loaded: dict[int, TeamStatus] = {}
+        for query, mentor_name in rows:
+            current = loaded.get(query.team_id)
+            if current is not None and query.id < current.query_id:
+                continue
+
+            loaded[query.team_id] = TeamStatus(
+                query.id,
+                query.mentor_id,
+                status_data(
+                    issue=query.issue,
+                    status=query.status,
+                    mentor=mentor_name,
+                    updated_at=query.created_at.strftime("%Y-%m-%d %H:%M:%S")
+                )
+            )
+
+        return loaded
+
+    # -------------------------
+    # Event listener
+    # -------------------------
+    def on_event(self, event: str, data: dict) -> None:
+        if event == "query":
+            self._apply_query(data)
+        elif event == "mentor":
+            self._apply_mentor(data)
+
+    def _apply_query(self, q: dict) -> None:
+        with self._lock:
+            self._version += 1
+            current = self._entries.get(q["team_id"])
+
+            # Not cached yet (next read loads it) or an older query
+            if current is None or q["id"] < current.query_id:
+                return
+
+            self._entries[q["team_id"]] = TeamStatus(
+                q["id"],
+                q["mentor_id"],
+                status_data(
+                    issue=q["issue"],
+                    status=q["status"],
+                    mentor=q["mentor"],
+                    updated_at=q["updated_at"]
+                )
+            )
+
+    def _apply_mentor(self, m: dict) -> None:
+        with self._lock:
+            self._version += 1
+            for team_id, entry in list(self._entries.items()):
+                if entry.mentor_id != m["id"] or entry.data["mentor"] == m["name"]:
+                    continue
+
+                self._entries[team_id] = TeamStatus(
+                    entry.query_id,
+                    entry.mentor_id,
+                    {**entry.data, "mentor": m["name"]}
+                )
+
+
+def status_data(issue: str, status: str, mentor: str | None, updated_at: str) -> dict:
+    return {
+        "issue": issue,
+        "status": status,
+        "mentor": mentor,
+        "updated_at": updated_at
+    }
+
+
+projection = TeamStatusProjection()
+bus.add_listener(projection.on_event)
@@ -0,0 +1,309 @@
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+
+from sqlalchemy import event
+
+
+# -------------------------
+# Metric types
+# -------------------------
+# Just enough of the Prometheus client model for /metrics: label values
+# are positional, children are created on first use.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labels: tuple = ()):
+        self.name = name
+        self.doc = doc
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        self._values: dict[tuple, object] = {}
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_labels(self.label_names, key)} {value}"
+            for key, value in items
+        ]
+
+
+class Gauge(Metric):
+    """
+    Set directly, or filled at scrape time by a collector.
+    """
+
+    kind = "gauge"
+
+    def set(self, value: float, *labels) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def replace(self, values: dict[tuple, float]) -> None:
+        # drops label sets that disappeared (deleted mentors, ...)
+        with self._lock:
+            self._values = dict(values)
+
+    render = Counter.render
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, doc: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels) -> None:
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                # per-bucket counts (last one is +Inf), sum, count
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][bisect_left(self.buckets, value)] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted((key, (list(e[0]), e[1], e[2])) for key, e in self._values.items())
+
+        lines = self.header()
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip((*self.buckets, "+Inf"), counts):
+                cumulative += n
+                le = _labels(self.label_names, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {total}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list[Metric] = []
+        self._collectors: list = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector) -> None:
+        """
+        collector(*args) runs on every scrape, before rendering,
+        to refresh gauges that are read rather than pushed.
+        """
+        self._collectors.append(collector)
+
+    def render(self, *args) -> str:
+        for collector in self._collectors:
+            collector(*args)
+
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+# -------------------------
+# Metrics
+# -------------------------
+http_request_seconds = registry.register(Histogram(
+    "helpdesk_http_request_duration_seconds",
+    "Request latency by route template.",
+    ("method", "route", "status")
+))
+
+db_statements_per_request = registry.register(Histogram(
+    "helpdesk_db_statements_per_request",
+    "SQL statements executed while serving one request.",
+    ("route",),
+    buckets=COUNT_BUCKETS
+))
+
+db_seconds_per_request = registry.register(Histogram(
+    "helpdesk_db_seconds_per_request",
+    "Time spent executing SQL while serving one request.",
+    ("route",)
+))
+
+db_statements = registry.register(Counter(
+    "helpdesk_db_statements_total",
+    "SQL statements executed, including background workers.",
+    ("engine",)
+))
+
+db_seconds = registry.register(Counter(
+    "helpdesk_db_seconds_total",
+    "Time spent executing SQL, including background workers.",
+    ("engine",)
+))
+
+notifier_send_seconds = registry.register(Histogram(
+    "helpdesk_notifier_send_duration_seconds",
+    "Time to deliver one Slack post or one email.",
+    ("channel",)
+))
+
+notifier_failures = registry.register(Counter(
+    "helpdesk_notifier_failures_total",
+    "Notifications that failed or were dropped.",
+    ("channel", "reason")
+))
+
+duplicate_submissions = registry.register(Counter(
+    "helpdesk_duplicate_submissions_total",
+    "Repeated /submit calls answered with the original query, by what matched.",
+    ("match",)
+))
+
+escalations = registry.register(Counter(
+    "helpdesk_escalations_total",
+    "Stale queries re-announced (realert) or taken back from idle mentors (requeue).",
+    ("action",)
+))
+
+queue_depth = registry.register(Gauge(
+    "helpdesk_queue_depth",
+    "Items waiting in background queues.",
+    ("queue",)
+))
+
+open_queries = registry.register(Gauge(
+    "helpdesk_open_queries",
+    "Live queries by status.",
+    ("status",)
+))
+
+mentor_load = registry.register(Gauge(
+    "helpdesk_mentor_load",
+    "Queries currently assigned to a mentor.",
+    ("mentor_id",)
+))
+
+mentor_capacity = registry.register(Gauge(
+    "helpdesk_mentor_max_load",
+    "Most queries a mentor takes at once.",
+    ("mentor_id",)
+))
+
+
+# -------------------------
+# Per-request DB accounting
+# -------------------------
+class RequestStats:
+    __slots__ = ("statements", "seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+
+
+# Copied into threadpool workers and SQLAlchemy's async greenlets, so
+# statements land on the request that issued them.
+current_request: contextvars.ContextVar[RequestStats | None] = contextvars.ContextVar(
+    "current_request", default=None
+)
+
+
+def instrument_engine(engine, name: str) -> None:
+    """
+    Counts statements and cursor time on a sync Engine (for async
+    engines pass .sync_engine).
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_metrics_started", None)
+        if started is None:
+            return
+
+        elapsed = time.perf_counter() - started
+        db_statements.inc(name)
+        db_seconds.inc(name, amount=elapsed)
+
+        stats = current_request.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.seconds += elapsed
+
+
+# -------------------------
+# Middleware
+# -------------------------
+class MetricsMiddleware:
+    """
+    Pure ASGI, so streaming responses pass straight through. Latency
+    runs until the last body chunk. Routes are labelled by template
+    (/queries/{query_id}), never by raw path.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request.reset(token)
+
+            route = scope.get("route")
+            label = getattr(route, "path", None) or scope.get("root_path") or "unmatched"
+
+            http_request_seconds.observe(
+                time.perf_counter() - started, scope["method"], label, status
+            )
+            db_statements_per_request.observe(stats.statements, label)
+            db_seconds_per_request.observe(stats.seconds, label)
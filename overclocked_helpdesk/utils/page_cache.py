@@ -0,0 +1,40 @@
+import hashlib
+import threading
+
+from fastapi import Request
+from fastapi.responses import HTMLResponse, Response
+from fastapi.templating import Jinja2Templates
+
+
+class PageCache:
+    """
+    Rendered HTML of pages that only depend on their template, kept
+    per process. Clients revalidate with If-None-Match and get a 304
+    until the app is redeployed.
+    """
+
+    def __init__(self, templates: Jinja2Templates):
+        self.templates = templates
+        self._pages: dict[str, tuple[bytes, str]] = {}
+        self._lock = threading.Lock()
+
+    def _page(self, name: str) -> tuple[bytes, str]:
+        page = self._pages.get(name)
+        if page is not None:
+            return page
+
+        with self._lock:
+            if name not in self._pages:
+                body = self.templates.get_template(name).render().encode()
+                etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+                self._pages[name] = (body, etag)
+            return self._pages[name]
+
+    def response(self, request: Request, name: str) -> Response:
+        body, etag = self._page(name)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+
+        return HTMLResponse(body, headers=headers)
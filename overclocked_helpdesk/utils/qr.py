@@ -1,20 +1,44 @@
-import qrcode
+import hashlib
+import io
+import os
+import threading
+from functools import lru_cache
 from pathlib import Path
 
+import qrcode
+
+from overclocked_helpdesk.config import settings
+
 
 QR_DIR = Path("static/qr")
 QR_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def generate_team_qr(team_id: int) -> str:
+def team_status_url(team_id: int) -> str:
     """
-    Generates a QR code for a team.
-    QR opens the team status page.
-    Returns relative file path.
+    The URL a team's QR opens.
     """
 
-    url = f"http://127.0.0.1:8000/team-status?team={team_id}"
-    file_path = QR_DIR / f"team_{team_id}.png"
+    return f"{settings.PUBLIC_BASE_URL.rstrip('/')}/team-status?team={team_id}"
+
+
+def qr_key(url: str) -> str:
+    return hashlib.sha256(url.encode()).hexdigest()[:16]
+
+
+def qr_path(url: str) -> Path:
+    """
+    QR files are named after what they encode, so a file on disk is
+    always right for its URL and a new base URL never reuses a stale one.
+    """
+
+    return QR_DIR / f"{qr_key(url)}.png"
+
+
+def render_qr_png(url: str) -> bytes:
+    """
+    Encodes url as a PNG. Pure, so it can run in a worker process.
+    """
 
     qr = qrcode.QRCode(
         version=1,
@@ -25,6 +49,87 @@ def generate_team_qr(team_id: int) -> str:
     qr.make(fit=True)
 
     img = qr.make_image(fill_color="black", back_color="white")
-    img.save(file_path)
 
-    return str(file_path)
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def store_qr_png(url: str, png: bytes) -> Path:
+    # write then rename, readers never see half a file
+    path = qr_path(url)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_bytes(png)
+    os.replace(tmp, path)
+    invalidate_qr_index()
+    return path
+
+
+@lru_cache(maxsize=settings.QR_CACHE_SIZE)
+def qr_png(url: str) -> bytes:
+    """
+    PNG bytes for url: memory, then disk, then rendered and stored.
+    """
+
+    path = qr_path(url)
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        pass
+
+    png = render_qr_png(url)
+    store_qr_png(url, png)
+    return png
+
+
+# -------------------------
+# Directory index
+# -------------------------
+# File names in QR_DIR, listed once and dropped on every write, so
+# pages showing many teams don't stat a file per team.
+_index: frozenset[str] | None = None
+_index_lock = threading.Lock()
+
+
+def qr_index() -> frozenset[str]:
+    global _index
+
+    index = _index
+    if index is not None:
+        return index
+
+    with _index_lock:
+        if _index is None:
+            with os.scandir(QR_DIR) as entries:
+                _index = frozenset(e.name for e in entries if e.name.endswith(".png"))
+        return _index
+
+
+def invalidate_qr_index() -> None:
+    global _index
+
+    with _index_lock:
+        _index = None
+
+
+def qr_exists(team_id: int) -> bool:
+    return qr_path(team_status_url(team_id)).name in qr_index()
+
+
+def generate_team_qr(team_id: int) -> str:
+    """
+    Makes sure the team's QR is on disk, rendering it only if missing.
+    Returns relative file path.
+    """
+
+    url = team_status_url(team_id)
+    path = qr_path(url)
+
+    if not path.exists():
+        # renders and stores it (dropping the directory index) on a miss
+        png = qr_png(url)
+        if not path.exists():
+            # served from memory, the file was removed since
+            store_qr_png(url, png)
+
+    return str(path)
@@ -0,0 +1,141 @@
+import gzip
+import hashlib
+import mimetypes
+import threading
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+
+try:
+    import brotli
+except ImportError:  # optional, gzip only without it
+    brotli = None
+
+
+STATIC_DIR = Path("static")
+# Page assets, fingerprinted and precompressed. Everything else under
+# /static (QR images) goes through plain StaticFiles.
+ASSET_DIRS = ("css", "js")
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+
+class Asset:
+    """
+    One file read into memory, with its content hash and compressed
+    variants built once.
+    """
+
+    __slots__ = ("digest", "media_type", "variants")
+
+    def __init__(self, path: Path):
+        raw = path.read_bytes()
+
+        self.digest = hashlib.sha256(raw).hexdigest()[:12]
+        self.media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+        self.variants = {"identity": raw}
+        self.variants["gzip"] = gzip.compress(raw, compresslevel=9, mtime=0)
+        if brotli is not None:
+            self.variants["br"] = brotli.compress(raw, quality=11)
+
+
+class AssetManifest:
+    """
+    Content hashes of the page assets, for fingerprinted URLs. Built on
+    first use, files are not expected to change while the app runs.
+    """
+
+    def __init__(self, directory: Path = STATIC_DIR):
+        self.directory = directory
+        self._assets: dict[str, Asset] | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def assets(self) -> dict[str, Asset]:
+        assets = self._assets
+        if assets is not None:
+            return assets
+
+        with self._lock:
+            if self._assets is None:
+                self._assets = {
+                    path.relative_to(self.directory).as_posix(): Asset(path)
+                    for sub in ASSET_DIRS
+                    if (self.directory / sub).is_dir()
+                    for path in sorted((self.directory / sub).rglob("*"))
+                    if path.is_file()
+                }
+            return self._assets
+
+    def url(self, path: str) -> str:
+        """
+        /static URL carrying the content hash, so it can be cached
+        forever and still changes when the file does.
+        """
+
+        asset = self.assets.get(path)
+        if asset is None:
+            return f"/static/{path}"
+        return f"/static/{path}?v={asset.digest}"
+
+
+manifest = AssetManifest()
+
+
+def static_url(path: str) -> str:
+    return manifest.url(path)
+
+
+def accepted_encoding(headers: Headers, asset: Asset) -> str:
+    accept = headers.get("accept-encoding", "")
+    for encoding in ("br", "gzip"):
+        if encoding in asset.variants and encoding in accept:
+            return encoding
+    return "identity"
+
+
+class FingerprintedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves page assets from memory, precompressed,
+    and immutable when the URL carries the current hash. QR files are
+    named by content, so they are immutable as well.
+    """
+
+    async def get_response(self, path: str, scope) -> Response:
+        asset = manifest.assets.get(path.replace("\\", "/"))
+        if asset is None:
+            response = await super().get_response(path, scope)
+            if path.startswith("qr") and response.status_code in (200, 304):
+                response.headers["Cache-Control"] = IMMUTABLE
+            return response
+
+        headers = Headers(scope=scope)
+        etag = f'"{asset.digest}"'
+
+        versioned = f"v={asset.digest}" in scope.get("query_string", b"").decode()
+        cache_control = IMMUTABLE if versioned else REVALIDATE
+
+        if headers.get("if-none-match") == etag:
+            return Response(
+                status_code=304,
+                headers={"ETag": etag, "Cache-Control": cache_control}
+            )
+
+        encoding = accepted_encoding(headers, asset)
+        response_headers = {
+            "ETag": etag,
+            "Cache-Control": cache_control,
+            "Vary": "Accept-Encoding"
+        }
+        if encoding != "identity":
+            response_headers["Content-Encoding"] = encoding
+
+        return Response(
+            asset.variants[encoding],
+            media_type=asset.media_type,
+            headers=response_headers
+        )
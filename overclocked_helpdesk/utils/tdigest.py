@@ -0,0 +1,112 @@
+import math
+
+
+class TDigest:
+    """
+    Merging t-digest (Dunning): a streaming quantile sketch of bounded
+    size. Centroids are small near the tails, so p99 stays accurate
+    with a few hundred centroids however many values were added.
+
+    Not thread safe, callers hold their own lock.
+    """
+
+    __slots__ = ("compression", "count", "min", "max", "_means", "_weights", "_buffer")
+
+    def __init__(self, compression: float = 100):
+        self.compression = compression
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._means: list[float] = []
+        self._weights: list[float] = []
+        self._buffer: list[float] = []
+
+    def add(self, value: float) -> None:
+        self._buffer.append(value)
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+        if len(self._buffer) >= 5 * self.compression:
+            self._compress()
+
+    # -------------------------
+    # Merging
+    # -------------------------
+    def _q_limit(self, q: float) -> float:
+        # k1 scale function: k(q) = d / 2pi * asin(2q - 1), one k unit per centroid
+        k = self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+        # k tops out at d / 4 (q = 1), past it sin would wrap back down
+        k_next = min(k + 1, self.compression / 4)
+        return (math.sin(2 * math.pi * k_next / self.compression) + 1) / 2
+
+    def _compress(self) -> None:
+        if not self._buffer:
+            return
+
+        points = sorted(
+            [*zip(self._means, self._weights), *((v, 1.0) for v in self._buffer)]
+        )
+        self._buffer = []
+
+        means, weights = [], []
+        seen = 0.0
+        limit = self._q_limit(0)
+        mean, weight = points[0]
+
+        for m, w in points[1:]:
+            if (seen + weight + w) / self.count <= limit:
+                weight += w
+                mean += (m - mean) * w / weight
+                continue
+
+            means.append(mean)
+            weights.append(weight)
+            seen += weight
+            limit = self._q_limit(min(seen / self.count, 1.0))
+            mean, weight = m, w
+
+        means.append(mean)
+        weights.append(weight)
+
+        self._means = means
+        self._weights = weights
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    def quantile(self, q: float) -> float | None:
+        """
+        Estimated value at quantile q (0..1), None when empty.
+        Interpolates between centroid centers, anchored on min / max.
+        """
+
+        self._compress()
+        if not self._means:
+            return None
+
+        target = q * self.count
+        prev_center, prev_mean = 0.0, self.min
+        seen = 0.0
+
+        for mean, weight in zip(self._means, self._weights):
+            center = seen + weight / 2
+            if target < center:
+                span = center - prev_center
+                if span <= 0:
+                    return mean
+                return prev_mean + (target - prev_center) / span * (mean - prev_mean)
+
+            prev_center, prev_mean = center, mean
+            seen += weight
+
+        span = self.count - prev_center
+        if span <= 0:
+            return self.max
+        return prev_mean + (target - prev_center) / span * (self.max - prev_mean)
+
+    def centroids(self) -> int:
+        self._compress()
+        return len(self._means)
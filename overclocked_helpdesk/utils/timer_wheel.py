@@ -0,0 +1,71 @@
+import math
+
+
+class TimerWheel:
+    """
+    Hashed timing wheel (Varghese & Lauck): a ring of `slots` buckets,
+    each covering `tick` seconds. Scheduling and cancelling are O(1)
+    and advancing only looks at the buckets that came due, whatever
+    the number of timers. Deadlines more than one turn away sit in
+    their bucket for extra rounds.
+
+    One timer per key, scheduling a key again moves it.
+    Not thread safe, callers hold their own lock.
+    """
+
+    __slots__ = ("tick", "_buckets", "_where", "_next")
+
+    def __init__(self, now: float, tick: float = 1.0, slots: int = 3600):
+        self.tick = tick
+        self._buckets: list[dict] = [{} for _ in range(slots)]
+        # key -> bucket index
+        self._where: dict = {}
+        # first tick not yet expired
+        self._next = int(now // tick)
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key) -> bool:
+        return key in self._where
+
+    def schedule(self, key, deadline: float, value=None) -> None:
+        self.cancel(key)
+
+        # past deadlines expire on the next advance
+        due = max(math.ceil(deadline / self.tick), self._next)
+        index = due % len(self._buckets)
+        self._buckets[index][key] = (due, value)
+        self._where[key] = index
+
+    def cancel(self, key) -> bool:
+        index = self._where.pop(key, None)
+        if index is None:
+            return False
+        del self._buckets[index][key]
+        return True
+
+    def advance(self, now: float) -> list[tuple]:
+        """
+        Expires every timer due at or before now.
+        Returns their (key, value) pairs.
+        """
+
+        last = int(now // self.tick)
+        if last < self._next:
+            return []
+
+        expired = []
+        size = len(self._buckets)
+
+        # after a long pause every bucket is visited once, not every tick
+        for t in range(self._next, self._next + min(last - self._next + 1, size)):
+            bucket = self._buckets[t % size]
+            for key, (due, value) in list(bucket.items()):
+                if due <= last:
+                    del bucket[key]
+                    del self._where[key]
+                    expired.append((key, value))
+
+        self._next = last + 1
+        return expired
@@ -0,0 +1,185 @@
+"""
+Poll latency with the threadpool (DB_ASYNC=false) and the aiosqlite
+(DB_ASYNC=true) versions of the hot routes.
+
+Starts the app under uvicorn once per mode, then runs N concurrent
+pollers against the pending list, a mentor's queue, team status and
+mentor state, each every `interval` seconds (the dashboard's fallback
+poll is 5s), while one client keeps submitting, accepting and
+resolving queries. Prints p50 / p95 / p99 per mode.
+
+The load generator shares the machine with the server, so run it
+somewhere with spare cores for numbers that mean anything.
+
+    python scripts/bench_async_pollers.py [pollers] [seconds] [interval]
+"""
+
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MENTORS = 20
+TEAMS = 200
+
+
+def seed(db_url: str):
+    env = {**os.environ, "DATABASE_URL": db_url, "PYTHONPATH": ROOT}
+    code = f"""
+from sqlalchemy import insert
+from overclocked_helpdesk.db.session import engine
+from overclocked_helpdesk.db.migrations import run_migrations
+from overclocked_helpdesk.models.mentor import Mentor
+from overclocked_helpdesk.models.team import Team
+from overclocked_helpdesk.models.query import Query
+
+run_migrations(engine)
+with engine.begin() as conn:
+    conn.execute(insert(Mentor), [
+        {{"id": i, "name": f"Mentor {{i}}", "max_load": 1000}} for i in range(1, {MENTORS} + 1)
+    ])
+    conn.execute(insert(Team), [
+        {{"id": i, "name": f"Team {{i}}", "mentor_id": i % {MENTORS} + 1}} for i in range(1, {TEAMS} + 1)
+    ])
+    conn.execute(insert(Query), [
+        {{"team_id": i % {TEAMS} + 1, "issue": f"issue {{i}}", "location": "Hall",
+          "status": "PENDING" if i % 50 == 0 else "RESOLVED",
+          "mentor_id": None if i % 50 == 0 else i % {MENTORS} + 1}}
+        for i in range(10_000)
+    ])
+"""
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(db_url: str, async_db: bool, port: int, workdir: str):
+    env = {
+        **os.environ,
+        "DATABASE_URL": db_url,
+        "DB_ASYNC": str(async_db).lower(),
+        "PYTHONPATH": ROOT
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "overclocked_helpdesk.main:app",
+         "--port", str(port), "--log-level", "warning"],
+        env=env,
+        cwd=workdir
+    )
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * p), len(values) - 1)]
+
+
+async def poller(client, stop, interval, latencies, errors):
+    paths = [
+        lambda: "/queries/pending",
+        lambda: f"/queries/mentor/{random.randint(1, MENTORS)}",
+        lambda: f"/team/{random.randint(1, TEAMS)}/status",
+        lambda: "/mentors/state",
+    ]
+
+    # spread the first polls over one interval
+    await asyncio.sleep(random.uniform(0, interval))
+
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            r = await client.get(random.choice(paths)())
+            if r.status_code >= 500:
+                errors.append(r.status_code)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+
+
+async def writer(client, stop):
+    while not stop.is_set():
+        try:
+            r = await client.post("/submit", data={
+                "team_id": random.randint(1, TEAMS), "issue": "bench", "location": "Hall"
+            })
+            query_id = r.json()["query_id"]
+            await client.patch(f"/queries/{query_id}/accept/{random.randint(1, MENTORS)}")
+            await client.patch(f"/queries/{query_id}/resolve")
+        except (httpx.HTTPError, KeyError, ValueError):
+            pass
+        await asyncio.sleep(0.05)
+
+
+async def measure(port: int, pollers: int, seconds: float, interval: float):
+    limits = httpx.Limits(max_connections=pollers + 10)
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30
+    ) as client:
+        for _ in range(100):
+            try:
+                await client.get("/mentors/state")
+                break
+            except httpx.HTTPError:
+                await asyncio.sleep(0.1)
+
+        stop = asyncio.Event()
+        latencies: list[float] = []
+        errors: list = []
+
+        tasks = [asyncio.create_task(poller(client, stop, interval, latencies, errors)) for _ in range(pollers)]
+        tasks.append(asyncio.create_task(writer(client, stop)))
+
+        await asyncio.sleep(seconds)
+        stop.set()
+        await asyncio.gather(*tasks)
+
+    return latencies, errors
+
+
+def main():
+    pollers = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 20
+    interval = float(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    workdir = tempfile.mkdtemp()
+    os.symlink(os.path.join(ROOT, "templates"), os.path.join(workdir, "templates"))
+    os.mkdir(os.path.join(workdir, "static"))
+
+    print(f"{pollers} concurrent pollers every {interval:g}s, {seconds:.0f}s per mode")
+
+    for async_db in (False, True):
+        db_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+        seed(db_url)
+
+        port = free_port()
+        server = start_server(db_url, async_db, port, workdir)
+        try:
+            latencies, errors = asyncio.run(measure(port, pollers, seconds, interval))
+        finally:
+            server.terminate()
+            server.wait()
+
+        ms = [x * 1000 for x in latencies]
+        print(
+            f"  DB_ASYNC={str(async_db).lower():5}  "
+            f"{len(ms) / seconds:6.0f} req/s  "
+            f"p50 {percentile(ms, 0.50):7.1f} ms  "
+            f"p95 {percentile(ms, 0.95):7.1f} ms  "
+            f"p99 {percentile(ms, 0.99):7.1f} ms  "
+            f"{len(errors)} errors"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Sustained query submissions per second with and without the
+group-commit writer, on a file-backed SQLite database.
+
+    python scripts/bench_group_commit.py [threads] [per_thread]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+
+from sqlalchemy import insert
+
+from overclocked_helpdesk.db.session import SessionLocal, engine
+from overclocked_helpdesk.db.migrations import run_migrations
+from overclocked_helpdesk.models.mentor import Mentor
+from overclocked_helpdesk.models.team import Team
+from overclocked_helpdesk.services.notifier import notify_and_create_query
+from overclocked_helpdesk.services.ingest_writer import GroupCommitWriter
+
+
+def seed():
+    run_migrations(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Mentor), [{"id": 1, "name": "Mentor 1"}])
+        conn.execute(insert(Team), [
+            {"id": i, "name": f"Team {i}", "mentor_id": 1} for i in range(1, 101)
+        ])
+
+
+def run(threads: int, per_thread: int, submit) -> float:
+    barrier = threading.Barrier(threads + 1)
+    errors = []
+
+    def worker(n):
+        barrier.wait()
+        for i in range(per_thread):
+            try:
+                submit(n % 100 + 1, f"issue {n}-{i}", "Hall")
+            except Exception as e:
+                errors.append(e)
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in pool:
+        t.start()
+
+    barrier.wait()
+    started = time.perf_counter()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    if errors:
+        print(f"  {len(errors)} errors, e.g. {errors[0]!r}")
+
+    return threads * per_thread / elapsed
+
+
+def direct(team_id, issue, location):
+    db = SessionLocal()
+    try:
+        notify_and_create_query(db=db, team_id=team_id, issue=issue, location=location)
+    finally:
+        db.close()
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    per_thread = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    seed()
+    print(f"{threads} concurrent submitters x {per_thread} submissions")
+
+    rate = run(threads, per_thread, direct)
+    print(f"  commit per submission : {rate:8.0f} submissions/s")
+
+    writer = GroupCommitWriter()
+    writer.start()
+    rate = run(threads, per_thread, writer.create)
+    writer.stop()
+    stats = writer.stats()
+    print(f"  group commit          : {rate:8.0f} submissions/s")
+    print(f"    avg batch {stats['avg_batch_size']}, max batch {stats['max_batch_size']}, "
+          f"avg commit {stats['avg_commit_ms']} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Latency and allocations of the pending-queries list at 10k rows:
+the previous ORM + strftime + jsonable_encoder path against the
+column projection + orjson path the endpoint uses now, walking its
+keyset pages to the end so both cover every row. Then checks
+that /mentors/{id}/queries, served through the app, returns the
+same page as the ORM path did.
+
+    python scripts/bench_list_serialization.py [rows] [repeats]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+from overclocked_helpdesk.db.session import SessionLocal, engine
+from overclocked_helpdesk.db.migrations import run_migrations
+from overclocked_helpdesk.models.mentor import Mentor
+from overclocked_helpdesk.models.team import Team
+from overclocked_helpdesk.models.query import Query
+from overclocked_helpdesk.api.pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+from overclocked_helpdesk.api.queries import get_pending_queries
+from overclocked_helpdesk.main import app
+
+
+def seed(rows: int):
+    run_migrations(engine)
+    start = datetime.utcnow() - timedelta(hours=10)
+
+    with engine.begin() as conn:
+        conn.execute(insert(Mentor), [{"id": 1, "name": "Mentor 1"}])
+        conn.execute(insert(Team), [
+            {"id": i, "name": f"Team {i}", "mentor_id": 1} for i in range(1, 101)
+        ])
+        conn.execute(insert(Query), [
+            {"team_id": i % 100 + 1, "issue": f"issue {i}", "location": "Hall",
+             "status": "PENDING", "created_at": start + timedelta(seconds=i)}
+            for i in range(rows)
+        ])
+        # mentor 1's queue, for /mentors/{id}/queries
+        conn.execute(insert(Query), [
+            {"team_id": i % 100 + 1, "issue": f"assigned {i}", "location": "Hall",
+             "status": "ASSIGNED", "mentor_id": 1, "created_at": start + timedelta(seconds=i)}
+            for i in range(MAX_PAGE_SIZE * 2)
+        ])
+
+
+def orm_path(db):
+    # the endpoint before: full ORM objects, strftime per row and
+    # FastAPI's default jsonable_encoder + JSONResponse
+    queries = (
+        db.query(Query)
+        .filter(Query.status == "PENDING", Query.mentor_id == None)
+        .order_by(Query.created_at.asc())
+        .all()
+    )
+    data = [
+        {
+            "id": q.id,
+            "team_id": q.team_id,
+            "issue": q.issue,
+            "created_at": q.created_at.strftime("%H:%M"),
+        }
+        for q in queries
+    ]
+    return JSONResponse(jsonable_encoder(data)).body
+
+
+def projection_path(db):
+    body, cursor = b"", None
+    while True:
+        page = get_pending_queries(cursor=cursor, limit=MAX_PAGE_SIZE, db=db)
+        body += page.body
+        cursor = page.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return body
+
+
+def orm_mentor_page(db) -> list:
+    queries = (
+        db.query(Query)
+        .filter(Query.status == "ASSIGNED", Query.mentor_id == 1)
+        .order_by(Query.created_at.desc(), Query.id.desc())
+        .limit(MAX_PAGE_SIZE)
+        .all()
+    )
+    return jsonable_encoder([
+        {"id": q.id, "team_id": q.team_id, "issue": q.issue, "created_at": q.created_at.isoformat()}
+        for q in queries
+    ])
+
+
+def check_mentor_queries():
+    db = SessionLocal()
+    try:
+        expected = orm_mentor_page(db)
+    finally:
+        db.close()
+
+    client = TestClient(app)
+    response = client.get(f"/mentors/1/queries?limit={MAX_PAGE_SIZE}")
+
+    assert response.status_code == 200, response.status_code
+    assert response.json() == expected
+    assert "x-next-cursor" in response.headers
+    print(f"/mentors/1/queries: {len(expected)} rows, same as the ORM path")
+
+
+def measure(fn, repeats: int):
+    timings = []
+    peak = 0
+
+    for _ in range(repeats):
+        db = SessionLocal()
+        tracemalloc.start()
+        started = time.perf_counter()
+        body = fn(db)
+        timings.append(time.perf_counter() - started)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        db.close()
+
+    # timings include tracemalloc overhead, compare them relative to each other
+    timings.sort()
+    return timings[len(timings) // 2], peak, len(body)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 7
+
+    seed(rows)
+    print(f"pending list, {rows} rows, median of {repeats}")
+
+    results = {}
+    for name, fn in (("orm + jsonable_encoder", orm_path), ("columns + orjson", projection_path)):
+        median, peak, size = measure(fn, repeats)
+        results[name] = (median, peak)
+        print(f"  {name:24} {median * 1000:8.1f} ms  peak {peak / 1024:8.0f} KiB  body {size} bytes")
+
+    (old_t, old_m), (new_t, new_m) = results.values()
+    print(f"  -> {old_t / new_t:.1f}x faster, {old_m / new_m:.1f}x less peak memory")
+
+    check_mentor_queries()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Mixed read/write throughput for the "default" and "tuned" SQLite
+profiles (see SQLITE_PROFILE in config.py).
+
+Reader threads poll the pending and per-mentor query lists while
+writer threads submit, accept and resolve queries. Each profile runs
+in its own process because the engines are built at import time.
+
+    python scripts/bench_sqlite_profile.py [readers] [writers] [seconds]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+
+def worker_process(readers: int, writers: int, seconds: float):
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+
+    from sqlalchemy import insert
+
+    from overclocked_helpdesk.db.session import ReadSessionLocal, SessionLocal, engine
+    from overclocked_helpdesk.db.migrations import run_migrations
+    from overclocked_helpdesk.models.mentor import Mentor
+    from overclocked_helpdesk.models.team import Team
+    from overclocked_helpdesk.models.query import Query
+    from overclocked_helpdesk.api.queries import get_pending_queries, get_active_queries_for_mentor
+    from overclocked_helpdesk.services import lifecycle
+    from overclocked_helpdesk.services.notifier import notify_and_create_query
+
+    run_migrations(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Mentor), [
+            {"id": i, "name": f"Mentor {i}", "is_active": True, "current_load": 0, "max_load": 1000}
+            for i in range(1, 21)
+        ])
+        conn.execute(insert(Team), [
+            {"id": i, "name": f"Team {i}", "mentor_id": i % 20 + 1} for i in range(1, 101)
+        ])
+        conn.execute(insert(Query), [
+            {"team_id": i % 100 + 1, "mentor_id": i % 20 + 1, "issue": f"old {i}",
+             "location": "Hall", "status": "RESOLVED"}
+            for i in range(20_000)
+        ])
+
+    stop = threading.Event()
+    counts = Counter()
+    lock = threading.Lock()
+
+    def count(key):
+        with lock:
+            counts[key] += 1
+
+    def reader(n):
+        while not stop.is_set():
+            db = ReadSessionLocal()
+            try:
+                get_pending_queries(db=db)
+                get_active_queries_for_mentor(n % 20 + 1, db=db)
+                count("reads")
+            except Exception as e:
+                count("locked" if "locked" in str(e) else "read_errors")
+            finally:
+                db.close()
+
+    def writer(n):
+        mentor_id = n % 20 + 1
+        while not stop.is_set():
+            db = SessionLocal()
+            try:
+                query = notify_and_create_query(db=db, team_id=n % 100 + 1, issue="bench", location="Hall")
+                lifecycle.accept(db, query.id, mentor_id)
+                lifecycle.resolve(db, query.id)
+                count("writes")
+            except Exception as e:
+                db.rollback()
+                count("locked" if "locked" in str(e) else "write_errors")
+            finally:
+                db.close()
+
+    threads = (
+        [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+        + [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    )
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    print(
+        f"{os.environ['SQLITE_PROFILE']:>8}: "
+        f"{counts['reads'] / seconds:8.0f} reads/s  "
+        f"{counts['writes'] / seconds:7.0f} write cycles/s  "
+        f"{counts['locked']} locked  "
+        f"{counts['read_errors'] + counts['write_errors']} other errors"
+    )
+
+
+def main():
+    readers = sys.argv[1] if len(sys.argv) > 1 else "8"
+    writers = sys.argv[2] if len(sys.argv) > 2 else "4"
+    seconds = sys.argv[3] if len(sys.argv) > 3 else "5"
+
+    print(f"{readers} readers, {writers} writers, {seconds}s per profile")
+
+    for profile in ("default", "tuned"):
+        subprocess.run(
+            [sys.executable, __file__, "--run", readers, writers, seconds],
+            env={**os.environ, "SQLITE_PROFILE": profile},
+            check=True
+        )
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--run"]:
+        worker_process(int(sys.argv[2]), int(sys.argv[3]), float(sys.argv[4]))
+    else:
+        main()
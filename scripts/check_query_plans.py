@@ -0,0 +1,120 @@
+"""
+Runs the hot read endpoints against a throwaway SQLite database with
+100k queries and checks, via EXPLAIN QUERY PLAN, that none of their
+statements falls back to a full scan of the queries table.
+
+    python scripts/check_query_plans.py [rows]
+"""
+
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "plans.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from sqlalchemy import event, insert
+
+from overclocked_helpdesk.db.session import SessionLocal, engine
+from overclocked_helpdesk.db.migrations import run_migrations
+from overclocked_helpdesk.models.mentor import Mentor
+from overclocked_helpdesk.models.team import Team
+from overclocked_helpdesk.models.query import Query
+from overclocked_helpdesk.api.queries import get_pending_queries, get_active_queries_for_mentor
+from overclocked_helpdesk.api.mentors import mentor_queries
+from overclocked_helpdesk.services.team_status import TeamStatusProjection
+
+MENTORS = 50
+TEAMS = 500
+
+
+def seed(rows: int):
+    run_migrations(engine)
+
+    start = datetime.utcnow() - timedelta(hours=36)
+
+    with engine.begin() as conn:
+        conn.execute(insert(Mentor), [
+            {"id": i, "name": f"Mentor {i}", "is_active": True, "current_load": 0, "max_load": 3}
+            for i in range(1, MENTORS + 1)
+        ])
+        conn.execute(insert(Team), [
+            {"id": i, "name": f"Team {i}", "mentor_id": (i % MENTORS) + 1}
+            for i in range(1, TEAMS + 1)
+        ])
+
+        batch = []
+        for i in range(rows):
+            status = random.choices(["RESOLVED", "ASSIGNED", "PENDING"], [90, 5, 5])[0]
+            batch.append({
+                "team_id": random.randint(1, TEAMS),
+                "mentor_id": None if status == "PENDING" else random.randint(1, MENTORS),
+                "issue": f"issue {i}",
+                "location": "Hall",
+                "status": status,
+                "created_at": start + timedelta(seconds=i)
+            })
+        conn.execute(insert(Query), batch)
+
+        conn.exec_driver_sql("ANALYZE")
+
+
+def capture(fn):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    return statements
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    seed(rows)
+
+    db = SessionLocal()
+    endpoints = {
+        "get_pending_queries": lambda: get_pending_queries(db=db),
+        "get_active_queries_for_mentor": lambda: get_active_queries_for_mentor(7, db=db),
+        "mentor_queries": lambda: mentor_queries(7, db=db),
+        "team_status_api": lambda: TeamStatusProjection().get(db, 42),
+    }
+
+    failed = False
+
+    for name, call in endpoints.items():
+        print(f"== {name}")
+
+        for statement, parameters in capture(call):
+            if "queries" not in statement:
+                continue
+
+            plan = db.connection().exec_driver_sql(
+                "EXPLAIN QUERY PLAN " + statement, parameters
+            ).all()
+
+            for row in plan:
+                detail = row[-1]
+                print("   ", detail)
+
+                # "SCAN queries" without an index means a full table scan
+                if detail.startswith("SCAN queries") and "INDEX" not in detail:
+                    failed = True
+                    print("    ^^^ full scan")
+
+    db.close()
+
+    print(f"\n{rows} rows: " + ("FULL SCAN FOUND" if failed else "all endpoints use indexes"))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
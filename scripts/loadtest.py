@@ -0,0 +1,356 @@
+"""
+Simulates a live event against one uvicorn process.
+
+Seeds N teams and M mentors, then for `duration` seconds:
+  * every team polls /team/{id}/status every 10s and, while it has no
+    open query, submits one through /submit now and then
+  * every mentor polls /mentors/state (with since_version, like the
+    dashboard) and /queries/mentor/{id} every 5s, accepts a pending
+    query when it has room and resolves its queries after a while
+
+Slack and SMTP go to local stubs (pip install aiosmtpd), so this runs
+offline and exercises the outbox and the SMTP pool for real.
+
+Prints throughput and p50 / p95 / p99 per route, error rates, and the
+server's own DB numbers from /metrics. With a single writer connection
+lock waits show up as write-statement time (busy_timeout sleeps are
+inside the cursor call) and, past busy_timeout, as
+"database is locked" 500s.
+
+The load generator shares the machine with the server, so run it
+somewhere with spare cores for numbers that mean anything.
+
+    python scripts/loadtest.py [--teams 200] [--mentors 20] [--duration 60]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+from aiosmtpd.controller import Controller
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# -------------------------
+# Stubs
+# -------------------------
+class StubWebhook(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    received = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        StubWebhook.received += 1
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+class CountingSmtpHandler:
+    received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        CountingSmtpHandler.received += 1
+        return "250 OK"
+
+
+# -------------------------
+# Server
+# -------------------------
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def seed(env: dict, teams: int, mentors: int, max_load: int):
+    code = f"""
+from sqlalchemy import insert
+from overclocked_helpdesk.db.session import engine
+from overclocked_helpdesk.db.migrations import run_migrations
+from overclocked_helpdesk.models.mentor import Mentor
+from overclocked_helpdesk.models.team import Team
+
+run_migrations(engine)
+with engine.begin() as conn:
+    conn.execute(insert(Mentor), [
+        {{"id": i, "name": f"Mentor {{i}}", "email": f"mentor{{i}}@load.test", "max_load": {max_load}}}
+        for i in range(1, {mentors} + 1)
+    ])
+    conn.execute(insert(Team), [
+        {{"id": i, "name": f"Team {{i}}", "mentor_id": i % {mentors} + 1}}
+        for i in range(1, {teams} + 1)
+    ])
+"""
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
+
+
+def start_server(env: dict, port: int, workdir: str):
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "overclocked_helpdesk.main:app",
+         "--port", str(port), "--log-level", "warning"],
+        env=env,
+        cwd=workdir
+    )
+
+
+# -------------------------
+# Client side stats
+# -------------------------
+class Stats:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.client_errors: dict[str, int] = defaultdict(int)
+        self.server_errors: dict[str, int] = defaultdict(int)
+        self.locked = 0
+
+    async def call(self, client, method: str, route: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            r = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.server_errors[route] += 1
+            self.latencies[route].append(time.perf_counter() - started)
+            return None
+
+        self.latencies[route].append(time.perf_counter() - started)
+
+        if r.status_code >= 500:
+            self.server_errors[route] += 1
+            if "locked" in r.text:
+                self.locked += 1
+        elif r.status_code >= 400:
+            # lost accept races, mentor full: expected under load
+            self.client_errors[route] += 1
+
+        return r
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * p), len(values) - 1)]
+
+
+# -------------------------
+# Actors
+# -------------------------
+async def team(client, stats, stop, team_id, args):
+    open_query = None
+    await asyncio.sleep(random.uniform(0, args.team_poll))
+
+    while not stop.is_set():
+        if open_query is None and random.random() < args.team_poll / args.submit_every:
+            r = await stats.call(client, "POST", "/submit", "/submit", data={
+                "team_id": team_id,
+                "issue": random.choice(["Wi-Fi down", "Build fails", "API key", "Docker"]),
+                "location": f"Table {team_id}"
+            })
+            if r is not None and r.status_code == 200:
+                open_query = r.json()["query_id"]
+
+        r = await stats.call(client, "GET", "/team/{team_id}/status", f"/team/{team_id}/status")
+        # the status page shows the team's latest query, which is ours
+        if open_query is not None and r is not None and r.status_code == 200:
+            if r.json().get("status") == "RESOLVED":
+                open_query = None
+
+        await asyncio.sleep(args.team_poll)
+
+
+async def mentor(client, stats, stop, mentor_id, args):
+    version = None
+    # query id -> when this mentor will be done with it
+    working: dict[int, float] = {}
+    await asyncio.sleep(random.uniform(0, args.mentor_poll))
+
+    while not stop.is_set():
+        params = {"since_version": version} if version else {}
+        r = await stats.call(client, "GET", "/mentors/state", "/mentors/state", params=params)
+        if r is not None and r.status_code == 200:
+            version = int(r.headers.get("X-State-Version", 0)) or None
+
+        r = await stats.call(client, "GET", "/queries/mentor/{mentor_id}", f"/queries/mentor/{mentor_id}")
+        pending = []
+        if r is not None and r.status_code == 200:
+            pending = [q["id"] for q in r.json() if q["status"] == "PENDING"]
+
+        now = time.monotonic()
+        for query_id, done_at in list(working.items()):
+            if done_at <= now:
+                await stats.call(client, "PATCH", "/queries/{query_id}/resolve", f"/queries/{query_id}/resolve")
+                del working[query_id]
+
+        if pending and len(working) < args.max_load:
+            # oldest first, like the dashboard
+            query_id = pending[-1]
+            r = await stats.call(
+                client, "PATCH", "/queries/{query_id}/accept/{mentor_id}",
+                f"/queries/{query_id}/accept/{mentor_id}"
+            )
+            if r is not None and r.status_code == 200:
+                working[query_id] = now + random.uniform(*args.work_seconds)
+
+        await asyncio.sleep(args.mentor_poll)
+
+
+# -------------------------
+# Run
+# -------------------------
+async def scrape(client) -> dict[str, float]:
+    r = await client.get("/metrics")
+    samples = {}
+    for line in r.text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+async def run(port: int, args) -> tuple[Stats, dict, dict]:
+    limits = httpx.Limits(max_connections=args.teams + args.mentors + 10)
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30
+    ) as client:
+        for _ in range(100):
+            try:
+                await client.get("/mentors/state")
+                break
+            except httpx.HTTPError:
+                await asyncio.sleep(0.1)
+
+        before = await scrape(client)
+
+        stats = Stats()
+        stop = asyncio.Event()
+        tasks = [
+            asyncio.create_task(team(client, stats, stop, i, args))
+            for i in range(1, args.teams + 1)
+        ] + [
+            asyncio.create_task(mentor(client, stats, stop, i, args))
+            for i in range(1, args.mentors + 1)
+        ]
+
+        await asyncio.sleep(args.duration)
+        stop.set()
+        await asyncio.gather(*tasks)
+
+        after = await scrape(client)
+
+    return stats, before, after
+
+
+def report(stats: Stats, before: dict, after: dict, args):
+    print(f"\n{'route':42} {'reqs':>6} {'req/s':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'4xx':>5} {'err %':>6}")
+
+    total = 0
+    for route, values in sorted(stats.latencies.items()):
+        ms = [v * 1000 for v in values]
+        total += len(ms)
+        errors = stats.server_errors[route]
+        print(
+            f"{route:42} {len(ms):6} {len(ms) / args.duration:6.1f} "
+            f"{percentile(ms, 0.50):8.1f} {percentile(ms, 0.95):8.1f} {percentile(ms, 0.99):8.1f} "
+            f"{stats.client_errors[route]:5} {errors / len(ms) * 100:6.2f}"
+        )
+
+    print(f"\ntotal {total} requests, {total / args.duration:.1f} req/s")
+
+    def delta(name: str) -> float:
+        return after.get(name, 0) - before.get(name, 0)
+
+    print("\nserver DB (from /metrics):")
+    for engine in ("write", "async_write", "read", "async_read"):
+        key = f'{{engine="{engine}"}}'
+        statements = delta(f"helpdesk_db_statements_total{key}")
+        if statements:
+            seconds = delta(f"helpdesk_db_seconds_total{key}")
+            print(f"  {engine:12} {statements:8.0f} statements  avg {seconds / statements * 1000:6.2f} ms")
+    print(f"  'database is locked' errors: {stats.locked}")
+
+    depths = {
+        re.search(r'queue="(\w+)"', name).group(1): value
+        for name, value in after.items()
+        if name.startswith("helpdesk_queue_depth")
+    }
+    print(f"  queue depth at end: {depths}")
+
+    print(f"\nstubs: {StubWebhook.received} Slack posts, {CountingSmtpHandler.received} emails")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--teams", type=int, default=200)
+    parser.add_argument("--mentors", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument("--team-poll", type=float, default=10)
+    parser.add_argument("--mentor-poll", type=float, default=5)
+    parser.add_argument("--submit-every", type=float, default=120,
+                        help="mean seconds between a team's queries")
+    parser.add_argument("--max-load", type=int, default=3)
+    parser.add_argument("--work-seconds", type=float, nargs=2, default=(10, 40))
+    parser.add_argument("--async-db", choices=("true", "false"), default="true")
+    args = parser.parse_args()
+
+    # stubs
+    webhook = ThreadingHTTPServer(("127.0.0.1", 0), StubWebhook)
+    threading.Thread(target=webhook.serve_forever, daemon=True).start()
+
+    smtp_port = free_port()
+    smtp = Controller(CountingSmtpHandler(), hostname="127.0.0.1", port=smtp_port)
+    smtp.start()
+
+    workdir = tempfile.mkdtemp()
+    os.symlink(os.path.join(ROOT, "templates"), os.path.join(workdir, "templates"))
+    os.symlink(os.path.join(ROOT, "static"), os.path.join(workdir, "static"))
+
+    env = {
+        **os.environ,
+        "PYTHONPATH": ROOT,
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'loadtest.db')}",
+        "DB_ASYNC": args.async_db,
+        "SLACK_WEBHOOK_URL": f"http://127.0.0.1:{webhook.server_port}/hook",
+        "SMTP_SERVER": "127.0.0.1",
+        "SMTP_PORT": str(smtp_port),
+        "SMTP_USE_SSL": "false",
+        "SMTP_USER": "helpdesk@load.test",
+        "SMTP_PASSWORD": ""
+    }
+
+    seed(env, args.teams, args.mentors, args.max_load)
+
+    print(
+        f"{args.teams} teams, {args.mentors} mentors, {args.duration:.0f}s, "
+        f"DB_ASYNC={args.async_db}"
+    )
+
+    port = free_port()
+    server = start_server(env, port, workdir)
+    try:
+        stats, before, after = asyncio.run(run(port, args))
+    finally:
+        server.terminate()
+        server.wait()
+        smtp.stop()
+        webhook.shutdown()
+
+    report(stats, before, after, args)
+
+
+if __name__ == "__main__":
+    main()
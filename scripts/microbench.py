@@ -0,0 +1,276 @@
+"""
+Per-function benchmarks of the lifecycle and assignment hot paths,
+checked against a stored baseline.
+
+Each scenario (queries x mentors) gets a fresh SQLite database in its
+own process, since the engine is bound at import. Every function is
+called `repeats` times with different ids and we record:
+
+    ms          fastest call (like timeit, the least disturbed by
+                whatever else the machine is doing)
+    statements  most SQL statements issued by one call
+    peak_kib    highest tracemalloc peak of one call (separate pass,
+                so tracing does not skew the timings)
+
+Statement counts are deterministic, so any increase is a regression.
+Time and memory regress when they grow by more than --threshold (and
+time by more than --min-ms, to ignore scheduler noise).
+
+    python scripts/microbench.py                 # compare, exit 1 on regression
+    python scripts/microbench.py --save          # record a new baseline
+    python scripts/microbench.py --sizes 1000 --mentors 10
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "scripts", "microbench_baseline.json")
+
+SIZES = (1_000, 10_000, 100_000)
+MENTORS = (10, 500)
+REPEATS = 30
+
+
+# -------------------------
+# Worker: one scenario
+# -------------------------
+def seed(engine, queries: int, mentors: int, repeats: int):
+    import random
+    from datetime import datetime, timedelta
+
+    from sqlalchemy import insert
+
+    from overclocked_helpdesk.models.mentor import Mentor
+    from overclocked_helpdesk.models.query import Query
+    from overclocked_helpdesk.models.team import Team
+
+    rng = random.Random(42)
+    teams = max(mentors * 4, 100)
+    start = datetime.utcnow() - timedelta(hours=24)
+    # enough open rows for every accept / resolve call to get its own
+    open_rows = max(queries // 20, repeats * 2 + 1)
+
+    with engine.begin() as conn:
+        conn.execute(insert(Mentor), [
+            {"id": i, "name": f"Mentor {i}", "email": None, "is_active": True,
+             "current_load": 0, "max_load": 10_000}
+            for i in range(1, mentors + 1)
+        ])
+        conn.execute(insert(Team), [
+            {"id": i, "name": f"Team {i}", "mentor_id": i % mentors + 1}
+            for i in range(1, teams + 1)
+        ])
+
+        rows = []
+        for i in range(queries):
+            if i < open_rows:
+                status, mentor_id = "PENDING", None
+            elif i < 2 * open_rows:
+                status, mentor_id = "ASSIGNED", rng.randint(1, mentors)
+            else:
+                status, mentor_id = "RESOLVED", rng.randint(1, mentors)
+            rows.append({
+                "team_id": rng.randint(1, teams), "mentor_id": mentor_id,
+                "issue": f"issue {i}", "location": "Hall", "status": status,
+                "created_at": start + timedelta(seconds=i * 86_400 / queries)
+            })
+        conn.execute(insert(Query), rows)
+
+    return teams, open_rows
+
+
+def run_scenario(queries: int, mentors: int, repeats: int) -> dict:
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    os.environ["ARCHIVE_AFTER_HOURS"] = "0"
+
+    from sqlalchemy import event, select
+    from starlette.requests import Request
+
+    from overclocked_helpdesk.db.session import SessionLocal, engine
+    from overclocked_helpdesk.main import team_status_api
+    from overclocked_helpdesk.models.query import Query
+    from overclocked_helpdesk.api.queries import accept_query, get_active_queries_for_mentor, resolve_query
+    from overclocked_helpdesk.services.assigner import assign_mentor
+    from overclocked_helpdesk.services.notifier import notify_and_create_query
+
+    teams, _ = seed(engine, queries, mentors, repeats)
+
+    db = SessionLocal()
+    pending = db.execute(
+        select(Query.id).where(Query.status == "PENDING").order_by(Query.id)
+    ).scalars().all()
+    assigned = db.execute(
+        select(Query.id, Query.mentor_id).where(Query.status == "ASSIGNED").order_by(Query.id)
+    ).all()
+    db.close()
+
+    request = Request({"type": "http", "method": "GET", "headers": [], "query_string": b""})
+
+    # each call gets its own ids, so nothing is served from a warm cache
+    # or hits an already-moved row; the memory pass uses the second half
+    cases = {
+        "assign_mentor": lambda db, i: assign_mentor(db, i % teams + 1),
+        "notify_and_create_query": lambda db, i: notify_and_create_query(
+            db, team_id=i % teams + 1, issue="bench", location="Hall"
+        ),
+        "accept_query": lambda db, i: accept_query(pending[i], i % mentors + 1, db=db),
+        "resolve_query": lambda db, i: resolve_query(assigned[i].id, db=db),
+        "get_active_queries_for_mentor": lambda db, i: get_active_queries_for_mentor(
+            i % mentors + 1, cursor=None, limit=50, db=db
+        ),
+        "team_status_api": lambda db, i: team_status_api(i % teams + 1, request, db=db),
+    }
+
+    statements = 0
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    results = {}
+    for name, fn in cases.items():
+        timings, counts, peaks = [], [], []
+
+        # warm-up: statement compilation and caches, with the last spare id
+        db = SessionLocal()
+        fn(db, 2 * repeats)
+        db.close()
+
+        for i in range(repeats):
+            db = SessionLocal()
+            statements = 0
+            started = time.perf_counter()
+            fn(db, i)
+            timings.append(time.perf_counter() - started)
+            counts.append(statements)
+            db.close()
+
+        for i in range(repeats, 2 * repeats):
+            db = SessionLocal()
+            tracemalloc.start()
+            fn(db, i)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            db.close()
+
+        results[name] = {
+            "ms": round(min(timings) * 1000, 3),
+            "statements": max(counts),
+            "peak_kib": round(max(peaks) / 1024, 1)
+        }
+
+    return results
+
+
+# -------------------------
+# Driver
+# -------------------------
+def scenario_key(queries: int, mentors: int) -> str:
+    return f"{queries}q/{mentors}m"
+
+
+def run_all(sizes, mentors, repeats) -> dict:
+    results = {}
+    for queries in sizes:
+        for m in mentors:
+            print(f"  {scenario_key(queries, m)} ...", file=sys.stderr, flush=True)
+            out = subprocess.run(
+                [sys.executable, __file__, "--worker", str(queries), str(m), str(repeats)],
+                env={**os.environ, "PYTHONPATH": ROOT},
+                cwd=tempfile.mkdtemp(),
+                check=True,
+                capture_output=True,
+                text=True
+            ).stdout
+            for name, values in json.loads(out.splitlines()[-1]).items():
+                results[f"{name}@{scenario_key(queries, m)}"] = values
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_ms: float) -> list[str]:
+    regressions = []
+
+    print(f"\n{'case':56} {'ms':>8} {'base':>8} {'stmts':>5} {'base':>5} {'KiB':>8} {'base':>8}")
+    for key, now in sorted(results.items()):
+        base = baseline.get(key)
+        if base is None:
+            print(f"{key:56} {now['ms']:8.3f} {'-':>8} {now['statements']:5} {'-':>5} {now['peak_kib']:8.1f} {'-':>8}")
+            continue
+
+        flags = []
+        if now["statements"] > base["statements"]:
+            flags.append("statements")
+        if now["ms"] > base["ms"] * (1 + threshold) and now["ms"] - base["ms"] > min_ms:
+            flags.append("time")
+        if now["peak_kib"] > base["peak_kib"] * (1 + threshold):
+            flags.append("memory")
+
+        print(
+            f"{key:56} {now['ms']:8.3f} {base['ms']:8.3f} {now['statements']:5} {base['statements']:5} "
+            f"{now['peak_kib']:8.1f} {base['peak_kib']:8.1f}"
+            + (f"  REGRESSED: {', '.join(flags)}" if flags else "")
+        )
+        if flags:
+            regressions.append(f"{key}: {', '.join(flags)}")
+
+    return regressions
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        queries, mentors, repeats = map(int, sys.argv[2:5])
+        print(json.dumps(run_scenario(queries, mentors, repeats)))
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--mentors", type=int, nargs="+", default=MENTORS)
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--threshold", type=float, default=1.0,
+                        help="allowed relative growth of time and memory")
+    parser.add_argument("--min-ms", type=float, default=1.0,
+                        help="time differences below this never count")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="write results as the new baseline")
+    args = parser.parse_args()
+
+    results = run_all(args.sizes, args.mentors, args.repeats)
+
+    if args.save:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        compare(results, {}, args.threshold, args.min_ms)
+        print(f"\nbaseline saved to {os.path.relpath(args.baseline, ROOT)}")
+        return
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    regressions = compare(results, baseline, args.threshold, args.min_ms)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s):")
+        for r in regressions:
+            print(f"  {r}")
+        sys.exit(1)
+
+    print("\nno regressions")
+
+
+if __name__ == "__main__":
+    main()
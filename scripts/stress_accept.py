@@ -0,0 +1,161 @@
+"""
+Concurrency check for accept / resolve.
+
+Many threads race to accept every pending query and then race to
+resolve them. Afterwards every query must have exactly one winner and
+every mentor's current_load must match its open assignments.
+
+Runs on the "default" SQLite profile, whose pool lets every thread
+hold its own write connection. The "tuned" profile has a single
+writer connection, so there the statements can only run one after
+another (SQLITE_PROFILE=tuned to check that serialized path).
+
+    python scripts/stress_accept.py [threads] [queries] [mentors]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from collections import Counter
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'stress.db')}"
+os.environ.setdefault("SQLITE_PROFILE", "default")
+
+from sqlalchemy import event, func, insert, select
+
+from overclocked_helpdesk.db.session import SessionLocal, engine
+from overclocked_helpdesk.db.migrations import run_migrations
+from overclocked_helpdesk.models.mentor import Mentor
+from overclocked_helpdesk.models.team import Team
+from overclocked_helpdesk.models.query import Query
+from overclocked_helpdesk.services import lifecycle
+from overclocked_helpdesk.services.lifecycle import TransitionError
+
+
+# most writer connections checked out at once: 1 means no real race
+in_use = 0
+peak_in_use = 0
+_in_use_lock = threading.Lock()
+
+
+@event.listens_for(engine, "checkout")
+def _checkout(*args):
+    global in_use, peak_in_use
+    with _in_use_lock:
+        in_use += 1
+        peak_in_use = max(peak_in_use, in_use)
+
+
+@event.listens_for(engine, "checkin")
+def _checkin(*args):
+    global in_use
+    with _in_use_lock:
+        in_use -= 1
+
+
+def seed(queries: int, mentors: int):
+    run_migrations(engine)
+
+    with engine.begin() as conn:
+        conn.execute(insert(Mentor), [
+            {"id": i, "name": f"Mentor {i}", "is_active": True, "current_load": 0, "max_load": 3}
+            for i in range(1, mentors + 1)
+        ])
+        conn.execute(insert(Team), [{"id": 1, "name": "Team 1", "mentor_id": 1}])
+        conn.execute(insert(Query), [
+            {"team_id": 1, "issue": f"issue {i}", "location": "Hall", "status": "PENDING"}
+            for i in range(queries)
+        ])
+
+
+def race(threads: int, work):
+    barrier = threading.Barrier(threads)
+    results = Counter()
+    lock = threading.Lock()
+
+    def run(n):
+        db = SessionLocal()
+        barrier.wait()
+        try:
+            for outcome in work(db, n):
+                with lock:
+                    results[outcome] += 1
+        finally:
+            db.close()
+
+    pool = [threading.Thread(target=run, args=(n,)) for n in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+
+    return results
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    mentors = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+
+    seed(queries, mentors)
+    query_ids = list(range(1, queries + 1))
+
+    def accept_all(db, n):
+        mentor_id = n % mentors + 1
+        for query_id in query_ids:
+            try:
+                lifecycle.accept(db, query_id, mentor_id)
+                yield "won"
+            except TransitionError as e:
+                yield e.detail
+
+    def resolve_all(db, n):
+        for query_id in query_ids:
+            query, _ = lifecycle.resolve(db, query_id)
+            yield "resolved" if query else "already resolved"
+
+    print("accept:", dict(race(threads, accept_all)))
+    print(f"writer connections in use at once: {peak_in_use} ({os.environ['SQLITE_PROFILE']} profile)")
+
+    db = SessionLocal()
+    failures = []
+
+    assigned = dict(db.execute(
+        select(Query.mentor_id, func.count())
+        .where(Query.status == "ASSIGNED")
+        .group_by(Query.mentor_id)
+    ).all())
+
+    for m in db.query(Mentor).all():
+        if m.current_load != assigned.get(m.id, 0):
+            failures.append(f"mentor {m.id}: load {m.current_load} != {assigned.get(m.id, 0)} assigned")
+        if m.current_load > m.max_load:
+            failures.append(f"mentor {m.id}: load {m.current_load} over max {m.max_load}")
+
+    bad = db.query(Query).filter(
+        (Query.status == "ASSIGNED") & Query.mentor_id.is_(None)
+    ).count()
+    if bad:
+        failures.append(f"{bad} ASSIGNED queries without a mentor")
+    db.close()
+
+    results = race(threads, resolve_all)
+    print("resolve:", dict(results))
+    if results["resolved"] != queries:
+        failures.append(f"{results['resolved']} resolves won for {queries} queries")
+
+    db = SessionLocal()
+    loads = [m.current_load for m in db.query(Mentor).all()]
+    if any(loads):
+        failures.append(f"loads not back to zero: {loads}")
+    db.close()
+
+    for f in failures:
+        print("FAIL", f)
+    print("OK" if not failures else f"{len(failures)} invariant violations")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
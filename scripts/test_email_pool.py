@@ -0,0 +1,56 @@
+"""
+Sends a burst of emails through the pooled dispatcher to a local
+aiosmtpd stub (pip install aiosmtpd) and prints the dispatcher stats.
+
+    python scripts/test_email_pool.py
+"""
+
+import os
+import time
+
+from aiosmtpd.controller import Controller
+
+
+class CollectingHandler:
+    def __init__(self):
+        self.messages = []
+        self.sessions = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        self.sessions.add(id(session))
+        return "250 OK"
+
+
+handler = CollectingHandler()
+controller = Controller(handler, hostname="127.0.0.1", port=8025)
+controller.start()
+
+os.environ.update({
+    "SMTP_SERVER": "127.0.0.1",
+    "SMTP_PORT": "8025",
+    "SMTP_USE_SSL": "false",
+    "SMTP_USER": "helpdesk@test.local",
+    "SMTP_PASSWORD": ""
+})
+
+from overclocked_helpdesk.services.email_service import get_dispatcher, queue_email_alert, stop_dispatcher
+
+started = time.perf_counter()
+for i in range(50):
+    queue_email_alert(
+        to_email=f"mentor{i % 5}@test.local",
+        subject=f"Pool test {i}",
+        body="This is a test email from OverClocked Helpdesk."
+    )
+enqueue_ms = (time.perf_counter() - started) * 1000
+
+while get_dispatcher().stats()["sent"] + get_dispatcher().stats()["failed"] < 50:
+    time.sleep(0.05)
+
+print(f"enqueued 50 emails in {enqueue_ms:.1f} ms")
+print("stats:", get_dispatcher().stats())
+print(f"stub received {len(handler.messages)} messages over {len(handler.sessions)} SMTP sessions")
+
+stop_dispatcher()
+controller.stop()
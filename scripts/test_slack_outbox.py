@@ -0,0 +1,122 @@
+"""
+Exercises the Slack outbox against a local stub webhook.
+The stub rate limits the first POST, so the retry path runs too.
+Twelve single submissions must arrive as one post, a bulk ingest of
+45 as three (20, 20, 5), and no outbox row may be left.
+
+    python scripts/test_slack_outbox.py
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'outbox.db')}"
+
+from sqlalchemy import insert
+
+from overclocked_helpdesk.db.session import SessionLocal, engine
+from overclocked_helpdesk.db.migrations import run_migrations
+from overclocked_helpdesk.models.mentor import Mentor
+from overclocked_helpdesk.models.outbox import OutboxMessage
+from overclocked_helpdesk.models.team import Team
+from overclocked_helpdesk.services.notifier import create_queries_bulk, notify_and_create_query
+from overclocked_helpdesk.services.outbox import SlackOutboxWorker
+from overclocked_helpdesk.services.slack_service import SlackWebhookClient
+
+received = []
+
+
+class StubWebhook(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+
+        if not received and not getattr(self.server, "throttled", False):
+            self.server.throttled = True
+            self._reply(429, b"rate_limited", {"Retry-After": "1"})
+            return
+
+        received.append(json.loads(body)["text"])
+        self._reply(200, b"ok")
+
+    def _reply(self, code, body, headers=None):
+        self.send_response(code)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+run_migrations(engine)
+with engine.begin() as conn:
+    conn.execute(insert(Mentor), [{"id": 1, "name": "Mentor 1"}])
+    conn.execute(insert(Team), [
+        {"id": i, "name": f"Team {i}", "mentor_id": 1} for i in range(1, 13)
+    ])
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), StubWebhook)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+url = f"http://127.0.0.1:{server.server_port}/hook"
+
+
+
+def wait_until_sent(timeout: float = 10) -> int:
+    deadline = time.time() + timeout
+    while True:
+        db = SessionLocal()
+        # delivered rows are deleted
+        pending = db.query(OutboxMessage).count()
+        db.close()
+        if not pending or time.time() > deadline:
+            return pending
+        time.sleep(0.2)
+
+
+def alert_counts() -> list[int]:
+    # "*N New Helpdesk Queries*" heads a multi-alert post
+    counts = []
+    for text in received:
+        head = text.split("\n", 1)[0].strip("*").split()
+        counts.append(int(head[0]) if head[0].isdigit() else 1)
+    return counts
+
+
+# queued before the worker starts, so they are due together
+db = SessionLocal()
+for i in range(12):
+    notify_and_create_query(db=db, team_id=i + 1, issue=f"Issue {i}", location="Lab 1")
+db.close()
+
+worker = SlackOutboxWorker(SlackWebhookClient(url), batch_size=20, min_interval=0.5)
+worker.start()
+
+pending = wait_until_sent()
+print(f"12 submissions: {len(received)} Slack messages, {pending} rows unsent")
+assert pending == 0, pending
+assert alert_counts() == [12], alert_counts()
+
+received.clear()
+db = SessionLocal()
+create_queries_bulk(db, [
+    {"team_id": i % 12 + 1, "issue": f"Bulk issue {i}", "location": "Lab 2"}
+    for i in range(45)
+], dispatch=False)
+db.close()
+
+pending = wait_until_sent()
+print(f"bulk of 45: {len(received)} Slack messages, {pending} rows unsent")
+assert pending == 0, pending
+assert alert_counts() == [20, 20, 5], alert_counts()
+
+worker.stop()
+server.shutdown()
+print("ok")
@@ -0,0 +1,138 @@
+/* =================================================================
+   LOGIC SECTION - 100% PRESERVED
+   =================================================================
+*/
+
+const teams = Array.from({length:40},(_,i)=>`Team ${i+1}`);
+const teamInput = document.getElementById("teamInput");
+const dropdown = document.getElementById("dropdown");
+const msg = document.getElementById("msg");
+const btn = document.getElementById("btn");
+
+/* 1. QR Code Prefill Logic */
+const params = new URLSearchParams(window.location.search);
+const qrTeam = params.get("team");
+if (qrTeam && teams.includes(`Team ${qrTeam}`)) {
+    teamInput.value = `Team ${qrTeam}`;
+}
+
+/* 2. Dropdown Logic */
+function renderDropdown(){
+    dropdown.innerHTML="";
+    const v = teamInput.value.toLowerCase();
+    const list = teams.filter(t=>t.toLowerCase().includes(v));
+    
+    // Hide if no matches
+    if(!list.length){
+        dropdown.style.display="none";
+        return;
+    }
+    
+    // Show Dropdown
+    dropdown.style.display="block";
+    list.forEach(t=>{
+        const d=document.createElement("div");
+        d.className="dropdown-item";
+        
+        // Added Icon for UI flair, logic remains same
+        d.innerHTML=`<span>${t}</span><i class="ph-bold ph-caret-right"></i>`;
+        
+        d.onclick=()=>{
+            teamInput.value=t;
+            idempotencyKey.value = newIdempotencyKey();
+            dropdown.style.display="none";
+        };
+        dropdown.appendChild(d);
+    });
+}
+
+// Triggers
+teamInput.oninput = renderDropdown;
+teamInput.onfocus = renderDropdown;
+
+// Close dropdown if clicked outside
+document.addEventListener('click', (e) => {
+    if (!teamInput.contains(e.target) && !dropdown.contains(e.target)) {
+        dropdown.style.display = 'none';
+    }
+});
+
+/* 3. Idempotency Key
+   Retries of the same request (double taps, flaky Wi-Fi) resend the
+   same key and get the original query back. Editing the form makes
+   it a new request. */
+const form = document.getElementById("form");
+const idempotencyKey = document.getElementById("idempotencyKey");
+
+function newIdempotencyKey(){
+    if (crypto.randomUUID) return crypto.randomUUID();
+    // randomUUID needs HTTPS or localhost, getRandomValues does not
+    return Array.from(crypto.getRandomValues(new Uint8Array(16)),
+        b => b.toString(16).padStart(2, "0")).join("");
+}
+
+idempotencyKey.value = newIdempotencyKey();
+form.addEventListener("input", () => { idempotencyKey.value = newIdempotencyKey(); });
+
+/* 4. Submit Logic */
+form.onsubmit = async e=>{
+    e.preventDefault();
+
+    if(!teams.includes(teamInput.value.trim())){
+        msg.className="msg error";
+        msg.textContent="Please select a valid team from the dropdown";
+        msg.style.display="block";
+        return;
+    }
+
+    // UI Feedback
+    const originalText = btn.innerText;
+    btn.disabled=true;
+    btn.innerHTML = '<i class="ph ph-spinner ph-spin"></i> TRANSMITTING...';
+    msg.style.display="none";
+
+    // Data Prep
+    const fd = new FormData(e.target);
+    const teamNumber = Number(teamInput.value.split(" ")[1]);
+    fd.set("team_id", teamNumber);
+
+    try {
+        const res = await fetch("/submit",{ method:"POST", body:fd });
+
+        if(!res.ok) throw new Error("Failed");
+
+        const data = await res.json();
+        // Redirect
+        window.location.href = `/team-status?team=${data.team_id}`;
+    } catch(err) {
+        msg.className="msg error";
+        msg.textContent="Transmission Error. Try again.";
+        msg.style.display="block";
+        btn.disabled=false;
+        btn.innerText = originalText;
+    }
+};
+
+/* 5. Modern Theme Toggle Logic */
+const themeBtn = document.getElementById("themeBtn");
+const toggleIcon = document.getElementById("toggleIcon");
+const body = document.body;
+
+function updateThemeUI(isLight) {
+    // If light mode, show Sun icon. If dark mode, show Moon.
+    toggleIcon.className = isLight ? "ph-fill ph-sun" : "ph-fill ph-moon";
+}
+
+// Check local storage on load
+if(localStorage.getItem("theme") === "light"){
+    body.classList.add("light-mode");
+    updateThemeUI(true);
+}
+
+themeBtn.onclick = () => {
+    body.classList.toggle("light-mode");
+    const isLight = body.classList.contains("light-mode");
+    
+    updateThemeUI(isLight);
+    localStorage.setItem("theme", isLight ? "light" : "dark");
+};
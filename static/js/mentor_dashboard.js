@@ -0,0 +1,264 @@
+let currentFilter = 'all';
+
+// --- Logic from previous version, adapted for new classes ---
+
+function toggleTheme(){
+    const b = document.body;
+    b.classList.toggle("light-mode");
+    const isLight = b.classList.contains("light-mode");
+    localStorage.setItem("theme", isLight ? "light" : "dark");
+    document.getElementById("themeIcon").textContent = isLight ? "☾" : "☀";
+}
+if(localStorage.getItem("theme")==="light"){
+    document.body.classList.add("light-mode");
+    document.getElementById("themeIcon").textContent = "☾";
+}
+
+function setFilter(type, el) {
+    currentFilter = type;
+    document.querySelectorAll('.filter-btn').forEach(b => b.classList.remove('active'));
+    el.classList.add('active');
+    filterCards();
+}
+
+function filterCards() {
+    const term = document.getElementById("search").value.toLowerCase();
+    document.querySelectorAll(".card").forEach(c => {
+        const nameMatch = c.dataset.name.includes(term);
+        const isActive = c.dataset.active === "true";
+        
+        let statusMatch = true;
+        if(currentFilter === 'available') statusMatch = isActive;
+        if(currentFilter === 'unavailable') statusMatch = !isActive;
+
+        c.style.display = (nameMatch && statusMatch) ? "flex" : "none";
+    });
+}
+
+function updateCardUI(id, isActive) {
+    const card = document.getElementById(`card-${id}`);
+    const btn = document.getElementById(`btn-${id}`);
+    const statusText = document.getElementById(`status-text-${id}`);
+
+    // Update Data
+    card.dataset.active = isActive ? "true" : "false";
+
+    // Visual State (Offline = Recede/Gray)
+    if(isActive) {
+        card.classList.remove("unavailable");
+        statusText.textContent = "ONLINE";
+        
+        btn.classList.remove('btn-online');
+        btn.classList.add('btn-offline');
+        btn.textContent = "GO OFFLINE";
+    } else {
+        card.classList.add("unavailable");
+        statusText.textContent = "OFFLINE";
+        
+        btn.classList.remove('btn-offline');
+        btn.classList.add('btn-online');
+        btn.textContent = "GO ONLINE";
+    }
+    
+    filterCards();
+}
+
+function toggleAvailability(id) {
+    const btn = document.getElementById(`btn-${id}`);
+    if(btn.classList.contains("loading")) return;
+
+    const card = document.getElementById(`card-${id}`);
+    const isCurrentlyActive = card.dataset.active === "true";
+    
+    btn.classList.add("loading");
+    btn.textContent = "PROCESSING...";
+    
+    // Optimistic Update
+    updateCardUI(id, !isCurrentlyActive);
+
+    fetch(`/mentors/${id}/toggle-availability`, { method: "PATCH" })
+        .then(r => { if(!r.ok) throw 0; return r.json(); })
+        .then(m => updateMentorUI(m))
+        .catch(() => {
+            updateCardUI(id, isCurrentlyActive); // Revert
+            alert("System Error: Could not sync status.");
+        })
+        .finally(() => {
+            btn.classList.remove("loading");
+        });
+}
+
+function updateMentorUI(m) {
+    if (!document.getElementById(`card-${m.id}`)) return;
+
+    updateCardUI(m.id, m.is_active);
+
+    document.getElementById(`load-${m.id}`).textContent = `${m.current_load} / ${m.max_load}`;
+    document.getElementById(`bar-${m.id}`).style.width = `${(m.current_load / m.max_load * 100)}%`;
+}
+
+let mentorStateVersion = null;
+
+function refreshMentors() {
+    const since = mentorStateVersion === null ? "" : `?since_version=${mentorStateVersion}`;
+
+    fetch("/mentors/state" + since)
+        .then(r => {
+            // 304: no mentor changed, only the ticket lists need a refresh
+            if (r.status === 304) return [];
+            mentorStateVersion = r.headers.get("X-State-Version");
+            return r.json();
+        })
+        .then(list => {
+            list.forEach(updateMentorUI);
+            document.querySelectorAll("[data-mentor]").forEach(ul => {
+                loadQueries(Number(ul.dataset.mentor));
+            });
+        });
+}
+
+function setEmptyState(ul) {
+    ul.innerHTML = `<li class="empty-state" style="color:var(--text-muted); font-size:0.8rem; padding:10px;">No active tickets</li>`;
+}
+
+function renderTicket(q, mentorId) {
+    const li = document.createElement("li");
+    li.className = "ticket-item";
+    li.dataset.query = q.id;
+
+    if (q.status === "PENDING") {
+        li.innerHTML = `
+            <div>
+                <span class="t-id">#${q.team_id}</span>
+                ${q.issue}
+            </div>
+            <button class="btn-done" onclick="acceptQuery(${q.id}, ${mentorId})">ACCEPT</button>
+        `;
+    } else {
+        li.innerHTML = `
+            <div>
+                <span class="t-id">#${q.team_id}</span>
+                ${q.issue}
+            </div>
+            <button class="btn-done" onclick="resolveQuery(${q.id})">RESOLVE</button>
+        `;
+    }
+
+    return li;
+}
+
+const PAGE_SIZE = 20;
+
+// Loads the first page, or the page after `cursor` when scrolling on
+function loadQueries(id, cursor) {
+    const after = cursor ? `&cursor=${encodeURIComponent(cursor)}` : "";
+
+    fetch(`/queries/mentor/${id}?limit=${PAGE_SIZE}${after}`)
+        .then(r => r.json().then(list => [list, r.headers.get("X-Next-Cursor")]))
+        .then(([list, next]) => {
+            const ul = document.getElementById(`queries-${id}`);
+
+            if (cursor) {
+                const more = ul.querySelector(".load-more");
+                if (more) more.remove();
+            } else {
+                ul.innerHTML = "";
+            }
+
+            if (!cursor && !list.length) {
+                setEmptyState(ul);
+                return;
+            }
+
+            list.forEach(q => {
+                // may already be there from a live event
+                if (!ul.querySelector(`li[data-query="${q.id}"]`)) {
+                    ul.appendChild(renderTicket(q, id));
+                }
+            });
+
+            if (next) ul.appendChild(renderLoadMore(id, next));
+        });
+}
+
+const moreObserver = window.IntersectionObserver
+    ? new IntersectionObserver(entries => entries.forEach(e => {
+        if (!e.isIntersecting) return;
+        moreObserver.unobserve(e.target);
+        e.target.click();
+    }))
+    : null;
+
+function renderLoadMore(id, cursor) {
+    const li = document.createElement("li");
+    li.className = "load-more";
+    li.textContent = "Load more";
+    li.onclick = () => {
+        li.onclick = null;
+        li.textContent = "Loading...";
+        loadQueries(id, cursor);
+    };
+
+    // fetch the next page once the end of the list scrolls into view
+    if (moreObserver) moreObserver.observe(li);
+    return li;
+}
+
+// Apply a single query change pushed by the server
+function applyQueryEvent(q) {
+    document.querySelectorAll(`li[data-query="${q.id}"]`).forEach(li => {
+        const ul = li.parentElement;
+        li.remove();
+        if (!ul.querySelector("li")) setEmptyState(ul);
+    });
+
+    document.querySelectorAll("[data-mentor]").forEach(ul => {
+        const mentorId = Number(ul.dataset.mentor);
+        const visible =
+            (q.status === "PENDING" && q.mentor_id === null) ||
+            (q.status === "ASSIGNED" && q.mentor_id === mentorId);
+
+        if (!visible) return;
+
+        const empty = ul.querySelector(".empty-state");
+        if (empty) empty.remove();
+
+        // lists are newest first
+        ul.prepend(renderTicket(q, mentorId));
+    });
+}
+
+// Without SSE the dashboard has to pull the new state itself
+function syncIfPolling() {
+    if (!window.EventSource) refreshMentors();
+}
+
+function resolveQuery(qid) {
+    fetch(`/queries/${qid}/resolve`, { method: "PATCH" }).then(syncIfPolling);
+}
+
+function acceptQuery(queryId, mentorId) {
+    fetch(`/queries/${queryId}/accept/${mentorId}`, {
+        method: "PATCH"
+    })
+    .then(r => {
+        if (!r.ok) throw 0;
+        return r.json();
+    })
+    .then(syncIfPolling)
+    .catch(() => alert("Could not accept query"));
+}
+
+if (window.EventSource) {
+    const events = new EventSource("/mentors/events");
+
+    // (re)connected: resync once, then only deltas arrive
+    events.onopen = () => refreshMentors();
+    events.addEventListener("mentor", e => updateMentorUI(JSON.parse(e.data)));
+    events.addEventListener("query", e => applyQueryEvent(JSON.parse(e.data)));
+    events.addEventListener("resync", () => refreshMentors());
+} else {
+    setInterval(refreshMentors, 5000);
+    refreshMentors();
+}
+
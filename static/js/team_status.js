@@ -0,0 +1,61 @@
+/* theme */
+const themeBtn = document.getElementById("themeBtn");
+const saved = localStorage.getItem("theme");
+if(saved==="dark"){
+    document.body.classList.add("dark");
+    themeBtn.textContent="☀️";
+}
+themeBtn.onclick=()=>{
+    const d=document.body.classList.toggle("dark");
+    localStorage.setItem("theme",d?"dark":"light");
+    themeBtn.textContent=d?"☀️":"🌙";
+};
+
+/* team param */
+const params=new URLSearchParams(window.location.search);
+const team=params.get("team");
+
+const statusBox=document.getElementById("statusBox");
+const errorBox=document.getElementById("errorBox");
+
+const teamText=document.getElementById("teamText");
+const issueText=document.getElementById("issueText");
+const statusText=document.getElementById("statusText");
+const mentorText=document.getElementById("mentorText");
+const updatedText=document.getElementById("updatedText");
+
+let poller=null;
+
+if(!team){
+    errorBox.style.display="block";
+    errorBox.textContent="Missing team ID";
+}else{
+    teamText.textContent=team;
+    fetchStatus();
+    poller=setInterval(fetchStatus,10000);
+}
+
+function fetchStatus(){
+    fetch(`/team/${team}/status`)
+        .then(async r=>{
+            if(!r.ok) throw await r.text();
+            return r.json();
+        })
+        .then(data=>{
+            errorBox.style.display="none";
+            statusBox.style.display="block";
+
+            statusBox.className=`status ${data.status}`;
+
+            issueText.textContent=data.issue;
+            statusText.textContent=data.status.toUpperCase();
+            mentorText.textContent=data.mentor || "Not assigned yet";
+            updatedText.textContent=data.updated_at;
+        })
+        .catch(()=>{
+            statusBox.style.display="none";
+            errorBox.style.display="block";
+            errorBox.textContent="No active query found";
+            clearInterval(poller);
+        });
+}